@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
-from db.database import engine
-from models.schema import User
-from core.security import verify_password, create_access_token
+from db.session import get_session, run_query
+from models.schema import User, Message
+from core.security import verify_password_offloaded, create_access_token, claims_cache, require
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -19,28 +19,42 @@ class Token(BaseModel):
     user_id: str
     name: str
 
+def find_user_by_email(session: Session, email: str):
+    statement = select(User).where(User.email == email)
+    return session.exec(statement).first()
+
 @router.post("/login", response_model=Token)
-def login(data: LoginData):
-    with Session(engine) as session:
-        statement = select(User).where(User.email == data.email)
-        user = session.exec(statement).first()
-        
-        if not user or not verify_password(data.password, user.password_hash):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        access_token = create_access_token(
-            data={"sub": user.id, "role": user.role}
+async def login(data: LoginData, session=Depends(get_session)):
+    # async so the pbkdf2 check waits on the password pool instead of holding a worker thread
+    user = await run_query(session, find_user_by_email, data.email)
+
+    if not user or not await verify_password_offloaded(data.password, user.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        return {
-            "access_token": access_token, 
-            "token_type": "bearer", 
-            "role": user.role,
-            "user_id": user.id,
-            "name": user.name
-        }
+
+    access_token = create_access_token(
+        data={"sub": user.id, "role": user.role}
+    )
+    return {
+        "access_token": access_token, 
+        "token_type": "bearer", 
+        "role": user.role,
+        "user_id": user.id,
+        "name": user.name
+    }
+
+@router.post("/logout", response_model=Message)
+def logout(claims: dict = Depends(require("student", "faculty"))):
+    claims_cache.revoke(claims)
+    return {"message": "Logged out"}
+
+@router.post("/revoke/{user_id}", response_model=Message)
+def revoke_user_tokens(user_id: str, claims: dict = Depends(require("admin"))):
+    # Signs the user out everywhere; they can log in again for a fresh token
+    claims_cache.revoke_user(user_id)
+    return {"message": f"Tokens revoked for {user_id}"}
 
 # /api/auth/login returns JWT token and user role
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from core.security import create_access_token
+
+# Load-testing harness for the API.
+#
+#   python bench_api.py run [--target inproc|http://host:port] [--scenario all] [--users 200] [--out run.json]
+#   python bench_api.py compare baseline.json candidate.json [--threshold 0.10]
+#
+# "inproc" boots uvicorn on a thread of this process against a throwaway database
+# (demo seed, or a synthetic institution with --students/--faculty). An http
+# target must already be running and is assumed to hold the demo seed data.
+
+DEMO_PREFIXES = ["CSBS", "AIDS", "AIML", "CSE", "IT", "CYS", "ECE", "MECH"]
+
+class Client:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def call(self, method, route, path, body=None, token=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        payload = None
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=120) as res:
+                raw = res.read()
+                code = res.status
+            payload = json.loads(raw) if raw else None
+        except urllib.error.HTTPError as e:
+            code = e.code
+        except OSError:
+            code = 0
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.samples.append((f"{method} {route}", code, elapsed))
+        return code, payload
+
+# -- Scenarios: one virtual user's session each --
+
+def student_session(client, ids, rng):
+    student_id = rng.choice(ids["students"])
+    code, login = client.call("POST", "/api/auth/login", "/api/auth/login", {"email": f"{student_id.lower()}@college.edu", "password": "stud123"})
+    token = login["access_token"] if code == 200 else None
+    client.call("GET", "/api/student/profile/{id}", f"/api/student/profile/{student_id}", token=token)
+    code, courses = client.call("GET", "/api/student/enrollable/{id}", f"/api/student/enrollable/{student_id}", token=token)
+    if code == 200 and courses:
+        selected = [{"course_id": c["id"], "faculty_id": c["faculties"][0]["id"]} for c in courses if c["faculties"]]
+        client.call("POST", "/api/student/enroll", "/api/student/enroll", {"student_id": student_id, "selected_courses": selected}, token=token)
+    client.call("GET", "/api/student/enrolled/{id}", f"/api/student/enrolled/{student_id}", token=token)
+
+# Faculty and admin sessions skip the password round trip and mint their token directly
+def faculty_session(client, ids, rng):
+    faculty_id = rng.choice(ids["faculty"])
+    token = create_access_token({"sub": faculty_id, "role": "faculty"})
+    code, courses = client.call("GET", "/api/faculty/courses/{id}", f"/api/faculty/courses/{faculty_id}", token=token)
+    courses = courses if code == 200 and courses else []
+    for c in courses[:3]:
+        client.call("GET", "/api/course/{id}/students", f"/api/course/{c['id']}/students", token=token)
+    client.call("GET", "/api/faculty/backlogs/{id}", f"/api/faculty/backlogs/{faculty_id}", token=token)
+
+def admin_session(client, ids, rng):
+    degree_id = rng.choice(ids["degrees"])
+    token = create_access_token({"sub": "admin_01", "role": "admin"})
+    client.call("GET", "/api/admin/stats", "/api/admin/stats", token=token)
+    client.call("GET", "/api/admin/degrees", "/api/admin/degrees?type=UG", token=token)
+    client.call("GET", "/api/admin/degree/{id}/courses", f"/api/admin/degree/{degree_id}/courses", token=token)
+    client.call("GET", "/api/admin/degree/{id}/history", f"/api/admin/degree/{degree_id}/history", token=token)
+    client.call("GET", "/api/admin/faculty", "/api/admin/faculty", token=token)
+    client.call("GET", "/api/admin/courses", "/api/admin/courses", token=token)
+
+SCENARIOS = {
+    "student": student_session,
+    "faculty": faculty_session,
+    "admin": admin_session,
+}
+# Share of virtual users per scenario in the "all" mix
+MIX = {"student": 0.8, "faculty": 0.15, "admin": 0.05}
+
+# -- Targets --
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_inproc(args):
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_api.db')}"
+    import uvicorn
+    from sqlmodel import Session, select
+    from db.database import engine, create_db_and_tables, seed_data, reset_database
+    from models.schema import User, Degree
+    import main
+
+    if args.students:
+        from db.synthetic import seed_synthetic
+        reset_database()
+        seed_synthetic(students=args.students, faculty=args.faculty, seed=args.seed)
+    else:
+        create_db_and_tables()
+        seed_data()
+
+    with Session(engine) as session:
+        ids = {
+            "students": session.exec(select(User.id).where(User.role == "student")).all(),
+            "faculty": session.exec(select(User.id).where(User.role == "faculty")).all(),
+            "degrees": session.exec(select(Degree.id)).all(),
+        }
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", ids, server
+
+def demo_ids():
+    return {
+        "students": [f"{p}{i:03d}" for p in DEMO_PREFIXES for i in range(1, 17)],
+        "faculty": [f"fac_0{i}" for i in range(1, 6)],
+        "degrees": [f"deg_ug_{p.lower()}" for p in DEMO_PREFIXES],
+    }
+
+# -- Reporting --
+
+def percentile(sorted_values, q):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[q - 1]
+
+def summarize(samples, elapsed):
+    by_route = {}
+    for route, code, ms in samples:
+        by_route.setdefault(route, []).append((code, ms))
+    routes = {}
+    for route, rows in sorted(by_route.items()):
+        latencies = sorted(ms for _, ms in rows)
+        codes = {}
+        for code, _ in rows:
+            codes[str(code)] = codes.get(str(code), 0) + 1
+        routes[route] = {
+            "count": len(rows),
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "status": codes,
+        }
+    return routes
+
+def print_routes(routes):
+    print(f"{'route':<42} {'n':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}  status")
+    for route, r in routes.items():
+        print(f"{route:<42} {r['count']:>6} {r['throughput_rps']:>8.1f} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms  {r['status']}")
+
+# -- Commands --
+
+def run(args):
+    server = None
+    if args.target == "inproc":
+        base_url, ids, server = start_inproc(args)
+    else:
+        base_url, ids = args.target, demo_ids()
+
+    rng = random.Random(args.seed)
+    if args.scenario == "all":
+        names = list(MIX)
+        plan = rng.choices(names, weights=[MIX[n] for n in names], k=args.users)
+    else:
+        plan = [args.scenario] * args.users
+    seeds = [rng.random() for _ in plan]
+
+    client = Client(base_url)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda job: SCENARIOS[job[0]](client, ids, random.Random(job[1])), zip(plan, seeds)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.should_exit = True
+
+    routes = summarize(client.samples, elapsed)
+    print_routes(routes)
+    print(f"\n{len(client.samples)} requests in {elapsed:.2f}s ({len(client.samples) / elapsed:.1f} req/s)")
+
+    result = {
+        "target": args.target,
+        "scenario": args.scenario,
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "students": args.students,
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": len(client.samples),
+        "routes": routes,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.out}")
+    return 0
+
+def compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["routes"]
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)["routes"]
+
+    regressions = 0
+    print(f"{'route':<42} {'p95 base':>10} {'p95 new':>10} {'change':>8} {'rps base':>9} {'rps new':>9}")
+    for route in sorted(set(baseline) | set(candidate)):
+        if route not in baseline or route not in candidate:
+            print(f"{route:<42} only in {'candidate' if route in candidate else 'baseline'}")
+            continue
+        b, c = baseline[route], candidate[route]
+        change = (c["p95_ms"] - b["p95_ms"]) / b["p95_ms"] if b["p95_ms"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{route:<42} {b['p95_ms']:>9.1f}ms {c['p95_ms']:>9.1f}ms {change:>+7.0%} {b['throughput_rps']:>9.1f} {c['throughput_rps']:>9.1f}{flag}")
+    print(f"\n{regressions} route(s) regressed beyond {args.threshold:.0%} at p95")
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="API load test and latency benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run")
+    run_p.add_argument("--target", default="inproc", help="'inproc' or a base URL such as http://127.0.0.1:8000")
+    run_p.add_argument("--scenario", default="all", choices=["all", *SCENARIOS])
+    run_p.add_argument("--users", type=int, default=200, help="virtual user sessions to run")
+    run_p.add_argument("--concurrency", type=int, default=32)
+    run_p.add_argument("--seed", type=int, default=42)
+    run_p.add_argument("--students", type=int, default=0, help="inproc only: generate a synthetic institution of this size")
+    run_p.add_argument("--faculty", type=int, default=2_000, help="inproc only: faculty for the synthetic institution")
+    run_p.add_argument("--out", help="write results JSON here")
+    run_p.set_defaults(func=run)
+
+    cmp_p = sub.add_parser("compare")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("candidate")
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="allowed relative p95 increase")
+    cmp_p.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+if __name__ == "__main__":
+    main()
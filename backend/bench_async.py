@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+# Compare DB_MODE=sync and DB_MODE=async at high concurrency using bench_api.py.
+#   python bench_async.py [--users 2000] [--concurrency 256] [--students 20000]
+
+def arg(name, default):
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+users = arg("--users", "2000")
+concurrency = arg("--concurrency", "256")
+students = arg("--students", "0")
+here = os.path.dirname(os.path.abspath(__file__))
+out_dir = tempfile.mkdtemp()
+
+results = {}
+for mode in ("sync", "async"):
+    out = os.path.join(out_dir, f"{mode}.json")
+    print(f"\n=== DB_MODE={mode} ===")
+    subprocess.run(
+        [sys.executable, os.path.join(here, "bench_api.py"), "run", "--users", users,
+         "--concurrency", concurrency, "--students", students, "--out", out],
+        env=dict(os.environ, DB_MODE=mode), cwd=here, check=True,
+    )
+    results[mode] = out
+
+print("\n=== sync (baseline) vs async ===")
+subprocess.run([sys.executable, os.path.join(here, "bench_api.py"), "compare", results["sync"], results["async"]], cwd=here)
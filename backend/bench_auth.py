@@ -0,0 +1,58 @@
+import os
+import statistics
+import time
+from starlette.requests import Request
+from core.security import ClaimsCache, create_access_token, require
+
+# Per-request cost of token authorization, in microseconds.
+#
+#   cold    jwt.decode on every request (what a cache-less dependency pays)
+#   warm    the same token again, answered from the claims cache
+#   route   the full require("student", owner="student_id") dependency on a
+#           warm cache: header parse, lookup, revocation, role and path-id checks
+#
+# Run from backend/: python bench_auth.py
+
+RUNS = int(os.getenv("BENCH_RUNS", "20000"))
+TOKENS = int(os.getenv("BENCH_TOKENS", "1000"))
+
+def timed(fn, items) -> list:
+    samples = []
+    for item in items:
+        start = time.perf_counter_ns()
+        fn(item)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+def report(label, samples):
+    samples.sort()
+    q = statistics.quantiles(samples, n=100)
+    print(f"{label:<8} n={len(samples):<7} mean={statistics.fmean(samples):7.2f}us p50={q[49]:7.2f}us p99={q[98]:7.2f}us")
+
+def main():
+    students = [f"CSE{i:05d}" for i in range(TOKENS)]
+    tokens = [create_access_token({"sub": s, "role": "student"}) for s in students]
+    work = [tokens[i % TOKENS] for i in range(RUNS)]
+
+    report("cold", timed(lambda t: ClaimsCache(max_size=1).claims(t), work))
+
+    cache = ClaimsCache()
+    for t in tokens:
+        cache.claims(t)
+    report("warm", timed(cache.claims, work))
+
+    dependency = require("student", owner="student_id")
+    requests = []
+    for i in range(RUNS):
+        request = Request({
+            "type": "http", "method": "GET",
+            "headers": [(b"authorization", f"Bearer {tokens[i % TOKENS]}".encode())],
+            "path_params": {"student_id": students[i % TOKENS]},
+        })
+        requests.append(request)
+    for request in requests[:TOKENS]:
+        dependency(request)
+    report("route", timed(dependency, requests))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Point the app at a throwaway database before db.database builds its engine
+db_file = os.path.join(tempfile.mkdtemp(), "bench_indexes.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+
+from sqlalchemy import text
+from db.database import engine, create_db_and_tables, seed_data
+from db.migrations import m003_indexes
+
+EXTRA_STUDENTS = int(os.getenv("BENCH_STUDENTS", "5000"))
+RUNS = int(os.getenv("BENCH_RUNS", "200"))
+
+INDEXES = [
+    "ix_user_email",
+    "ix_course_degree_sem",
+    "ix_facultycourse_course",
+    "ix_enrollment_student_status",
+    "ix_enrollment_course_status",
+    "ix_enrollment_faculty_status",
+    "uq_enrollment_active",
+]
+
+# The query shapes issued by main.py and api/auth.py
+QUERIES = {
+    "login": ("SELECT * FROM user WHERE email = :email", "email"),
+    "transcript": (
+        "SELECT e.id, e.course_id, e.status, e.grade, e.sem, c.name, c.credits, u.name "
+        "FROM enrollment e LEFT JOIN course c ON c.id = e.course_id LEFT JOIN user u ON u.id = e.faculty_id "
+        "WHERE e.student_id = :student_id",
+        "student_id",
+    ),
+    "handled courses": (
+        "SELECT course_id FROM enrollment WHERE student_id = :student_id AND status IN ('enrolled', 'completed')",
+        "student_id",
+    ),
+    "degree semester": ("SELECT * FROM course WHERE degree_id = :degree_id AND sem = :sem", "degree_sem"),
+    "roster": (
+        "SELECT u.* FROM user u JOIN enrollment e ON u.id = e.student_id "
+        "WHERE e.course_id = :course_id AND e.status = 'enrolled'",
+        "course_id",
+    ),
+    "backlogs": (
+        "SELECT u.name, c.name FROM user u JOIN enrollment e ON u.id = e.student_id JOIN course c ON e.course_id = c.id "
+        "WHERE e.faculty_id = :faculty_id AND e.status = 'backlog'",
+        "faculty_id",
+    ),
+    "degree history": (
+        "SELECT grade FROM enrollment WHERE status = 'completed' "
+        "AND course_id IN (SELECT id FROM course WHERE degree_id = :degree_id)",
+        "degree_id",
+    ),
+}
+
+def populate():
+    create_db_and_tables()
+    seed_data()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        courses = conn.execute(text("SELECT c.id, c.degree_id, c.sem, f.faculty_id FROM course c JOIN facultycourse f ON f.course_id = c.id")).all()
+        degrees = sorted({c.degree_id for c in courses})
+        by_degree_sem = {}
+        for c in courses:
+            by_degree_sem.setdefault((c.degree_id, c.sem), []).append(c)
+
+        students, enrollments = [], []
+        for i in range(EXTRA_STUDENTS):
+            student_id = f"BENCH{i:06d}"
+            degree_id = rng.choice(degrees)
+            year = rng.randint(1, 4)
+            students.append({"id": student_id, "email": f"{student_id.lower()}@college.edu", "dept": degree_id, "year": str(year)})
+            for sem in range(1, year * 2):
+                for c in by_degree_sem.get((degree_id, sem), []):
+                    backlog = rng.random() < 0.1
+                    enrollments.append({
+                        "student_id": student_id, "course_id": c.id, "faculty_id": c.faculty_id, "sem": sem,
+                        "status": "backlog" if backlog else "completed",
+                        "grade": 0.0 if backlog else round(rng.uniform(2.5, 4.0), 1),
+                    })
+        conn.execute(text(
+            "INSERT INTO user (id, role, name, email, password_hash, dept, year) "
+            "VALUES (:id, 'student', :id, :email, '!', :dept, :year)"
+        ), students)
+        conn.execute(text(
+            "INSERT INTO enrollment (student_id, course_id, faculty_id, sem, status, grade, updated_at) "
+            "VALUES (:student_id, :course_id, :faculty_id, :sem, :status, :grade, CURRENT_TIMESTAMP)"
+        ), enrollments)
+        total = conn.execute(text("SELECT COUNT(*) FROM enrollment")).scalar()
+
+    params = {
+        "email": [{"email": s["email"]} for s in students],
+        "student_id": [{"student_id": s["id"]} for s in students],
+        "degree_sem": [{"degree_id": d, "sem": s} for d, s in by_degree_sem],
+        "course_id": [{"course_id": c.id} for c in courses],
+        "faculty_id": [{"faculty_id": f} for f in sorted({c.faculty_id for c in courses})],
+        "degree_id": [{"degree_id": d} for d in degrees],
+    }
+    return total, params
+
+def measure(params):
+    rng = random.Random(7)
+    results = {}
+    with engine.connect() as conn:
+        for name, (sql, kind) in QUERIES.items():
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params[kind][0]).all()
+            timings = []
+            for _ in range(RUNS):
+                p = rng.choice(params[kind])
+                start = time.perf_counter()
+                conn.execute(text(sql), p).all()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = ([row[-1] for row in plan], statistics.median(timings))
+    return results
+
+def report(label, results):
+    print(f"\n== {label} ==")
+    for name, (plan, median_ms) in results.items():
+        print(f"{name:<16} {median_ms:8.3f} ms  | {'; '.join(plan)}")
+
+def main():
+    total, params = populate()
+    print(f"Enrollment rows: {total}")
+
+    with engine.begin() as conn:
+        for name in INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text("ANALYZE"))
+    before = measure(params)
+    report("without secondary indexes", before)
+
+    with engine.begin() as conn:
+        m003_indexes(conn)
+    after = measure(params)
+    report("with migration m003 indexes", after)
+
+    print("\nSpeedup (median):")
+    for name in QUERIES:
+        print(f"{name:<16} {before[name][1] / after[name][1]:6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from core.security import create_access_token
+
+# Login storm + browse traffic against a local uvicorn on a throwaway database.
+# Browse latency should stay flat while logins queue on the password pool.
+
+PORT = int(os.getenv("BENCH_PORT", "8765"))
+LOGINS = int(os.getenv("BENCH_LOGINS", "2000"))
+BROWSES = int(os.getenv("BENCH_BROWSES", "2000"))
+CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "64"))
+BASE = f"http://127.0.0.1:{PORT}"
+
+def request(method, path, body=None, token=None):
+    data = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    req = urllib.request.Request(BASE + path, data=data, method=method, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as res:
+            res.read()
+            code = res.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    return code, (time.perf_counter() - start) * 1000
+
+def start_server():
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    for _ in range(600):
+        try:
+            request("GET", "/health")
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+def summarize(label, samples):
+    latencies = sorted(ms for _, ms in samples)
+    codes = {}
+    for code, _ in samples:
+        codes[code] = codes.get(code, 0) + 1
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{label:<22} n={len(samples):<6} p50={q[49]:7.1f}ms p95={q[94]:7.1f}ms p99={q[98]:7.1f}ms codes={codes}")
+
+# Browsers reuse one token per student, as a logged-in client would
+TOKENS = {f"CSE{i:03d}": create_access_token({"sub": f"CSE{i:03d}", "role": "student"}) for i in range(1, 17)}
+
+def browse_request(i):
+    student_id = f"CSE{i % 16 + 1:03d}"
+    return request("GET", f"/api/student/enrollable/{student_id}", token=TOKENS[student_id])
+
+def browse_only():
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        return list(pool.map(browse_request, range(BROWSES)))
+
+def mixed():
+    logins, browses = [], []
+    def login(i):
+        logins.append(request("POST", "/api/auth/login", {"email": f"cse{i % 16 + 1:03d}@college.edu", "password": "stud123"}))
+    def browse(i):
+        browses.append(browse_request(i))
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as login_pool, \
+            ThreadPoolExecutor(max_workers=max(CONCURRENCY // 4, 1)) as browse_pool:
+        start = time.perf_counter()
+        storm = threading.Thread(target=lambda: list(login_pool.map(login, range(LOGINS))))
+        storm.start()
+        list(browse_pool.map(browse, range(BROWSES)))
+        storm.join()
+        elapsed = time.perf_counter() - start
+    return logins, browses, elapsed
+
+def main():
+    proc = start_server()
+    try:
+        summarize("browse (idle)", browse_only())
+        logins, browses, elapsed = mixed()
+        summarize("browse (login storm)", browses)
+        summarize("login", logins)
+        print(f"Mixed phase: {len(logins) + len(browses)} requests in {elapsed:.1f}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import json
+import os
+import statistics
+import tempfile
+import time
+
+# Serialization cost per route, before and after typed responses.
+#
+#   before  what a route without response_model paid: jsonable_encoder over the
+#           whole body, then json.dumps (FastAPI's default JSONResponse)
+#   after   routes with a response_model: pydantic-core validates and dumps the
+#           body, then the app's response class renders it (orjson if installed);
+#           catalog routes, which answer from the response cache, encode a cache
+#           miss with core.serialization.dumps
+#
+# Payloads are real: each route's query function runs once against a synthetic
+# institution, only the encoding is timed.
+#
+# Run from backend/: python bench_serialization.py
+#   JSON_ENCODER=json python bench_serialization.py   # pydantic-core with the stdlib encoder
+
+db_file = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlmodel import Session, select, func
+from db.database import read_engine, reset_database, DEPT_PREFIXES
+from db.synthetic import seed_synthetic
+from core.pagination import PageParams, MAX_PAGE_SIZE
+from core.serialization import dumps, JSON_ENCODER, USE_ORJSON
+from models.schema import (
+    User, Enrollment, CourseSeatCount, UserPublic, EnrolledCourse, EnrollableCourse,
+    FacultyCourseLoad, BacklogStudent, DegreeHistory, EligibilityReport, AdminStats
+)
+import main as app
+
+STUDENTS = int(os.getenv("BENCH_STUDENTS", "5000"))
+RUNS = int(os.getenv("BENCH_RUNS", "200"))
+
+def page(limit=MAX_PAGE_SIZE):
+    return PageParams(limit=limit, cursor=None, fields=None)
+
+def rows_of(result):
+    rows, _ = result
+    return [dict(row._mapping) for row in rows]
+
+def payloads(session: Session) -> list:
+    """(route, response model or None for cached catalog routes, exclude_unset, payload)"""
+    degree_id = next(iter(DEPT_PREFIXES))
+    student_id = session.exec(select(User.id).where(User.role == "student", User.year == "4").order_by(User.id)).first()
+    roster = session.exec(
+        select(CourseSeatCount.course_id).where(CourseSeatCount.status == "enrolled").order_by(CourseSeatCount.count.desc())
+    ).first()
+    faculty_id = session.exec(
+        select(Enrollment.faculty_id).where(Enrollment.status == "backlog")
+        .group_by(Enrollment.faculty_id).order_by(func.count().desc())
+    ).first()
+    return [
+        ("admin/courses", None, False, rows_of(app.admin_courses(session, page()))),
+        ("admin/faculty", None, False, rows_of(app.admin_faculty(session, page()))),
+        ("admin/degree/courses", None, False, rows_of(app.degree_courses(session, degree_id, page()))),
+        ("admin/degrees", None, False, app.admin_degrees(session)),
+        ("course/students", List[UserPublic], True, rows_of(app.course_students(session, roster, page(), {"sub": "admin", "role": "admin"}))),
+        ("student/enrollable", List[EnrollableCourse], False, app.enrollable_courses(session, student_id)),
+        ("student/enrolled", List[EnrolledCourse], False, app.enrolled_courses(session, student_id)),
+        ("faculty/courses", List[FacultyCourseLoad], False, app.faculty_courses(session, faculty_id)),
+        ("faculty/backlogs", List[BacklogStudent], False, app.faculty_backlogs(session, faculty_id)),
+        ("admin/degree/history", DegreeHistory, False, app.degree_history(session, degree_id)),
+        ("admin/eligibility", EligibilityReport, False, app.eligibility_report(session, degree_id, 2)),
+        ("admin/stats", AdminStats, False, app.admin_stats(session)),
+    ]
+
+def before(payload) -> bytes:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+def after_for(model, exclude_unset: bool):
+    if model is None:
+        return dumps
+    adapter = TypeAdapter(model)
+    def encode(payload) -> bytes:
+        value = adapter.validate_python(payload, from_attributes=True)
+        return dumps(adapter.dump_python(value, mode="json", exclude_unset=exclude_unset))
+    return encode
+
+def timed(fn, payload) -> float:
+    """Median microseconds over RUNS calls."""
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter_ns()
+        fn(payload)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return statistics.median(samples)
+
+def main():
+    reset_database()
+    seed_synthetic(students=STUDENTS, faculty=max(STUDENTS // 25, 8), seed=1)
+    with Session(read_engine) as session:
+        cases = payloads(session)
+
+    print(f"Encoder: {'orjson' if USE_ORJSON else 'json'} (JSON_ENCODER={JSON_ENCODER}), {RUNS} runs per route\n")
+    print(f"{'route':<22} {'bytes':>9} {'before us':>11} {'after us':>10} {'speedup':>8}")
+    total_before = total_after = 0
+    for name, model, exclude_unset, payload in cases:
+        after = after_for(model, exclude_unset)
+        b, a = timed(before, payload), timed(after, payload)
+        total_before += b
+        total_after += a
+        print(f"{name:<22} {len(after(payload)):>9} {b:>11.1f} {a:>10.1f} {b / a:>7.1f}x")
+    print(f"{'all routes':<22} {'':>9} {total_before:>11.1f} {total_after:>10.1f} {total_before / total_after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
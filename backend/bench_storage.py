@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Read throughput with and without concurrent enrollment writes, per storage profile.
+#   python bench_storage.py                 # runs every profile in a fresh subprocess
+#   python bench_storage.py --profile dev   # one profile in this process
+
+STUDENTS = int(os.getenv("BENCH_STUDENTS", "5000"))
+READERS = int(os.getenv("BENCH_READERS", "8"))
+WRITERS = int(os.getenv("BENCH_WRITERS", "4"))
+SECONDS = float(os.getenv("BENCH_SECONDS", "5"))
+
+def run_profile():
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_storage.db')}"
+    from fastapi import HTTPException
+    from sqlmodel import Session, select
+    from db.database import engine, read_engine, reset_database, SQLITE_PROFILE, storage_pragmas
+    from db.synthetic import seed_synthetic
+    from core.enrollment import enroll_selection
+    from models.schema import User
+    import main
+
+    reset_database()
+    seed_synthetic(students=STUDENTS, faculty=max(STUDENTS // 25, 8), seed=1)
+    with Session(engine) as session:
+        students = session.exec(select(User.id).where(User.role == "student")).all()
+        writers_pool = session.exec(select(User.id).where(User.role == "student", User.year.in_(["1", "2"]))).all()
+
+    def read_loop(stop, counter, idx):
+        n = idx
+        while not stop.is_set():
+            student_id = students[n % len(students)]
+            with Session(read_engine) as session:
+                main.enrollable_courses(session, student_id)
+                main.enrolled_courses(session, student_id)
+            counter[idx] += 2
+            n += READERS
+
+    def write_loop(stop, counter, idx):
+        n = idx
+        while not stop.is_set() and n < len(writers_pool):
+            student_id = writers_pool[n]
+            with Session(read_engine) as session:
+                courses = main.enrollable_courses(session, student_id)
+            selection = [{"course_id": c["id"], "faculty_id": c["faculties"][0]["id"]} for c in courses if c["faculties"]]
+            try:
+                enroll_selection(student_id, selection)
+                counter[idx] += 1
+            except HTTPException:
+                pass
+            n += WRITERS
+
+    def phase(with_writes):
+        stop = threading.Event()
+        reads, writes = [0] * READERS, [0] * WRITERS
+        threads = [threading.Thread(target=read_loop, args=(stop, reads, i)) for i in range(READERS)]
+        if with_writes:
+            threads += [threading.Thread(target=write_loop, args=(stop, writes, i)) for i in range(WRITERS)]
+        for t in threads:
+            t.start()
+        time.sleep(SECONDS)
+        stop.set()
+        for t in threads:
+            t.join()
+        return sum(reads) / SECONDS, sum(writes) / SECONDS
+
+    idle_reads, _ = phase(with_writes=False)
+    busy_reads, writes = phase(with_writes=True)
+    print(f"[{SQLITE_PROFILE}] pragmas={storage_pragmas}")
+    print(f"[{SQLITE_PROFILE}] reads/s idle: {idle_reads:8.0f}")
+    print(f"[{SQLITE_PROFILE}] reads/s with writes: {busy_reads:8.0f} ({busy_reads / idle_reads:.0%} of idle), enrollments/s: {writes:.0f}")
+
+if __name__ == "__main__":
+    if "--profile" in sys.argv:
+        os.environ["SQLITE_PROFILE"] = sys.argv[sys.argv.index("--profile") + 1]
+        run_profile()
+    else:
+        for profile in ("dev", "production"):
+            subprocess.run([sys.executable, __file__, "--profile", profile], check=True)
@@ -0,0 +1,154 @@
+import heapq
+from fastapi import HTTPException
+from sqlalchemy import tuple_, delete
+from sqlmodel import Session, select, func
+from models.schema import User, Course, FacultyCourse, CourseSeatCount, SectionTimetable
+
+# Faculty allocation: batch changes and load-balanced automatic assignment.
+#
+# A faculty member's load is the credits and enrolled students of the courses
+# they teach (shared equally between co-teachers), each normalized by the
+# per-faculty average so the two count the same. Courses are assigned
+# heaviest first to the least-loaded faculty of the course's department: the
+# longest-processing-time greedy, kept on heaps so n courses over m faculty cost
+# O(n log m). A course may go outside its department when every member of the
+# department is already more than AFFINITY_SLACK average loads ahead of the
+# least-loaded faculty overall, or when the department has no faculty.
+
+AFFINITY_SLACK = 0.5
+PAIR_CHUNK = 400  # (faculty_id, course_id) pairs per IN list, under SQLite's variable limit
+
+def balance_assignments(courses: list, faculty: list, load: dict = None, slack: float = AFFINITY_SLACK) -> dict:
+    """Assign each course to one faculty member.
+
+    courses: [(course_id, dept, credits, students)]
+    faculty: [(faculty_id, dept)]
+    load:    {faculty_id: (credits, students)} already carried; updated in place
+    Returns {course_id: faculty_id}.
+    """
+    if not faculty:
+        return {}
+    load = load if load is not None else {}
+    for f_id, _ in faculty:
+        load.setdefault(f_id, (0, 0))
+    total_credits = sum(c for c, _ in load.values()) + sum(c[2] for c in courses)
+    total_students = sum(s for _, s in load.values()) + sum(c[3] for c in courses)
+    credit_unit = total_credits / len(faculty) or 1
+    student_unit = total_students / len(faculty) or 1
+
+    def score(credits, students):
+        return credits / credit_unit + students / student_unit
+
+    # Lazy-deletion heaps: an entry is live only while its stamp matches
+    stamp = {f_id: 0 for f_id, _ in faculty}
+    everyone = [(score(*load[f_id]), f_id, 0) for f_id, _ in faculty]
+    by_dept = {}
+    for f_id, dept in faculty:
+        by_dept.setdefault(dept, []).append((score(*load[f_id]), f_id, 0))
+    heapq.heapify(everyone)
+    for heap in by_dept.values():
+        heapq.heapify(heap)
+    dept_of = dict(faculty)
+
+    def peek(heap):
+        while heap and heap[0][2] != stamp[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    assignment = {}
+    for course_id, dept, credits, students in sorted(courses, key=lambda c: (-score(c[2], c[3]), c[0])):
+        best = peek(everyone)
+        local = peek(by_dept.get(dept, []))
+        chosen = local if local is not None and local[0] - best[0] <= slack else best
+        f_id = chosen[1]
+        assignment[course_id] = f_id
+        f_credits, f_students = load[f_id]
+        load[f_id] = (f_credits + credits, f_students + students)
+        stamp[f_id] += 1
+        entry = (score(*load[f_id]), f_id, stamp[f_id])
+        heapq.heappush(everyone, entry)
+        heapq.heappush(by_dept[dept_of[f_id]], entry)
+    return assignment
+
+def load_summary(load: dict) -> dict:
+    if not load:
+        return {"faculty": 0}
+    credits = sorted(c for c, _ in load.values())
+    students = sorted(s for _, s in load.values())
+    return {
+        "faculty": len(load),
+        "credits": {"min": round(credits[0], 2), "max": round(credits[-1], 2), "mean": round(sum(credits) / len(credits), 2)},
+        "students": {"min": round(students[0], 2), "max": round(students[-1], 2), "mean": round(sum(students) / len(students), 2)},
+    }
+
+def current_load(session: Session) -> dict:
+    """{faculty_id: (credits, enrolled students)} over existing allocations, split between co-teachers."""
+    teachers = func.count().over(partition_by=FacultyCourse.course_id)
+    rows = session.exec(
+        select(FacultyCourse.faculty_id, Course.credits, func.coalesce(CourseSeatCount.count, 0), teachers)
+        .join(Course, Course.id == FacultyCourse.course_id)
+        .outerjoin(CourseSeatCount, (CourseSeatCount.course_id == Course.id) & (CourseSeatCount.status == "enrolled"))
+    ).all()
+    load = {}
+    for f_id, credits, students, shared in rows:
+        f_credits, f_students = load.get(f_id, (0, 0))
+        load[f_id] = (f_credits + credits / shared, f_students + students / shared)
+    return load
+
+def auto_assign(session: Session, dept_of_degree: dict, degree_id: str = None) -> tuple:
+    """Allocate every course that has no faculty yet. Adds the rows; the caller commits.
+
+    Returns ([(course_id, faculty_id)], load summary after assignment).
+    """
+    faculty = session.exec(select(User.id, User.dept).where(User.role == "faculty")).all()
+    allocated = select(FacultyCourse.course_id)
+    statement = (
+        select(Course.id, Course.degree_id, Course.credits, func.coalesce(CourseSeatCount.count, 0))
+        .outerjoin(CourseSeatCount, (CourseSeatCount.course_id == Course.id) & (CourseSeatCount.status == "enrolled"))
+        .where(Course.id.not_in(allocated))
+    )
+    if degree_id:
+        statement = statement.where(Course.degree_id == degree_id)
+    courses = [(c_id, dept_of_degree.get(d_id), credits, students) for c_id, d_id, credits, students in session.exec(statement).all()]
+    if courses and not faculty:
+        raise HTTPException(status_code=409, detail="No faculty to assign courses to")
+
+    load = current_load(session)
+    assignment = balance_assignments(courses, [(f_id, dept) for f_id, dept in faculty], load)
+    session.add_all([FacultyCourse(faculty_id=f_id, course_id=c_id) for c_id, f_id in assignment.items()])
+    return sorted(assignment.items()), load_summary(load)
+
+def apply_allocations(session: Session, add: list, remove: list) -> dict:
+    """Apply many allocation changes at once, all-or-nothing. The caller commits.
+
+    add/remove are lists of (faculty_id, course_id). Adding an existing pair or
+    removing a missing one is a no-op.
+    """
+    add, remove = set(add), set(remove)
+    if add & remove:
+        raise HTTPException(status_code=400, detail="A pair can't be both added and removed")
+    faculty_ids = {f for f, _ in add}
+    course_ids = {c for _, c in add}
+    known_faculty = set(session.exec(select(User.id).where(User.id.in_(faculty_ids), User.role == "faculty")).all())
+    known_courses = set(session.exec(select(Course.id).where(Course.id.in_(course_ids))).all())
+    unknown = sorted(faculty_ids - known_faculty) + sorted(course_ids - known_courses)
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown faculty or course: {', '.join(unknown)}")
+
+    pair = tuple_(FacultyCourse.faculty_id, FacultyCourse.course_id)
+    pairs = sorted(add | remove)
+    existing = set()
+    for i in range(0, len(pairs), PAIR_CHUNK):
+        existing.update((f, c) for f, c in session.exec(
+            select(FacultyCourse.faculty_id, FacultyCourse.course_id).where(pair.in_(pairs[i:i + PAIR_CHUNK]))
+        ).all())
+
+    to_add = sorted(add - existing)
+    to_remove = sorted(remove & existing)
+    session.add_all([FacultyCourse(faculty_id=f, course_id=c) for f, c in to_add])
+    for i in range(0, len(to_remove), PAIR_CHUNK):
+        session.exec(delete(FacultyCourse).where(pair.in_(to_remove[i:i + PAIR_CHUNK])))
+        session.exec(delete(SectionTimetable).where(
+            tuple_(SectionTimetable.faculty_id, SectionTimetable.course_id).in_(to_remove[i:i + PAIR_CHUNK])
+        ))
+    return {"added": len(to_add), "removed": len(to_remove), "unchanged": len(add) + len(remove) - len(to_add) - len(to_remove)}
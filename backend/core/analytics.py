@@ -0,0 +1,156 @@
+import threading
+from sqlalchemy import text, case
+from sqlmodel import Session, select, func
+from models.schema import Course, Enrollment, DegreeVersion
+
+# Degree history analytics, aggregated in SQL and cached per degree.
+#
+# DegreeVersion is bumped by triggers whenever a finished enrollment (completed
+# or backlog, the only rows history reads) is added, removed or changed, or a
+# course of that degree changes. Seat reservations (status 'enrolled') leave it
+# alone, so registration traffic doesn't keep invalidating the cache. A cached
+# result is served while its version still matches, so a lookup costs one
+# primary-key read and the expensive aggregation only reruns after a relevant
+# write, from any process.
+
+_FINISHED = "('completed', 'backlog')"
+
+def _bump_version(course_ref):
+    return (
+        f"INSERT INTO degreeversion (degree_id, version) SELECT degree_id, 1 FROM course WHERE id = {course_ref} "
+        "ON CONFLICT(degree_id) DO UPDATE SET version = version + 1;"
+    )
+
+_BUMP_DEGREE = (
+    "INSERT INTO degreeversion (degree_id, version) VALUES ({degree}, 1) "
+    "ON CONFLICT(degree_id) DO UPDATE SET version = version + 1;"
+)
+
+HISTORY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_enrollment_insert AFTER INSERT ON enrollment
+    WHEN NEW.status IN {_FINISHED}
+    BEGIN {_bump_version("NEW.course_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_enrollment_delete AFTER DELETE ON enrollment
+    WHEN OLD.status IN {_FINISHED}
+    BEGIN {_bump_version("OLD.course_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_enrollment_update AFTER UPDATE OF status, grade, course_id, sem ON enrollment
+    WHEN OLD.status IN {_FINISHED} OR NEW.status IN {_FINISHED}
+    BEGIN {_bump_version("OLD.course_id")} {_bump_version("NEW.course_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_course_insert AFTER INSERT ON course
+    BEGIN {_BUMP_DEGREE.format(degree="NEW.degree_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_course_delete AFTER DELETE ON course
+    BEGIN {_BUMP_DEGREE.format(degree="OLD.degree_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS history_course_update AFTER UPDATE OF degree_id, name, sem ON course
+    BEGIN {_BUMP_DEGREE.format(degree="OLD.degree_id")} {_BUMP_DEGREE.format(degree="NEW.degree_id")} END
+    """,
+]
+
+ENROLLMENT_HISTORY_TRIGGERS = ["history_enrollment_insert", "history_enrollment_delete", "history_enrollment_update"]
+
+def install_history_triggers(conn):
+    for ddl in HISTORY_TRIGGERS:
+        conn.execute(text(ddl))
+
+# Grade distribution over finished enrollments: (label, lower bound inclusive).
+# A completed grade of 0 and every backlog count as F.
+GRADE_BUCKETS = [("A", 3.5), ("B", 3.0), ("C", 2.5), ("D", 0.0)]
+
+def _bucket_columns():
+    completed = Enrollment.status == "completed"
+    columns = []
+    upper = None
+    for label, lower in GRADE_BUCKETS:
+        cond = completed & ((Enrollment.grade >= lower) if lower else (Enrollment.grade > lower))
+        if upper is not None:
+            cond = cond & (Enrollment.grade < upper)
+        columns.append(func.sum(case((cond, 1), else_=0)).label(label))
+        upper = lower
+    failed = (Enrollment.status == "backlog") | (completed & (Enrollment.grade <= 0))
+    columns.append(func.sum(case((failed, 1), else_=0)).label("F"))
+    return columns
+
+def _aggregates():
+    completed = Enrollment.status == "completed"
+    return [
+        func.sum(case((completed, 1), else_=0)).label("completions"),
+        func.sum(case((Enrollment.status == "backlog", 1), else_=0)).label("backlogs"),
+        func.avg(case((completed, Enrollment.grade))).label("avg_gpa"),
+        func.min(case((completed, Enrollment.grade))).label("min_gpa"),
+        func.max(case((completed, Enrollment.grade))).label("max_gpa"),
+        *_bucket_columns(),
+    ]
+
+def _summary(row):
+    completions = row.completions or 0
+    backlogs = row.backlogs or 0
+    attempts = completions + backlogs
+    return {
+        "completions": completions,
+        "backlogs": backlogs,
+        "backlog_rate": round(backlogs / attempts, 3) if attempts else 0,
+        "avg_gpa": round(row.avg_gpa, 2) if row.avg_gpa is not None else 0,
+        "min_gpa": row.min_gpa,
+        "max_gpa": row.max_gpa,
+        "grade_distribution": {label: getattr(row, label) or 0 for label in [*(b for b, _ in GRADE_BUCKETS), "F"]},
+    }
+
+def compute_degree_history(session: Session, degree_id: str) -> dict:
+    finished = Enrollment.status.in_(["completed", "backlog"])
+
+    per_course = session.exec(
+        select(Course.id, Course.name, Course.sem, *_aggregates())
+        .outerjoin(Enrollment, (Enrollment.course_id == Course.id) & finished)
+        .where(Course.degree_id == degree_id)
+        .group_by(Course.id, Course.name, Course.sem)
+        .order_by(Course.sem, Course.id)
+    ).all()
+
+    per_sem = session.exec(
+        select(Enrollment.sem, *_aggregates())
+        .join(Course, Course.id == Enrollment.course_id)
+        .where(Course.degree_id == degree_id, finished)
+        .group_by(Enrollment.sem)
+        .order_by(Enrollment.sem)
+    ).all()
+
+    overall = session.exec(
+        select(*_aggregates())
+        .join(Course, Course.id == Enrollment.course_id)
+        .where(Course.degree_id == degree_id, finished)
+    ).one()
+    totals = _summary(overall)
+
+    return {
+        "total_completions": totals["completions"],
+        "avg_gpa": totals["avg_gpa"],
+        "summary": totals,
+        "course_breakdown": [{"id": r.id, "name": r.name, "sem": r.sem, **_summary(r)} for r in per_course],
+        "semester_breakdown": [{"sem": r.sem, **_summary(r)} for r in per_sem],
+    }
+
+_cache = {}  # degree_id -> (version, result); only degrees that have courses, so it stays bounded
+_cache_lock = threading.Lock()
+
+def degree_history(session: Session, degree_id: str) -> dict:
+    version = session.exec(select(DegreeVersion.version).where(DegreeVersion.degree_id == degree_id)).first() or 0
+    with _cache_lock:
+        cached = _cache.get(degree_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    result = compute_degree_history(session, degree_id)
+    if result["course_breakdown"]:
+        # An unknown degree_id has no courses; don't let arbitrary ids grow the cache
+        with _cache_lock:
+            _cache[degree_id] = (version, result)
+    return result
@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlmodel import Session
+from starlette.responses import Response
+from models.schema import User, Degree, Course
+from core.serialization import dumps
+
+# In-process cache of catalog responses (degrees, courses, faculty).
+#
+# Entries are the finished JSON body plus paging headers, so a hit is a dict
+# lookup and a write of ready-made bytes: no SQL, no ORM, no encoding. The cache
+# is an LRU bounded by entry count and total body bytes, and every entry also
+# expires after CATALOG_CACHE_TTL seconds, which bounds staleness from writers
+# in other processes (seed and ingest scripts).
+#
+# In this process writes invalidate precisely. Each entry is tagged with the
+# rows it contains (course:<id>, user:<id>) and the list it belongs to
+# (course-list, degree-courses:<degree>, faculty-list, degrees). Session flush
+# hooks turn changed Course/User/Degree rows into tags: an edit drops only the
+# pages holding that row, while an insert, delete or a change to a sort key
+# drops the whole list. Allocation writes (FacultyCourse) change none of the
+# cached columns and leave the cache alone.
+
+CACHE_ENTRIES = int(os.getenv("CATALOG_CACHE_ENTRIES", "2048"))
+CACHE_BYTES = int(os.getenv("CATALOG_CACHE_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300")) # 0 disables the cache
+
+class _Entry:
+    __slots__ = ("body", "headers", "tags", "expires", "size")
+
+    def __init__(self, body: bytes, headers: dict, tags: set, expires: float):
+        self.body = body
+        self.headers = headers
+        self.tags = tags
+        self.expires = expires
+        self.size = len(body) + sum(len(k) + len(v) for k, v in headers.items())
+
+class ResponseCache:
+    def __init__(self, max_entries: int = CACHE_ENTRIES, max_bytes: int = CACHE_BYTES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> _Entry, least recently used first
+        self.by_tag = {}              # tag -> set of keys
+        self.bytes = 0
+        self.generation = 0           # bumped by every invalidation
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0, "invalidated": 0}
+
+    def _drop(self, key, reason: str = None):
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self.by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_tag[tag]
+        if reason:
+            self.evictions[reason] += 1
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                self._drop(key, "ttl")
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body: bytes, headers: dict, tags, generation: int):
+        """Store unless an invalidation ran since generation was read (the body may predate it)."""
+        entry = _Entry(body, headers, set(tags), time.monotonic() + self.ttl)
+        if entry.size > self.max_bytes:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = entry
+            self.bytes += entry.size
+            for tag in entry.tags:
+                self.by_tag.setdefault(tag, set()).add(key)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)), "lru")
+
+    def invalidate(self, tags) -> int:
+        with self.lock:
+            self.generation += 1
+            keys = set()
+            for tag in tags:
+                keys |= self.by_tag.get(tag, set())
+            for key in keys:
+                self._drop(key, "invalidated")
+            return len(keys)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            for key in list(self.entries):
+                self._drop(key, "invalidated")
+
+    async def respond(self, request, load, tags) -> Response:
+        """Serve request from the cache, or run load() -> (payload, headers) and cache the encoded result.
+
+        tags(payload) names what the payload depends on.
+        """
+        if self.ttl <= 0:
+            payload, headers = await load()
+            return self._response(dumps(payload), headers, "BYPASS")
+        key = str(request.url)
+        entry = self.get(key)
+        if entry is not None:
+            return self._response(entry.body, entry.headers, "HIT")
+        generation = self.generation
+        payload, headers = await load()
+        body = dumps(payload)
+        self.put(key, body, headers, tags(payload), generation)
+        return self._response(body, headers, "MISS")
+
+    @staticmethod
+    def _response(body: bytes, headers: dict, status: str) -> Response:
+        return Response(body, media_type="application/json", headers={**headers, "X-Cache": status})
+
+    def render(self) -> str:
+        with self.lock:
+            lines = [
+                "# HELP catalog_cache_requests_total Catalog cache lookups by result.",
+                "# TYPE catalog_cache_requests_total counter",
+                f'catalog_cache_requests_total{{result="hit"}} {self.hits}',
+                f'catalog_cache_requests_total{{result="miss"}} {self.misses}',
+                "# HELP catalog_cache_evictions_total Catalog cache entries removed, by reason.",
+                "# TYPE catalog_cache_evictions_total counter",
+            ]
+            lines += [f'catalog_cache_evictions_total{{reason="{r}"}} {n}' for r, n in sorted(self.evictions.items())]
+            lines += [
+                "# HELP catalog_cache_entries Entries currently cached.",
+                "# TYPE catalog_cache_entries gauge",
+                f"catalog_cache_entries {len(self.entries)}",
+                "# HELP catalog_cache_bytes Bytes currently cached.",
+                "# TYPE catalog_cache_bytes gauge",
+                f"catalog_cache_bytes {self.bytes}",
+            ]
+        return "\n".join(lines) + "\n"
+
+catalog_cache = ResponseCache()
+
+# -- Write-driven invalidation --
+
+_TAGS = "catalog_cache_tags"
+
+def note_cache_tags(session: Session, tags):
+    """Record tags to invalidate on commit for writes the ORM doesn't see (bulk or raw SQL)."""
+    session.info.setdefault(_TAGS, set()).update(tags)
+
+def _changed(obj, *names) -> bool:
+    attrs = inspect(obj).attrs
+    return any(getattr(attrs, name).history.has_changes() for name in names)
+
+def _course_tags(course: Course, membership: bool) -> set:
+    if not membership:
+        return {f"course:{course.id}"}
+    degree_ids = {course.degree_id} | set(inspect(course).attrs.degree_id.history.deleted or ())
+    return {"course-list", f"course:{course.id}"} | {f"degree-courses:{d}" for d in degree_ids}
+
+@event.listens_for(Session, "after_flush")
+def _collect(session, flush_context):
+    tags = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Course):
+            tags |= _course_tags(obj, True)
+        elif isinstance(obj, User) and obj.role == "faculty":
+            tags |= {"faculty-list", f"user:{obj.id}"}
+        elif isinstance(obj, Degree):
+            tags.add("degrees")
+    for obj in session.dirty:
+        if isinstance(obj, Course):
+            tags |= _course_tags(obj, _changed(obj, "degree_id", "sem"))
+        elif isinstance(obj, User):
+            tags |= {"faculty-list", f"user:{obj.id}"} if _changed(obj, "role") else {f"user:{obj.id}"}
+        elif isinstance(obj, Degree):
+            tags.add("degrees")
+    if tags:
+        note_cache_tags(session, tags)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    tags = session.info.pop(_TAGS, None)
+    if tags:
+        catalog_cache.invalidate(tags)
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_TAGS, None)
@@ -0,0 +1,213 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import text
+from sqlmodel import Session, select
+from db.database import write_session
+from models.schema import Degree, CurriculumSource, utcnow
+from core.cache import note_cache_tags
+
+# Curriculum ingestion: PDF (or already-extracted text) -> Course/Degree rows.
+#
+#   sources   *.pdf or *_text.txt; the degree comes from the file name prefix
+#             (AIDS_Curriculum.pdf, aids_text.txt -> AIDS)
+#   hash      sha256 of the file bytes; a file whose hash matches its
+#             CurriculumSource row is skipped unless forced
+#   extract   PDFs are split into page ranges and read on a process pool
+#   parse     the "Semester – N" tables of the CURRICULUM FOR SEMESTERS I-VIII
+#             section; each semester's credits are checked against its
+#             "Total Credits" line
+#   load      courses upserted per degree in one transaction (name, credits,
+#             sem, year; max_enroll and enrollments are left alone)
+#
+# Only coded, credit-bearing courses become catalog rows. Elective slots have no
+# code and NCC / value-added courses sit outside the credit total, so those are
+# counted for the check but not loaded.
+
+PAGES_PER_TASK = 8
+
+ROMAN = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5, "VI": 6, "VII": 7, "VIII": 8}
+SEMESTER_HEADING = re.compile(r"^\s*SEMESTER\s*[–-]?\s*(VIII|VII|VI|IV|V|III|II|I)\s*$", re.I | re.M)
+SEMESTER_TOTAL = re.compile(r"^\s*Total(?:\s+Credits)?\s+(\d+)\s*$", re.I | re.M)
+PROGRAMME = re.compile(r"^\s*((?:B|M)\.\s?(?:E|TECH)\.?\s.*?)\s*(?:CURRICULUM.*)?$", re.I | re.M)
+# S.No, optional course code, name (may have wrapped), type, L-T-P, TCP, credits, category
+COURSE_ROW = re.compile(
+    r"(?<!\S)\d{1,2}\.?\s+(?:(?P<code>\d{2}U[A-Z]{2,3}\d{3})\s+)?(?P<name>\S.*?)\s+"
+    r"(?P<type>T/LIT|LIT|PCD|COT|NCC|IP|MC|VC|PW|IT|CC|T|L|P)\s+(?P<ltp>\d+-\d+-\d+|-)\s+(?P<tcp>\d+|-)\s+"
+    r"(?P<credits>\d+|-)\s+(?P<category>HSMC|BSC|ESC|PCC|PEC|OEC|EEC|MC|-)(?!\S)",
+    re.S
+)
+# Outside the semester credit total
+UNCOUNTED_TYPES = {"NCC", "VC"}
+
+class CurriculumError(ValueError):
+    pass
+
+def source_prefix(path: str) -> str:
+    return os.path.basename(path).split("_")[0].upper()
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# -- Extraction (runs in worker processes) --
+
+def _page_count(path: str) -> int:
+    import pypdf
+    return len(pypdf.PdfReader(path).pages)
+
+def _extract_pages(path: str, start: int, stop: int) -> str:
+    import pypdf
+    reader = pypdf.PdfReader(path)
+    return "\n".join(reader.pages[n].extract_text() or "" for n in range(start, stop))
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def extract_texts(paths: list, pool: ProcessPoolExecutor) -> dict:
+    """{path: text} for PDFs (page ranges in parallel) and .txt files."""
+    pdfs = [p for p in paths if p.lower().endswith(".pdf")]
+    texts = {p: pool.submit(_read_text, p) for p in paths if p not in pdfs}
+    counts = dict(zip(pdfs, pool.map(_page_count, pdfs)))
+    chunks = {
+        p: [pool.submit(_extract_pages, p, start, min(start + PAGES_PER_TASK, n)) for start in range(0, n, PAGES_PER_TASK)]
+        for p, n in counts.items()
+    }
+    result = {p: f.result() for p, f in texts.items()}
+    result.update({p: "\n".join(f.result() for f in futures) for p, futures in chunks.items()})
+    return result
+
+# -- Parsing --
+
+def _clean_name(name: str) -> str:
+    # Bilingual titles are "<Tamil> / <English>"; keep the English part
+    if "/" in name and not name.split("/")[0].isascii():
+        name = name.split("/")[-1]
+    return " ".join(name.split()).strip(" -")
+
+def parse_curriculum(content: str) -> dict:
+    """Structured curriculum from extracted text.
+
+    Returns {"programme": str or None, "semesters": {sem: {"declared": int,
+    "counted": int, "courses": [{code, name, credits, sem, type, category}]}}}.
+    Raises CurriculumError when there are no semester tables or a semester's
+    parsed credits disagree with its declared total.
+    """
+    headings = list(SEMESTER_HEADING.finditer(content))
+    if not headings:
+        raise CurriculumError("No semester tables found")
+    programme = PROGRAMME.search(content)
+    semesters = {}
+    for i, heading in enumerate(headings):
+        sem = ROMAN[heading.group(1).upper()]
+        if sem in semesters:
+            continue  # later mentions (syllabi, electives) repeat the heading
+        body = content[heading.end():headings[i + 1].start() if i + 1 < len(headings) else len(content)]
+        total = SEMESTER_TOTAL.search(body)
+        if total:
+            body = body[:total.start()]
+        courses, counted = [], 0
+        for row in COURSE_ROW.finditer(" ".join(body.split())):
+            credits = int(row["credits"]) if row["credits"] != "-" else 0
+            if row["type"] not in UNCOUNTED_TYPES:
+                counted += credits
+            if row["code"] and credits and row["type"] not in UNCOUNTED_TYPES:
+                courses.append(dict(
+                    code=row["code"], name=_clean_name(row["name"]), credits=credits, sem=sem,
+                    type=row["type"], category=row["category"]
+                ))
+        declared = int(total.group(1)) if total else None
+        if declared is not None and declared != counted:
+            raise CurriculumError(f"Semester {sem}: parsed {counted} credits, table declares {declared}")
+        semesters[sem] = {"declared": declared, "counted": counted, "courses": courses}
+    return {"programme": " ".join(programme.group(1).split()) if programme else None, "semesters": semesters}
+
+def parse_source(path: str, content: str):
+    """Pool task: (path, parsed or None, error or None)."""
+    try:
+        return path, parse_curriculum(content), None
+    except CurriculumError as e:
+        return path, None, str(e)
+
+# -- Loading --
+
+def course_rows(degree_id: str, parsed: dict) -> list:
+    """Course rows in the catalog's id scheme; a code repeated within a degree keeps its first semester."""
+    suffix = degree_id.split("_")[-1]
+    rows, seen = [], set()
+    for sem in sorted(parsed["semesters"]):
+        for c in parsed["semesters"][sem]["courses"]:
+            course_id = f"{c['code']}_{suffix}"
+            if course_id in seen:
+                continue
+            seen.add(course_id)
+            rows.append(dict(id=course_id, degree_id=degree_id, name=c["name"], credits=c["credits"],
+                             max_enroll=30, year=(sem + 1) // 2, sem=sem))
+    return rows
+
+UPSERT_COURSE = text("""
+    INSERT INTO course (id, degree_id, name, credits, max_enroll, year, sem)
+    VALUES (:id, :degree_id, :name, :credits, :max_enroll, :year, :sem)
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name, credits = excluded.credits, year = excluded.year, sem = excluded.sem
+    WHERE course.name IS NOT excluded.name OR course.credits IS NOT excluded.credits OR course.sem IS NOT excluded.sem
+""")
+
+def load_curriculum(session: Session, path: str, digest: str, degree_id: str, parsed: dict) -> int:
+    """Upsert one degree's courses and record the source hash. The caller commits."""
+    if not session.get(Degree, degree_id):
+        name = parsed["programme"] or degree_id
+        session.add(Degree(id=degree_id, type="PG" if name.upper().startswith("M") else "UG", name=name.title()))
+        session.flush()
+    rows = course_rows(degree_id, parsed)
+    if rows:
+        session.connection().execute(UPSERT_COURSE, rows)
+        note_cache_tags(session, {"course-list", f"degree-courses:{degree_id}"} | {f"course:{r['id']}" for r in rows})
+    source = session.get(CurriculumSource, os.path.abspath(path)) or CurriculumSource(path=os.path.abspath(path))
+    source.sha256 = digest
+    source.degree_id = degree_id
+    source.courses = len(rows)
+    source.ingested_at = utcnow()
+    session.add(source)
+    return len(rows)
+
+def ingest(paths: list, degree_for_prefix: dict, workers: int = None, force: bool = False, dry_run: bool = False) -> list:
+    """Hash, extract, parse and load curriculum sources. Returns one report dict per path."""
+    reports = {}
+    for p in paths:
+        prefix = source_prefix(p)
+        reports[p] = {"path": p, "degree_id": degree_for_prefix.get(prefix, f"deg_ug_{prefix.lower()}")}
+    digests = {p: file_hash(p) for p in paths}
+    with write_session() as session:
+        known = {path: sha for path, sha in session.exec(select(CurriculumSource.path, CurriculumSource.sha256)).all()}
+    changed = []
+    for p in paths:
+        if not force and known.get(os.path.abspath(p)) == digests[p]:
+            reports[p]["status"] = "unchanged"
+        else:
+            changed.append(p)
+    if not changed:
+        return list(reports.values())
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        texts = extract_texts(changed, pool)
+        parsed = list(pool.map(parse_source, changed, [texts[p] for p in changed]))
+    with write_session() as session:
+        for path, result, error in parsed:
+            report = reports[path]
+            if error:
+                report.update(status="error", error=error)
+                continue
+            report["semesters"] = len(result["semesters"])
+            report["courses"] = load_curriculum(session, path, digests[path], report["degree_id"], result)
+            report["status"] = "parsed" if dry_run else "loaded"
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+    return list(reports.values())
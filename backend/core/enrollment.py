@@ -0,0 +1,152 @@
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlmodel import select
+from db.database import write_session
+from models.schema import User, Course, Enrollment, FacultyCourse, CourseSeatCount, SectionTimetable
+from core.seats import enrolled_seats, seat_join_condition
+from core.waitlist import WaitlistChanges, join_waitlist, promote, commit_with_waitlist
+from core.timetable import check_selection, section_slots, section_mask
+from core.prerequisites import missing_prerequisites
+
+MIN_CREDITS = 20
+
+def enroll_selection(student_id: str, selected: list, waitlist: bool = False) -> dict:
+    """Reserve seats for a student's whole selection, all-or-nothing.
+
+    Runs inside a write transaction, so the seat counts read here can't change
+    before the inserts commit and no course can be pushed past max_enroll.
+    A full course fails the whole selection with 409 unless waitlist is on, in
+    which case the student is queued for it instead. MIN_CREDITS counts seated
+    courses only; waitlisted credits don't count towards it.
+    """
+    if not isinstance(selected, list):
+        raise HTTPException(status_code=400, detail="selected_courses must be a list of {course_id, faculty_id}")
+    pairs = {}
+    for item in selected:
+        if not isinstance(item, dict) or not all(
+            isinstance(item.get(key), str) and item[key] for key in ("course_id", "faculty_id")
+        ):
+            raise HTTPException(status_code=400, detail="Every selected course needs a course_id and faculty_id")
+        course_id = item["course_id"]
+        if course_id in pairs:
+            raise HTTPException(status_code=400, detail=f"Course {course_id} selected more than once")
+        pairs[course_id] = item["faculty_id"]
+    course_ids = list(pairs)
+
+    with write_session() as session:
+        student = session.get(User, student_id)
+        if not student or student.role != "student":
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        current_sem = int(student.year) * 2
+
+        # Live seat counts come with the courses; no separate capacity query
+        rows = session.exec(
+            select(Course, enrolled_seats())
+            .outerjoin(CourseSeatCount, seat_join_condition(Course.id))
+            .where(Course.id.in_(course_ids))
+        ).all()
+        courses = {c.id: c for c, _ in rows}
+        missing = [c_id for c_id in course_ids if c_id not in courses]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Unknown course: {', '.join(missing)}")
+
+        # Credit check over the whole selection; repeated below for seated courses when some are full
+        total_credits = sum(c.credits for c in courses.values())
+        if total_credits < MIN_CREDITS:
+            raise HTTPException(status_code=400, detail=f"Minimum {MIN_CREDITS} credits required. Current: {total_credits}")
+
+        # Capacity check before the costlier checks below: in a rush most selections fail here
+        full = [c.id for c, enrolled_count in rows if enrolled_count >= c.max_enroll]
+        if full and not waitlist:
+            raise HTTPException(status_code=409, detail=f"Course full: {', '.join(full)}")
+        total_credits -= sum(courses[c_id].credits for c_id in full)
+        if total_credits < MIN_CREDITS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Minimum {MIN_CREDITS} credits required in courses with free seats. "
+                       f"Seated: {total_credits}; full: {', '.join(full)}"
+            )
+
+        # The chosen sections, with their timetable masks
+        chosen = dict(session.exec(
+            select(FacultyCourse.course_id, section_mask())
+            .outerjoin(SectionTimetable, section_slots(FacultyCourse.course_id, FacultyCourse.faculty_id))
+            .where(tuple_(FacultyCourse.course_id, FacultyCourse.faculty_id).in_(list(pairs.items())))
+        ).all())
+        unallocated = [c_id for c_id in pairs if c_id not in chosen]
+        if unallocated:
+            raise HTTPException(status_code=400, detail=f"Selected faculty does not handle: {', '.join(unallocated)}")
+
+        # Duplicate check, reading the masks of the student's enrolled sections in the same query
+        taken, committed = [], {}
+        for c_id, status, mask in session.exec(
+            select(Enrollment.course_id, Enrollment.status, section_mask())
+            .outerjoin(SectionTimetable, section_slots(Enrollment.course_id, Enrollment.faculty_id))
+            .where(Enrollment.student_id == student_id, Enrollment.status.in_(["enrolled", "completed"]))
+        ).all():
+            if c_id in pairs:
+                taken.append(c_id)
+            elif status == "enrolled":
+                committed[c_id] = mask
+        if taken:
+            raise HTTPException(status_code=409, detail=f"Already enrolled in: {', '.join(sorted(set(taken)))}")
+
+        # Prerequisite check: everything up the chain must be completed, not just attempted
+        missing = missing_prerequisites(session, student_id, course_ids)
+        if missing:
+            detail = "; ".join(f"{c_id} needs {', '.join(reqs)}" for c_id, reqs in sorted(missing.items()))
+            raise HTTPException(status_code=409, detail=f"Missing prerequisites: {detail}")
+
+        # Timetable check, against the student's enrolled sections and within the selection
+        check_selection(committed, {c_id: chosen[c_id] for c_id in pairs})
+
+        session.add_all([
+            Enrollment(
+                student_id=student_id,
+                course_id=c_id,
+                faculty_id=f_id,
+                sem=current_sem,
+                status="enrolled"
+            )
+            for c_id, f_id in pairs.items() if c_id not in full
+        ])
+        changes = WaitlistChanges()
+        queued = [join_waitlist(session, student, courses[c_id], pairs[c_id], current_sem, changes) for c_id in full]
+        commit_with_waitlist(session, changes)
+        if not queued:
+            return {"message": "Enrolled successfully", "total_credits": total_credits}
+        return {
+            "message": f"Enrolled; waitlisted for {', '.join(full)}",
+            "total_credits": total_credits,
+            "waitlisted": [{"course_id": e.course_id, "entry_id": e.id} for e in queued]
+        }
+
+def drop_course(student_id: str, course_id: str) -> dict:
+    """Release a student's active seat and hand it to the head of the waitlist."""
+    with write_session() as session:
+        seat = session.exec(select(Enrollment).where(
+            Enrollment.student_id == student_id, Enrollment.course_id == course_id, Enrollment.status == "enrolled"
+        )).first()
+        if not seat:
+            raise HTTPException(status_code=404, detail="Not enrolled in this course")
+        session.delete(seat)
+        changes = WaitlistChanges()
+        promoted = promote(session, course_id, changes)
+        commit_with_waitlist(session, changes)
+        return {"message": "Course dropped", "promoted": promoted}
+
+def set_capacity(course_id: str, max_enroll: int) -> dict:
+    """Change a course's max_enroll; any seats this frees go to the waitlist."""
+    if max_enroll < 0:
+        raise HTTPException(status_code=400, detail="max_enroll can't be negative")
+    with write_session() as session:
+        course = session.get(Course, course_id)
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+        course.max_enroll = max_enroll
+        session.add(course)
+        changes = WaitlistChanges()
+        promoted = promote(session, course_id, changes)
+        commit_with_waitlist(session, changes)
+        return {"course_id": course_id, "max_enroll": max_enroll, "promoted": promoted}
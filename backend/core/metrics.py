@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+import logging
+import os
+import threading
+import time
+from sqlalchemy import event
+
+# Per-route latency, SQL statement counts and database time, exported at /metrics
+# in Prometheus text format. Everything is kept in process memory behind one lock;
+# each request costs a couple of dict lookups plus two clock reads per statement.
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0")) # 0 disables the slow-request log
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+slow_log = logging.getLogger("app.slow_requests")
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "sql", "_started")
+
+    def __init__(self, capture_sql: bool):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.sql = [] if capture_sql else None
+        self._started = 0.0
+
+_current: ContextVar = ContextVar("request_stats", default=None)
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}      # (method, route) -> Histogram of seconds
+        self.statements = {}   # (method, route) -> Histogram of statements per request
+        self.db_seconds = {}   # (method, route) -> float
+        self.responses = {}    # (method, route, status) -> int
+
+    def record(self, method, route, status, seconds, stats):
+        key = (method, route)
+        with self.lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.statements[key] = Histogram(STATEMENT_BUCKETS)
+                self.db_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.statements[key].observe(stats.statements)
+            self.db_seconds[key] += stats.db_seconds
+            status_key = (method, route, status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            self._histogram(lines, "http_request_duration_seconds", "Request latency by route.", self.latency)
+            self._histogram(lines, "db_statements_per_request", "SQL statements issued per request.", self.statements)
+            lines.append("# HELP db_time_seconds_total Time spent executing SQL by route.")
+            lines.append("# TYPE db_time_seconds_total counter")
+            for (method, route), value in sorted(self.db_seconds.items()):
+                lines.append(f'db_time_seconds_total{{method="{method}",route="{route}"}} {value:.6f}')
+            lines.append("# HELP http_responses_total Responses by route and status code.")
+            lines.append("# TYPE http_responses_total counter")
+            for (method, route, status), value in sorted(self.responses.items()):
+                lines.append(f'http_responses_total{{method="{method}",route="{route}",status="{status}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram(lines, name, help_text, series):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (method, route), h in sorted(series.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+            lines.append(f"{name}_sum{{{labels}}} {h.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+registry = Registry()
+
+def instrument_engine(engine):
+    """Attribute every SQL statement on engine to the request that issued it."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None:
+            stats._started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None:
+            elapsed = time.perf_counter() - stats._started
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            if stats.sql is not None:
+                stats.sql.append((elapsed, statement))
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task overhead) timing each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(capture_sql=SLOW_REQUEST_MS > 0)
+        token = _current.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            # Label by route template so /api/student/enrolled/CSE001 and .../CSE002 share a series
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            registry.record(scope["method"], route_path, status_code, elapsed, stats)
+            if stats.sql is not None and elapsed * 1000 >= SLOW_REQUEST_MS:
+                slowest = sorted(stats.sql, reverse=True)[:5]
+                slow_log.warning(
+                    "%s %s took %.1fms (%d statements, %.1fms in db); slowest SQL:\n%s",
+                    scope["method"], scope["path"], elapsed * 1000, stats.statements, stats.db_seconds * 1000,
+                    "\n".join(f"  {ms * 1000:.1f}ms  {sql}" for ms, sql in slowest),
+                )
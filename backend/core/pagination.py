@@ -0,0 +1,74 @@
+import base64
+import json
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+# Keyset (cursor) pagination and column projection for list endpoints.
+#
+# A page is "rows after the last key of the previous page" rather than OFFSET n,
+# so SQLite seeks straight to the cursor through an index and page 1000 costs
+# the same as page 1. The cursor is the last row's key, base64-encoded JSON;
+# clients treat it as opaque. The body stays a plain JSON array and the next
+# cursor travels in the X-Next-Cursor / Link headers, so callers that only
+# want the first page need no changes.
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+class PageParams:
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str = None,
+        fields: str = None,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def project(fields: str, model, allowed, always=("id",)) -> list:
+    """Columns of model for a comma-separated fields= value; all allowed ones when empty."""
+    if not fields:
+        names = list(allowed)
+    else:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in allowed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    names = list(always) + [f for f in names if f not in always]
+    return [getattr(model, name) for name in names]
+
+def keyset_page(session, statement, keys, page: PageParams):
+    """Run statement ordered by keys, starting after page.cursor.
+
+    keys must be unique together and selected by the statement under their own
+    names. Returns (rows, next_cursor) with next_cursor None on the last page.
+    """
+    if page.cursor:
+        statement = statement.where(tuple_(*keys) > tuple_(*decode_cursor(page.cursor, len(keys))))
+    rows = session.exec(statement.order_by(*keys).limit(page.limit + 1)).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    rows = rows[:page.limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, key.key) for key in keys)
+
+def page_headers(next_cursor, url) -> dict:
+    if not next_cursor:
+        return {}
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{url.include_query_params(cursor=next_cursor)}>; rel="next"'}
+
+def set_page_headers(response: Response, next_cursor, url) -> None:
+    response.headers.update(page_headers(next_cursor, url))
@@ -0,0 +1,163 @@
+from fastapi import HTTPException
+from sqlalchemy import delete, or_, and_
+from sqlmodel import Session, select
+from models.schema import User, Course, Enrollment, CoursePrerequisite, PrerequisiteClosure
+
+# Prerequisites and course eligibility.
+#
+# CoursePrerequisite holds the direct edges an admin sets; PrerequisiteClosure
+# holds every (course, transitive prerequisite) pair and is rebuilt in the same
+# transaction whenever an edge changes, so reads never walk the graph. A course
+# is open to a student once every course in its closure is completed; a backlog
+# does not count, so an F anywhere up the chain blocks everything built on it.
+#
+# The candidates for a student are the courses of their degree in the current
+# (even) semester plus any course they hold an uncleared backlog in, minus what
+# they are enrolled in or have completed. Per student this is a couple of
+# subqueries in the enrollable listing; cohort_eligibility does a whole year of
+# a degree at once on bitsets, one bit per course.
+
+def _closure(edges: list) -> dict:
+    """{course_id: set of transitive prerequisites} from direct (course_id, requires_id) edges."""
+    requires, dependents = {}, {}
+    for course_id, requires_id in edges:
+        requires.setdefault(course_id, set()).add(requires_id)
+        dependents.setdefault(requires_id, set()).add(course_id)
+    nodes = set(requires) | set(dependents)
+    waiting = {n: len(requires.get(n, ())) for n in nodes}
+    ready = [n for n, count in waiting.items() if count == 0]
+    closure = {}
+    # Kahn's order: a course is expanded only after all of its prerequisites
+    while ready:
+        node = ready.pop()
+        closure[node] = set()
+        for r in requires.get(node, ()):
+            closure[node] |= closure[r] | {r}
+        for d in dependents.get(node, ()):
+            waiting[d] -= 1
+            if waiting[d] == 0:
+                ready.append(d)
+    cyclic = sorted(n for n in nodes if n not in closure)
+    if cyclic:
+        raise HTTPException(status_code=400, detail=f"Prerequisite cycle through: {', '.join(cyclic)}")
+    return {n: reqs for n, reqs in closure.items() if reqs}
+
+def rebuild_closure(session: Session) -> int:
+    """Recompute PrerequisiteClosure from the direct edges. The caller commits."""
+    edges = session.exec(select(CoursePrerequisite.course_id, CoursePrerequisite.requires_id)).all()
+    closure = _closure(edges)
+    session.exec(delete(PrerequisiteClosure))
+    rows = [dict(course_id=c, requires_id=r) for c, reqs in closure.items() for r in sorted(reqs)]
+    if rows:
+        session.connection().execute(PrerequisiteClosure.__table__.insert(), rows)
+    return len(rows)
+
+def set_prerequisites(session: Session, course_id: str, requires: list) -> dict:
+    """Replace a course's direct prerequisites and rebuild the closure. The caller commits."""
+    requires = sorted(set(requires))
+    if course_id in requires:
+        raise HTTPException(status_code=400, detail="A course can't require itself")
+    known = set(session.exec(select(Course.id).where(Course.id.in_(requires + [course_id]))).all())
+    unknown = [c for c in [course_id] + requires if c not in known]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown course: {', '.join(unknown)}")
+    session.exec(delete(CoursePrerequisite).where(CoursePrerequisite.course_id == course_id))
+    session.add_all([CoursePrerequisite(course_id=course_id, requires_id=r) for r in requires])
+    session.flush()
+    rebuild_closure(session)
+    return prerequisites_of(session, course_id)
+
+def prerequisites_of(session: Session, course_id: str) -> dict:
+    direct = session.exec(select(CoursePrerequisite.requires_id).where(CoursePrerequisite.course_id == course_id)).all()
+    closure = session.exec(select(PrerequisiteClosure.requires_id).where(PrerequisiteClosure.course_id == course_id)).all()
+    return {"course_id": course_id, "direct": sorted(direct), "all": sorted(closure)}
+
+# -- Per student --
+
+def passed_courses(student_id: str):
+    return select(Enrollment.course_id).where(Enrollment.student_id == student_id, Enrollment.status == "completed")
+
+def handled_courses(student_id: str):
+    return select(Enrollment.course_id).where(
+        Enrollment.student_id == student_id, Enrollment.status.in_(["enrolled", "completed"])
+    )
+
+def blocked_courses(student_id: str):
+    """Courses with at least one prerequisite the student hasn't completed."""
+    return select(PrerequisiteClosure.course_id).where(PrerequisiteClosure.requires_id.not_in(passed_courses(student_id)))
+
+def candidate_filter(student_id: str, degree_id: str, sem: int):
+    """WHERE clause on Course for the courses a student may take now."""
+    retakes = select(Enrollment.course_id).where(Enrollment.student_id == student_id, Enrollment.status == "backlog")
+    return and_(
+        or_(and_(Course.degree_id == degree_id, Course.sem == sem), Course.id.in_(retakes)),
+        Course.id.not_in(handled_courses(student_id)),
+        Course.id.not_in(blocked_courses(student_id)),
+    )
+
+def missing_prerequisites(session: Session, student_id: str, course_ids: list) -> dict:
+    """{course_id: [uncompleted prerequisites]} for the given courses, in one query."""
+    missing = {}
+    for course_id, requires_id in session.exec(
+        select(PrerequisiteClosure.course_id, PrerequisiteClosure.requires_id)
+        .where(PrerequisiteClosure.course_id.in_(course_ids), PrerequisiteClosure.requires_id.not_in(passed_courses(student_id)))
+        .order_by(PrerequisiteClosure.course_id, PrerequisiteClosure.requires_id)
+    ).all():
+        missing.setdefault(course_id, []).append(requires_id)
+    return missing
+
+# -- Whole cohort --
+
+def cohort_eligibility(session: Session, degree_id: str, prefix: str, year: int) -> list:
+    """Eligibility of every student of one degree and year, in four queries.
+
+    Returns [{"student_id", "eligible": [course_id], "blocked": {course_id: [missing]}}].
+    """
+    sem = year * 2
+    students = session.exec(
+        select(User.id).where(User.role == "student", User.dept == prefix, User.year == str(year)).order_by(User.id)
+    ).all()
+    history = session.exec(
+        select(Enrollment.student_id, Enrollment.course_id, Enrollment.status)
+        .join(User, User.id == Enrollment.student_id)
+        .where(User.role == "student", User.dept == prefix, User.year == str(year))
+    ).all()
+    current = session.exec(select(Course.id).where(Course.degree_id == degree_id, Course.sem == sem).order_by(Course.id)).all()
+    closure = session.exec(select(PrerequisiteClosure.course_id, PrerequisiteClosure.requires_id)).all()
+
+    bit = {}
+    def index(course_id):
+        if course_id not in bit:
+            bit[course_id] = 1 << len(bit)
+        return bit[course_id]
+
+    required = {}
+    for course_id, requires_id in closure:
+        required[course_id] = required.get(course_id, 0) | index(requires_id)
+    passed, handled, backlog = {}, {}, {}
+    for student_id, course_id, status in history:
+        b = index(course_id)
+        if status == "completed":
+            passed[student_id] = passed.get(student_id, 0) | b
+        if status in ("enrolled", "completed"):
+            handled[student_id] = handled.get(student_id, 0) | b
+        elif status == "backlog":
+            backlog.setdefault(student_id, set()).add(course_id)
+    for course_id in current:
+        index(course_id)
+    course_of = {b.bit_length() - 1: course_id for course_id, b in bit.items()}
+
+    result = []
+    for student_id in students:
+        done, taken = passed.get(student_id, 0), handled.get(student_id, 0)
+        eligible, blocked = [], {}
+        for course_id in sorted(set(current) | backlog.get(student_id, set())):
+            if taken & bit[course_id]:
+                continue
+            missing = required.get(course_id, 0) & ~done
+            if missing:
+                blocked[course_id] = sorted(course_of[i] for i in range(missing.bit_length()) if missing >> i & 1)
+            else:
+                eligible.append(course_id)
+        result.append({"student_id": student_id, "eligible": eligible, "blocked": blocked})
+    return result
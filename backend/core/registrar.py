@@ -0,0 +1,318 @@
+import csv
+import io
+import json
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+from db.database import read_engine, write_session
+from models.schema import User, Course, Enrollment
+from core.serialization import dumps
+
+# Registrar bulk export and import of enrollments.
+#
+# Export pages through Enrollment by primary key, each page in its own short read
+# transaction, and streams it out as soon as it is formatted, so memory stays
+# flat and a slow download never holds a lock that would stall writers.
+#
+# Import reads the request body line by line, validates each chunk of rows
+# against the users and courses it references (a few IN queries per chunk) and
+# upserts it in one write transaction. Rows are matched on enrollment_id when
+# given, otherwise on (student_id, course_id, sem). Failures are reported per
+# input line and never abort the rest of the file.
+
+EXPORT_PAGE_SIZE = 5_000
+IMPORT_CHUNK_SIZE = 5_000
+MAX_REPORTED_ERRORS = 1_000
+
+STATUSES = {"enrolled", "completed", "backlog"}
+EXPORT_COLUMNS = [
+    "enrollment_id", "student_id", "student_name", "course_id", "course_name",
+    "faculty_id", "sem", "status", "grade", "updated_at",
+]
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# -- Export --
+
+def _export_statement(sem: int = None, status: str = None):
+    student = aliased(User)
+    statement = (
+        select(
+            Enrollment.id, Enrollment.student_id, student.name, Enrollment.course_id, Course.name,
+            Enrollment.faculty_id, Enrollment.sem, Enrollment.status, Enrollment.grade, Enrollment.updated_at
+        )
+        .outerjoin(student, student.id == Enrollment.student_id)
+        .outerjoin(Course, Course.id == Enrollment.course_id)
+    )
+    if sem is not None:
+        statement = statement.where(Enrollment.sem == sem)
+    if status:
+        statement = statement.where(Enrollment.status == status)
+    return statement
+
+def export_pages(sem: int = None, status: str = None, page_size: int = EXPORT_PAGE_SIZE):
+    """Yield lists of export rows (tuples in EXPORT_COLUMNS order), one keyset page at a time."""
+    statement = _export_statement(sem, status)
+    last_id = 0
+    while True:
+        with Session(read_engine) as session:
+            rows = session.exec(statement.where(Enrollment.id > last_id).order_by(Enrollment.id).limit(page_size)).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+def export_stream(fmt: str, sem: int = None, status: str = None):
+    """Sync byte generator for StreamingResponse (iterated on the thread pool)."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in export_pages(sem, status):
+            writer.writerows([[_export_value(v) for v in row] for row in rows])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    else:
+        for rows in export_pages(sem, status):
+            yield b"".join(dumps(dict(zip(EXPORT_COLUMNS, map(_export_value, row)))) + b"\n" for row in rows)
+
+# -- Import --
+
+class ImportReport:
+    def __init__(self):
+        self.processed = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+def _clean(record: dict) -> dict:
+    """Type-check one input record. Raises ValueError with a message for the report."""
+    def text_field(name, required=True):
+        value = record.get(name)
+        value = str(value).strip() if value is not None else ""
+        if required and not value:
+            raise ValueError(f"{name} is required")
+        return value or None
+
+    row = {
+        "enrollment_id": text_field("enrollment_id", required=False),
+        "student_id": text_field("student_id"),
+        "course_id": text_field("course_id"),
+        "faculty_id": text_field("faculty_id", required=False),
+        "status": text_field("status"),
+    }
+    if row["enrollment_id"] is not None:
+        try:
+            row["enrollment_id"] = int(row["enrollment_id"])
+        except ValueError:
+            raise ValueError("enrollment_id must be an integer")
+    try:
+        row["sem"] = int(text_field("sem"))
+    except ValueError:
+        raise ValueError("sem must be an integer")
+    if not 1 <= row["sem"] <= 8:
+        raise ValueError("sem must be between 1 and 8")
+    if row["status"] not in STATUSES:
+        raise ValueError(f"status must be one of {', '.join(sorted(STATUSES))}")
+
+    grade = text_field("grade", required=False)
+    if grade is None:
+        row["grade"] = 0.0 if row["status"] == "backlog" else None
+    else:
+        try:
+            row["grade"] = float(grade)
+        except ValueError:
+            raise ValueError("grade must be a number")
+        if not 0.0 <= row["grade"] <= 4.0:
+            raise ValueError("grade must be between 0.0 and 4.0")
+    if row["status"] == "completed" and row["grade"] is None:
+        raise ValueError("completed enrollments need a grade")
+    return row
+
+def _upsert(session: Session, row: dict, existing: Enrollment) -> Enrollment:
+    fields = {k: v for k, v in row.items() if k != "enrollment_id" and v is not None}
+    fields["grade"] = row["grade"]
+    if existing is None:
+        existing = Enrollment(**fields)
+    else:
+        for name, value in fields.items():
+            setattr(existing, name, value)
+    session.add(existing)
+    return existing
+
+def _write(session: Session, valid: list, report: ImportReport, savepoints: bool):
+    written = {}  # natural key -> row written earlier in this chunk
+    for line, row, existing in valid:
+        key = (row["student_id"], row["course_id"], row["sem"])
+        if row["enrollment_id"] is None:
+            existing = written.get(key) or existing
+        if existing is not None and existing.id is not None:
+            existing = session.get(Enrollment, existing.id)
+        if not savepoints:
+            written[key] = _upsert(session, row, existing)
+        else:
+            try:
+                with session.begin_nested():
+                    obj = _upsert(session, row, existing)
+            except IntegrityError:
+                report.error(line, "Conflicts with an existing active enrollment")
+                continue
+            written[key] = obj
+        if existing is None:
+            report.inserted += 1
+        else:
+            report.updated += 1
+
+def apply_chunk(chunk: list, report: ImportReport, dry_run: bool = False):
+    """Validate and upsert [(line, record)] in one write transaction."""
+    rows = []
+    for line, record in chunk:
+        try:
+            rows.append((line, _clean(record)))
+        except ValueError as e:
+            report.error(line, str(e))
+    if not rows:
+        return
+
+    with write_session() as session:
+        student_ids = {r["student_id"] for _, r in rows}
+        students = set(session.exec(select(User.id).where(User.id.in_(student_ids), User.role == "student")).all())
+        faculty_ids = {r["faculty_id"] for _, r in rows if r["faculty_id"]}
+        faculty = set(session.exec(select(User.id).where(User.id.in_(faculty_ids), User.role == "faculty")).all())
+        courses = set(session.exec(select(Course.id).where(Course.id.in_({r["course_id"] for _, r in rows}))).all())
+        by_id = {e.id: e for e in session.exec(select(Enrollment).where(
+            Enrollment.id.in_({r["enrollment_id"] for _, r in rows if r["enrollment_id"] is not None})
+        )).all()}
+        natural = {r: None for r in {(r["student_id"], r["course_id"], r["sem"]) for _, r in rows if r["enrollment_id"] is None}}
+        if natural:
+            for e in session.exec(select(Enrollment).where(
+                tuple_(Enrollment.student_id, Enrollment.course_id, Enrollment.sem).in_(list(natural))
+            ).order_by(Enrollment.id)).all():
+                natural[(e.student_id, e.course_id, e.sem)] = natural[(e.student_id, e.course_id, e.sem)] or e
+
+        valid = []
+        for line, row in rows:
+            if row["student_id"] not in students:
+                report.error(line, f"Unknown student {row['student_id']}")
+            elif row["course_id"] not in courses:
+                report.error(line, f"Unknown course {row['course_id']}")
+            elif row["faculty_id"] and row["faculty_id"] not in faculty:
+                report.error(line, f"Unknown faculty {row['faculty_id']}")
+            elif row["enrollment_id"] is not None and row["enrollment_id"] not in by_id:
+                report.error(line, f"Unknown enrollment {row['enrollment_id']}")
+            else:
+                existing = by_id.get(row["enrollment_id"]) if row["enrollment_id"] is not None else natural.get((row["student_id"], row["course_id"], row["sem"]))
+                if existing is None and not row["faculty_id"]:
+                    report.error(line, "faculty_id is required for new enrollments")
+                else:
+                    valid.append((line, row, existing))
+
+        counts = (report.inserted, report.updated, report.failed, len(report.errors))
+        try:
+            _write(session, valid, report, savepoints=False)
+            session.flush()
+        except IntegrityError:
+            # Some row collides (e.g. a second active seat); redo the chunk row by row
+            session.rollback()
+            report.inserted, report.updated, report.failed, kept = counts
+            del report.errors[kept:]
+            _write(session, valid, report, savepoints=True)
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+
+def _records(fmt: str, lines: list, header: list):
+    """Parse a list of (line_number, text) into (line_number, dict) and parse errors."""
+    if fmt == "csv":
+        for (line, _), values in zip(lines, csv.reader(text for _, text in lines)):
+            if len(values) != len(header):
+                yield line, None, f"Expected {len(header)} columns, got {len(values)}"
+            else:
+                yield line, dict(zip(header, values)), None
+    else:
+        for line, text in lines:
+            try:
+                record = json.loads(text)
+            except ValueError:
+                yield line, None, "Invalid JSON"
+                continue
+            if isinstance(record, dict):
+                yield line, record, None
+            else:
+                yield line, None, "Each line must be a JSON object"
+
+async def _lines(stream):
+    pending = b""
+    async for data in stream:
+        pending += data
+        *complete, pending = pending.split(b"\n")
+        for raw in complete:
+            yield raw
+    if pending:
+        yield pending
+
+async def import_stream(stream, fmt: str, dry_run: bool = False) -> dict:
+    """Import an async byte stream of CSV (with a header row) or NDJSON.
+
+    CSV values must not contain line breaks; each physical line is one row.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format {fmt!r}; expected csv or ndjson")
+    report = ImportReport()
+    header = None
+    lines = []
+
+    async def flush():
+        chunk = []
+        for line, record, error in _records(fmt, lines, header):
+            report.processed += 1
+            if error:
+                report.error(line, error)
+            else:
+                chunk.append((line, record))
+        lines.clear()
+        await run_in_threadpool(apply_chunk, chunk, report, dry_run)
+
+    number = 0
+    async for raw in _lines(stream):
+        number += 1
+        text = raw.decode("utf-8-sig" if number == 1 else "utf-8", errors="replace").rstrip("\r")
+        if not text.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [h.strip() for h in next(csv.reader([text]))]
+            missing = {"student_id", "course_id", "sem", "status"} - set(header)
+            if missing:
+                raise HTTPException(status_code=400, detail=f"CSV header is missing: {', '.join(sorted(missing))}")
+            continue
+        lines.append((number, text))
+        if len(lines) >= IMPORT_CHUNK_SIZE:
+            await flush()
+    if lines:
+        await flush()
+    return report.as_dict()
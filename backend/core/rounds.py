@@ -0,0 +1,271 @@
+import heapq
+import json
+import random
+from fastapi import HTTPException
+from sqlalchemy import delete, tuple_
+from sqlmodel import Session, select, func
+from db.database import DEPT_PREFIXES
+from models.schema import (
+    User, Course, Enrollment, FacultyCourse, CourseSeatCount, SectionTimetable,
+    RegistrationRound, RoundPreference, utcnow
+)
+from core.prerequisites import missing_prerequisites
+from core.waitlist import priority_for
+from core.seatfeed import note_seat_changes
+
+# Round-based registration.
+#
+# While a round is open students submit a ranked list of sections (course,
+# faculty); nothing is reserved. Closing the round allocates every seat at once
+# with student-proposing deferred acceptance: each student proposes down their
+# list, a section holds its best proposers up to capacity and bumps the worst
+# when a better one arrives, and a bumped student carries on down their list.
+# Sections rank students by the waitlist policy (priority_for) and then by a
+# lottery drawn once per round, so the outcome doesn't depend on who submitted
+# first. A student gets at most one section per course, never two sections that
+# share a timetable slot, and at most the round's max_courses.
+#
+# Each proposal is made at most once, so a round costs O(total choices x log
+# capacity); seats are then written in one bulk insert.
+
+MAX_CHOICES = 30
+
+def section_capacity(free: int, faculty_ids: list) -> dict:
+    """Split a course's free seats evenly between its sections, remainder to the first."""
+    faculty_ids = sorted(faculty_ids)
+    if not faculty_ids:
+        return {}
+    share, extra = divmod(max(free, 0), len(faculty_ids))
+    return {f_id: share + (1 if i < extra else 0) for i, f_id in enumerate(faculty_ids)}
+
+def deferred_acceptance(choices: dict, capacity: dict, priority, masks: dict = None, weeks: dict = None, max_courses: int = None) -> dict:
+    """Allocate sections to students.
+
+    choices:  {student_id: [(course_id, faculty_id)]} best first
+    capacity: {(course_id, faculty_id): seats}
+    priority: priority(student_id, course_id) -> number, lower is served first
+    masks:    {(course_id, faculty_id): timetable bitmask}
+    weeks:    {student_id: bitmask already taken}
+    Returns {student_id: {course_id: index into their choices}}.
+    """
+    masks = masks or {}
+    weeks = dict(weeks or {})
+    held = {s: {} for s in choices}
+    rejected = {s: set() for s in choices}
+    seats = {}  # section -> heap of (-priority, student_id, index); the root is the worst holder
+    active = list(choices)
+    while active:
+        s = active.pop()
+        items, mine, week = choices[s], held[s], weeks.get(s, 0)
+        limit = max_courses or len(items)
+        for i, section in enumerate(items):
+            if len(mine) >= limit:
+                break
+            course_id = section[0]
+            mask = masks.get(section, 0)
+            if i in rejected[s] or course_id in mine or mask & week:
+                continue
+            key = priority(s, course_id)
+            heap = seats.setdefault(section, [])
+            if len(heap) < capacity.get(section, 0):
+                heapq.heappush(heap, (-key, s, i))
+            elif heap and -heap[0][0] > key:
+                _, bumped, j = heapq.heapreplace(heap, (-key, s, i))
+                # The bumped student gives the seat back and starts again from the top of their list
+                del held[bumped][course_id]
+                weeks[bumped] = weeks.get(bumped, 0) & ~mask
+                rejected[bumped].add(j)
+                active.append(bumped)
+            else:
+                rejected[s].add(i)
+                continue
+            mine[course_id] = i
+            week |= mask
+        weeks[s] = week
+    return held
+
+def satisfaction_report(choices: dict, assigned: dict, max_courses: int = None) -> dict:
+    by_rank = {}
+    wanted = got = full = none = first = 0
+    for s, items in choices.items():
+        mine = assigned.get(s, {})
+        want = min(max_courses or len(items), len({c for c, _ in items}))
+        wanted += want
+        got += len(mine)
+        full += len(mine) >= want
+        none += not mine
+        first += 0 in mine.values()
+        for i in mine.values():
+            by_rank[i + 1] = by_rank.get(i + 1, 0) + 1
+    students = len(choices)
+    return {
+        "students": students,
+        "seats_requested": wanted,
+        "seats_assigned": got,
+        "fill_rate": round(got / wanted, 4) if wanted else None,
+        "students_fully_served": full,
+        "students_with_nothing": none,
+        "students_with_first_choice": first,
+        # How many seats went to each choice rank (1 = the student's first choice)
+        "assigned_by_rank": {str(r): n for r, n in sorted(by_rank.items())},
+    }
+
+# -- Rounds --
+
+def _open_round(session: Session, round_id: int) -> RegistrationRound:
+    round_ = session.get(RegistrationRound, round_id)
+    if not round_:
+        raise HTTPException(status_code=404, detail="Round not found")
+    if round_.status != "open":
+        raise HTTPException(status_code=409, detail="Round is closed")
+    return round_
+
+def create_round(session: Session, degree_id: str = None, max_courses: int = None) -> RegistrationRound:
+    if degree_id is not None and degree_id not in DEPT_PREFIXES:
+        raise HTTPException(status_code=404, detail="Degree not found")
+    if max_courses is not None and (not isinstance(max_courses, int) or max_courses < 1):
+        raise HTTPException(status_code=400, detail="max_courses must be a positive integer")
+    round_ = RegistrationRound(degree_id=degree_id, max_courses=max_courses)
+    session.add(round_)
+    session.flush()
+    return round_
+
+def submit_preferences(session: Session, round_id: int, student_id: str, choices: list) -> list:
+    """Replace a student's ranked sections for an open round. The caller commits."""
+    round_ = _open_round(session, round_id)
+    student = session.get(User, student_id)
+    if not student or student.role != "student":
+        raise HTTPException(status_code=404, detail="Student not found")
+    if round_.degree_id and DEPT_PREFIXES[round_.degree_id] != student.dept:
+        raise HTTPException(status_code=403, detail="This round is for another degree")
+    if len(choices) > MAX_CHOICES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CHOICES} choices")
+    sections = [(c.get("course_id"), c.get("faculty_id")) for c in choices]
+    if len(set(sections)) != len(sections):
+        raise HTTPException(status_code=400, detail="A section is listed more than once")
+    if sections:
+        offered = set(session.exec(
+            select(FacultyCourse.course_id, FacultyCourse.faculty_id)
+            .where(tuple_(FacultyCourse.course_id, FacultyCourse.faculty_id).in_(sections))
+        ).all())
+        unknown = [f"{c} ({f})" for c, f in sections if (c, f) not in offered]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Not an offered section: {', '.join(unknown)}")
+        missing = missing_prerequisites(session, student_id, sorted({c for c, _ in sections}))
+        if missing:
+            detail = "; ".join(f"{c_id} needs {', '.join(reqs)}" for c_id, reqs in sorted(missing.items()))
+            raise HTTPException(status_code=409, detail=f"Missing prerequisites: {detail}")
+
+    session.exec(delete(RoundPreference).where(RoundPreference.round_id == round_id, RoundPreference.student_id == student_id))
+    session.add_all([
+        RoundPreference(round_id=round_id, student_id=student_id, rank=rank, course_id=c, faculty_id=f)
+        for rank, (c, f) in enumerate(sections, start=1)
+    ])
+    return [{"rank": rank, "course_id": c, "faculty_id": f} for rank, (c, f) in enumerate(sections, start=1)]
+
+def student_preferences(session: Session, round_id: int, student_id: str) -> dict:
+    round_ = session.get(RegistrationRound, round_id)
+    if not round_:
+        raise HTTPException(status_code=404, detail="Round not found")
+    rows = session.exec(
+        select(RoundPreference.rank, RoundPreference.course_id, RoundPreference.faculty_id)
+        .where(RoundPreference.round_id == round_id, RoundPreference.student_id == student_id)
+        .order_by(RoundPreference.rank)
+    ).all()
+    return {
+        "round_id": round_id,
+        "status": round_.status,
+        "choices": [{"rank": rank, "course_id": c, "faculty_id": f} for rank, c, f in rows],
+    }
+
+def round_summary(session: Session, round_id: int) -> dict:
+    round_ = session.get(RegistrationRound, round_id)
+    if not round_:
+        raise HTTPException(status_code=404, detail="Round not found")
+    students = session.exec(
+        select(func.count(func.distinct(RoundPreference.student_id))).where(RoundPreference.round_id == round_id)
+    ).one()
+    return {
+        "id": round_.id,
+        "degree_id": round_.degree_id,
+        "max_courses": round_.max_courses,
+        "status": round_.status,
+        "created_at": round_.created_at,
+        "closed_at": round_.closed_at,
+        "students": students,
+        "report": json.loads(round_.report) if round_.report else None,
+    }
+
+def close_round(session: Session, round_id: int, dry_run: bool = False) -> dict:
+    """Allocate the round and write its enrollments. The caller commits (or rolls back for a dry run)."""
+    round_ = _open_round(session, round_id)
+    in_round = select(RoundPreference.student_id).where(RoundPreference.round_id == round_id).distinct()
+
+    choices = {}
+    for student_id, course_id, faculty_id in session.exec(
+        select(RoundPreference.student_id, RoundPreference.course_id, RoundPreference.faculty_id)
+        .where(RoundPreference.round_id == round_id)
+        .order_by(RoundPreference.student_id, RoundPreference.rank)
+    ).all():
+        choices.setdefault(student_id, []).append((course_id, faculty_id))
+    years = dict(session.exec(select(User.id, User.year).where(User.id.in_(in_round))).all())
+
+    # Courses already taken don't need a seat; uncleared backlogs feed priority_for
+    taken, retakes, weeks = set(), set(), {}
+    for student_id, course_id, status, mask in session.exec(
+        select(Enrollment.student_id, Enrollment.course_id, Enrollment.status, func.coalesce(SectionTimetable.slots, 0))
+        .outerjoin(SectionTimetable, (SectionTimetable.course_id == Enrollment.course_id) & (SectionTimetable.faculty_id == Enrollment.faculty_id))
+        .where(Enrollment.student_id.in_(in_round))
+    ).all():
+        if status == "backlog":
+            retakes.add((student_id, course_id))
+        else:
+            taken.add((student_id, course_id))
+            if status == "enrolled":
+                weeks[student_id] = weeks.get(student_id, 0) | mask
+    choices = {s: [(c, f) for c, f in items if (s, c) not in taken] for s, items in choices.items()}
+
+    course_ids = select(RoundPreference.course_id).where(RoundPreference.round_id == round_id).distinct()
+    free = {c_id: max_enroll - count for c_id, max_enroll, count in session.exec(
+        select(Course.id, Course.max_enroll, func.coalesce(CourseSeatCount.count, 0))
+        .outerjoin(CourseSeatCount, (CourseSeatCount.course_id == Course.id) & (CourseSeatCount.status == "enrolled"))
+        .where(Course.id.in_(course_ids))
+    ).all()}
+    sections, masks = {}, {}
+    for c_id, f_id, mask in session.exec(
+        select(FacultyCourse.course_id, FacultyCourse.faculty_id, func.coalesce(SectionTimetable.slots, 0))
+        .outerjoin(SectionTimetable, (SectionTimetable.course_id == FacultyCourse.course_id) & (SectionTimetable.faculty_id == FacultyCourse.faculty_id))
+        .where(FacultyCourse.course_id.in_(course_ids))
+    ).all():
+        sections.setdefault(c_id, []).append(f_id)
+        if mask:
+            masks[(c_id, f_id)] = mask
+    capacity = {
+        (c_id, f_id): seats
+        for c_id, faculty_ids in sections.items()
+        for f_id, seats in section_capacity(free.get(c_id, 0), faculty_ids).items()
+    }
+
+    rng = random.Random(f"round-{round_id}")
+    lottery = {s: rng.random() for s in sorted(choices)}
+    # Policy class first, lottery breaks ties within it
+    def priority(student_id, course_id):
+        return priority_for(years.get(student_id), (student_id, course_id) in retakes) + lottery[student_id]
+
+    assigned = deferred_acceptance(choices, capacity, priority, masks, weeks, round_.max_courses)
+    report = satisfaction_report(choices, assigned, round_.max_courses)
+
+    now = utcnow()
+    rows = [
+        dict(student_id=s, course_id=c_id, faculty_id=choices[s][i][1], sem=int(years.get(s) or 1) * 2,
+             status="enrolled", grade=None, updated_at=now)
+        for s, mine in assigned.items() for c_id, i in mine.items()
+    ]
+    if rows and not dry_run:
+        session.connection().execute(Enrollment.__table__.insert(), rows)
+        note_seat_changes(session, {row["course_id"] for row in rows})
+    round_.status = "allocated"
+    round_.closed_at = now
+    round_.report = json.dumps(report)
+    session.add(round_)
+    return report
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+from sqlalchemy import event, inspect
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+from db.database import read_engine
+from models.schema import Course, Enrollment, CourseSeatCount
+from core.seats import enrolled_seats, seat_join_condition
+from core.serialization import dumps
+
+# Live seat counts over Server-Sent Events.
+#
+# Write sessions note which courses a flush touched (Enrollment rows added,
+# removed or moved, Course.max_enroll changed); Core bulk writes call
+# note_seat_changes themselves. After the commit the course ids go to the
+# process-wide broadcaster, which waits COALESCE_SECONDS to batch a burst of
+# commits, reads the new counts for the whole batch in one query and pushes
+# them to every subscriber of the affected (degree, semester). Events carry
+# absolute counts, so a client that misses one is corrected by the next, and a
+# subscriber that falls QUEUE_SIZE events behind is disconnected and starts over
+# from a fresh snapshot when it reconnects.
+
+COALESCE_SECONDS = 0.05
+HEARTBEAT_SECONDS = 15
+QUEUE_SIZE = 256
+
+_TOUCHED = "seat_courses"
+
+def note_seat_changes(session: Session, course_ids):
+    """Record courses whose seats changed outside the ORM (bulk inserts, raw SQL)."""
+    session.info.setdefault(_TOUCHED, set()).update(course_ids)
+
+@event.listens_for(Session, "after_flush")
+def _collect(session, flush_context):
+    touched = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Enrollment):
+            touched.add(obj.course_id)
+    for obj in session.dirty:
+        if isinstance(obj, Enrollment):
+            state = inspect(obj)
+            if state.attrs.status.history.has_changes() or state.attrs.course_id.history.has_changes():
+                touched.add(obj.course_id)
+                touched.update(state.attrs.course_id.history.deleted or ())
+        elif isinstance(obj, Course) and inspect(obj).attrs.max_enroll.history.has_changes():
+            touched.add(obj.id)
+    if touched:
+        note_seat_changes(session, touched)
+
+@event.listens_for(Session, "after_commit")
+def _publish(session):
+    touched = session.info.pop(_TOUCHED, None)
+    if touched:
+        broadcaster.notify(touched)
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_TOUCHED, None)
+
+def seat_rows(session: Session, where) -> list:
+    rows = session.exec(
+        select(Course.id, Course.degree_id, Course.sem, enrolled_seats(), Course.max_enroll)
+        .outerjoin(CourseSeatCount, seat_join_condition(Course.id))
+        .where(where)
+    ).all()
+    return [
+        {"course_id": c_id, "degree_id": d_id, "sem": sem, "enrolled_count": count, "max_enroll": max_enroll}
+        for c_id, d_id, sem, count, max_enroll in rows
+    ]
+
+def _read_seats(where) -> list:
+    with Session(read_engine) as session:
+        return seat_rows(session, where)
+
+class Subscriber:
+    def __init__(self, keys: list):
+        self.keys = keys
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.closed = False
+
+class SeatBroadcaster:
+    """Fans seat updates out to asyncio subscribers keyed by (degree_id, sem)."""
+
+    def __init__(self):
+        self.loop = None
+        self.subscribers = {}  # (degree_id, sem) -> set of Subscriber
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.scheduled = False
+
+    def subscribe(self, keys: list) -> Subscriber:
+        self.loop = asyncio.get_running_loop()
+        subscriber = Subscriber(keys)
+        for key in keys:
+            self.subscribers.setdefault(key, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        for key in subscriber.keys:
+            subscribers = self.subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[key]
+
+    def notify(self, course_ids):
+        """Called from any thread once a write has committed."""
+        if self.loop is None or not self.subscribers:
+            return
+        with self.lock:
+            self.pending.update(course_ids)
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self._flush()))
+
+    async def _flush(self):
+        await asyncio.sleep(COALESCE_SECONDS)
+        with self.lock:
+            course_ids, self.pending, self.scheduled = self.pending, set(), False
+        if not self.subscribers:
+            return
+        rows = await run_in_threadpool(_read_seats, Course.id.in_(course_ids))
+        by_key = {}
+        for row in rows:
+            by_key.setdefault((row["degree_id"], row["sem"]), []).append(row)
+        for key, updates in by_key.items():
+            for subscriber in list(self.subscribers.get(key, ())):
+                try:
+                    subscriber.queue.put_nowait(updates)
+                except asyncio.QueueFull:
+                    # Too far behind; end the stream so the client reconnects and resyncs
+                    subscriber.closed = True
+                    self.unsubscribe(subscriber)
+
+broadcaster = SeatBroadcaster()
+
+def _event(name: str, data) -> bytes:
+    return b"event: " + name.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+async def seat_stream(request, degree_id: str, sems: list):
+    """SSE body: one snapshot of every course in scope, then updates as they commit."""
+    subscriber = broadcaster.subscribe([(degree_id, sem) for sem in sems])
+    try:
+        snapshot = await run_in_threadpool(_read_seats, (Course.degree_id == degree_id) & Course.sem.in_(sems))
+        yield _event("snapshot", snapshot)
+        while not subscriber.closed:
+            try:
+                updates = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield b": keep-alive\n\n"
+                continue
+            yield _event("seats", updates)
+    finally:
+        broadcaster.unsubscribe(subscriber)
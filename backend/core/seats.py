@@ -0,0 +1,76 @@
+from sqlalchemy import text, delete
+from sqlmodel import Session, select, func
+from models.schema import Enrollment, CourseSeatCount
+
+# Triggers keep CourseSeatCount in the same transaction as the Enrollment write,
+# whichever path (ORM, bulk insert, raw sqlite3) made it.
+SEAT_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS enrollment_seat_insert AFTER INSERT ON enrollment
+    BEGIN
+        INSERT INTO courseseatcount (course_id, status, count) VALUES (NEW.course_id, NEW.status, 1)
+        ON CONFLICT(course_id, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS enrollment_seat_delete AFTER DELETE ON enrollment
+    BEGIN
+        UPDATE courseseatcount SET count = count - 1
+        WHERE course_id = OLD.course_id AND status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS enrollment_seat_update AFTER UPDATE OF course_id, status ON enrollment
+    WHEN OLD.course_id IS NOT NEW.course_id OR OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE courseseatcount SET count = count - 1
+        WHERE course_id = OLD.course_id AND status = OLD.status;
+        INSERT INTO courseseatcount (course_id, status, count) VALUES (NEW.course_id, NEW.status, 1)
+        ON CONFLICT(course_id, status) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+def install_seat_triggers(conn):
+    for ddl in SEAT_TRIGGERS:
+        conn.execute(text(ddl))
+
+def enrolled_seats():
+    """Column expression for the live enrolled count, for outer joins on CourseSeatCount."""
+    return func.coalesce(CourseSeatCount.count, 0)
+
+def seat_join_condition(course_id_column, status: str = "enrolled"):
+    return (CourseSeatCount.course_id == course_id_column) & (CourseSeatCount.status == status)
+
+def reconcile_seat_counts(session: Session, fix: bool = True) -> list:
+    """Compare the counters against COUNT(*) over Enrollment.
+
+    Returns (course_id, status, stored, actual) for every mismatch and, if fix is
+    set, rebuilds the counter table from scratch in the caller's transaction.
+    """
+    actual = {
+        (c_id, status): n
+        for c_id, status, n in session.exec(
+            select(Enrollment.course_id, Enrollment.status, func.count(Enrollment.id))
+            .group_by(Enrollment.course_id, Enrollment.status)
+        ).all()
+    }
+    stored = {
+        (c_id, status): n
+        for c_id, status, n in session.exec(
+            select(CourseSeatCount.course_id, CourseSeatCount.status, CourseSeatCount.count)
+        ).all()
+    }
+
+    drift = []
+    for key in sorted(set(actual) | set(stored)):
+        if actual.get(key, 0) != stored.get(key, 0):
+            drift.append((key[0], key[1], stored.get(key, 0), actual.get(key, 0)))
+
+    if fix and drift:
+        session.exec(delete(CourseSeatCount))
+        session.add_all([
+            CourseSeatCount(course_id=c_id, status=status, count=n)
+            for (c_id, status), n in actual.items()
+        ])
+    return drift
@@ -1,31 +1,184 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union
-from jose import jwt
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import os
+import threading
+import time
+import uuid
+from fastapi import HTTPException, Request, status
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 # Settings
 SECRET_KEY = "SUPER_SECRET_KEY_CHANGE_ME"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 24 hours for demo
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", os.cpu_count() or 2))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", PASSWORD_WORKERS * 16))
+PASSWORD_RETRY_AFTER = 2 # seconds
+CLAIMS_CACHE_SIZE = int(os.getenv("CLAIMS_CACHE_SIZE", "10000"))
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# pbkdf2 is deliberately CPU-heavy; verifying inline ties up a request thread
+# (and the GIL) for tens of milliseconds, so logins run in a separate process pool.
+_password_pool = None
+_password_pool_lock = threading.Lock()
+_password_in_flight = 0
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is None:
+            _password_pool = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS)
+        return _password_pool
+
+async def verify_password_offloaded(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password pool, rejecting with 503 once the queue is full."""
+    global _password_in_flight
+    with _password_pool_lock:
+        if _password_in_flight >= PASSWORD_QUEUE_LIMIT:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, please retry shortly",
+                headers={"Retry-After": str(PASSWORD_RETRY_AFTER)},
+            )
+        _password_in_flight += 1
+    try:
+        future = _get_password_pool().submit(verify_password, plain_password, hashed_password)
+        return await asyncio.wrap_future(future)
+    finally:
+        with _password_pool_lock:
+            _password_in_flight -= 1
+
+def shutdown_password_pool():
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is not None:
+            _password_pool.shutdown(cancel_futures=True)
+            _password_pool = None
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # jti lets a single token be revoked; iat lets every token of a user issued before a point be.
+    # iat keeps sub-second precision (NumericDate allows fractions) so a login right after a
+    # revoke_user isn't caught by the cutoff.
+    to_encode.update({"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# -- Request authorization --
+#
+# Tokens are verified once and their claims kept in an LRU keyed by the raw
+# token until the token's exp, so a repeat request costs a dict lookup and a
+# couple of comparisons: no signature check, no JSON decode, no User query.
+# Revocation is checked on every request, hit or miss, against two small
+# in-process tables: revoked jtis and per-user cutoffs for "log out everywhere",
+# each held only until every token it could match has expired anyway. Both are
+# per process: with several workers a revocation only takes effect in the worker
+# that handled it.
+
+class ClaimsCache:
+    def __init__(self, max_size: int = CLAIMS_CACHE_SIZE):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # token -> claims
+        self.revoked = {}             # jti -> exp
+        self.revoked_before = {}      # sub -> unix time; tokens issued at or before it are invalid
+        self.hits = 0
+        self.misses = 0
+
+    def claims(self, token: str) -> dict:
+        now = time.time()
+        with self.lock:
+            claims = self.entries.get(token)
+            if claims is not None:
+                if claims["exp"] > now:
+                    self.entries.move_to_end(token)
+                    self.hits += 1
+                    return self._check_revoked(claims)
+                del self.entries[token]
+            self.misses += 1
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise _unauthorized("Invalid or expired token")
+        if "sub" not in claims or "role" not in claims or "exp" not in claims:
+            raise _unauthorized("Invalid token")
+        with self.lock:
+            self.entries[token] = claims
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return self._check_revoked(claims)
+
+    def _check_revoked(self, claims: dict) -> dict:
+        if self.revoked and claims.get("jti") in self.revoked:
+            raise _unauthorized("Token has been revoked")
+        if self.revoked_before and claims.get("iat", 0) <= self.revoked_before.get(claims["sub"], -1):
+            raise _unauthorized("Token has been revoked")
+        return claims
+
+    def revoke(self, claims: dict):
+        """Revoke one token by its jti."""
+        now = time.time()
+        with self.lock:
+            # Entries past exp would be rejected anyway; drop them to keep the set small
+            self.revoked = {jti: exp for jti, exp in self.revoked.items() if exp > now}
+            if claims.get("jti"):
+                self.revoked[claims["jti"]] = claims["exp"]
+
+    def revoke_user(self, user_id: str):
+        """Revoke every token issued to user_id so far."""
+        now = time.time()
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        with self.lock:
+            # A cutoff older than the token lifetime can only match expired tokens
+            self.revoked_before = {sub: t for sub, t in self.revoked_before.items() if t + lifetime > now}
+            self.revoked_before[user_id] = now
+
+claims_cache = ClaimsCache()
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+def bearer_token(request: Request) -> str:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise _unauthorized("Not authenticated")
+    return token
+
+def check_owner(claims: dict, user_id) -> None:
+    """Students and faculty may only act as themselves; admins may act for anyone."""
+    if claims["role"] != "admin" and claims["sub"] != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed for this user")
+
+def require(*roles: str, owner: str = None):
+    """Dependency: a valid token with one of roles (admins always pass). With owner,
+    the path parameter of that name must be the caller's own id unless they are an admin."""
+    allowed = set(roles) | {"admin"}
+
+    def dependency(request: Request) -> dict:
+        claims = claims_cache.claims(bearer_token(request))
+        if claims["role"] not in allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed for this role")
+        if owner is not None:
+            check_owner(claims, request.path_params.get(owner))
+        return claims
+    return dependency
+
 # bcrypt CryptContext for password hashing
 
 # create_access_token with expiry and HS256
@@ -0,0 +1,36 @@
+import json
+import os
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON encoding for response bodies.
+#
+# Routes declare a response_model, so FastAPI hands the response class content
+# that pydantic has already reduced to plain JSON types; what's left is turning
+# it into bytes. orjson does that several times faster than the json module and
+# is used when installed, unless JSON_ENCODER=json. The catalog cache, the seat
+# feed and the NDJSON export encode through the same dumps(), so every body the
+# app writes is produced the same way.
+#
+# Anything JSON can't express natively (datetimes under the json module, SQLModel
+# rows) goes through jsonable_encoder as a fallback.
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson" if orjson else "json")
+USE_ORJSON = JSON_ENCODER == "orjson" and orjson is not None
+
+def dumps(payload) -> bytes:
+    """Compact UTF-8 JSON."""
+    if USE_ORJSON:
+        return orjson.dumps(payload, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=jsonable_encoder, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(JSONResponse):
+    """The app's default response class: JSONResponse rendered with dumps()."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
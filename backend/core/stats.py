@@ -0,0 +1,146 @@
+from sqlalchemy import text, delete
+from sqlmodel import Session, select, func
+from models.schema import User, Course, Enrollment, FacultyCourse, StatCounter, BacklogCount, utcnow
+
+# Materialized admin statistics. StatCounter holds named running totals and
+# BacklogCount the backlog rows per (degree, semester); triggers update both in
+# the same transaction as the user/course/allocation/enrollment write, so the
+# dashboard reads a few dozen rows instead of counting whole tables.
+#
+# Counters: role:<role>, courses, capacity (sum of max_enroll), enrolled, allocations
+
+def _bump(name, delta, when="1"):
+    return (
+        f"INSERT INTO statcounter (name, value, updated_at) SELECT {name}, {delta}, CURRENT_TIMESTAMP WHERE {when} "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value, updated_at = excluded.updated_at;"
+    )
+
+def _bump_backlog(row, delta):
+    return (
+        f"INSERT INTO backlogcount (degree_id, sem, count) SELECT degree_id, {row}.sem, {delta} FROM course "
+        f"WHERE id = {row}.course_id AND {row}.status = 'backlog' "
+        "ON CONFLICT(degree_id, sem) DO UPDATE SET count = count + excluded.count;"
+    )
+
+STATS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_user_insert AFTER INSERT ON user
+    BEGIN {_bump("'role:' || NEW.role", 1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_user_delete AFTER DELETE ON user
+    BEGIN {_bump("'role:' || OLD.role", -1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_user_role AFTER UPDATE OF role ON user WHEN OLD.role IS NOT NEW.role
+    BEGIN {_bump("'role:' || OLD.role", -1)} {_bump("'role:' || NEW.role", 1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_course_insert AFTER INSERT ON course
+    BEGIN {_bump("'courses'", 1)} {_bump("'capacity'", "NEW.max_enroll")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_course_delete AFTER DELETE ON course
+    BEGIN {_bump("'courses'", -1)} {_bump("'capacity'", "-OLD.max_enroll")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_course_capacity AFTER UPDATE OF max_enroll ON course
+    WHEN OLD.max_enroll IS NOT NEW.max_enroll
+    BEGIN {_bump("'capacity'", "NEW.max_enroll - OLD.max_enroll")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_allocation_insert AFTER INSERT ON facultycourse
+    BEGIN {_bump("'allocations'", 1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_allocation_delete AFTER DELETE ON facultycourse
+    BEGIN {_bump("'allocations'", -1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_enrollment_insert AFTER INSERT ON enrollment
+    BEGIN {_bump("'enrolled'", 1, "NEW.status = 'enrolled'")} {_bump_backlog("NEW", 1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_enrollment_delete AFTER DELETE ON enrollment
+    BEGIN {_bump("'enrolled'", -1, "OLD.status = 'enrolled'")} {_bump_backlog("OLD", -1)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS stats_enrollment_update AFTER UPDATE OF status, course_id, sem ON enrollment
+    BEGIN
+        {_bump("'enrolled'", -1, "OLD.status = 'enrolled'")} {_bump_backlog("OLD", -1)}
+        {_bump("'enrolled'", 1, "NEW.status = 'enrolled'")} {_bump_backlog("NEW", 1)}
+    END
+    """,
+]
+
+def install_stats_triggers(conn):
+    for ddl in STATS_TRIGGERS:
+        conn.execute(text(ddl))
+
+def stats_snapshot(session: Session) -> dict:
+    counters = {}
+    as_of = None
+    for name, value, updated_at in session.exec(select(StatCounter.name, StatCounter.value, StatCounter.updated_at)).all():
+        counters[name] = value
+        if updated_at and (as_of is None or updated_at > as_of):
+            as_of = updated_at
+    backlogs = session.exec(
+        select(BacklogCount.degree_id, BacklogCount.sem, BacklogCount.count)
+        .where(BacklogCount.count != 0)
+        .order_by(BacklogCount.degree_id, BacklogCount.sem)
+    ).all()
+
+    total_capacity = counters.get("capacity", 0)
+    total_enrolled = counters.get("enrolled", 0)
+    capacity_perc = (total_enrolled / total_capacity * 100) if total_capacity > 0 else 0
+    return {
+        "total_students": counters.get("role:student", 0),
+        "total_faculty": counters.get("role:faculty", 0),
+        "total_courses": counters.get("courses", 0),
+        "total_capacity": total_capacity,
+        "total_enrolled": total_enrolled,
+        "total_allocations": counters.get("allocations", 0),
+        "capacity_percentage": round(capacity_perc, 1),
+        "backlogs": [{"degree_id": d, "sem": s, "count": n} for d, s, n in backlogs],
+        "as_of": as_of,
+    }
+
+def recompute_stats(session: Session, fix: bool = True) -> list:
+    """Recount every statistic from the base tables.
+
+    Returns (name, stored, actual) for each mismatch and, if fix is set,
+    replaces the materialized rows in the caller's transaction.
+    """
+    actual = {f"role:{role}": n for role, n in session.exec(select(User.role, func.count(User.id)).group_by(User.role)).all()}
+    actual["courses"], actual["capacity"] = session.exec(
+        select(func.count(Course.id), func.coalesce(func.sum(Course.max_enroll), 0))
+    ).one()
+    actual["enrolled"] = session.exec(select(func.count(Enrollment.id)).where(Enrollment.status == "enrolled")).one()
+    actual["allocations"] = session.exec(select(func.count()).select_from(FacultyCourse)).one()
+    actual_backlogs = {
+        (d, s): n for d, s, n in session.exec(
+            select(Course.degree_id, Enrollment.sem, func.count(Enrollment.id))
+            .join(Course, Course.id == Enrollment.course_id)
+            .where(Enrollment.status == "backlog")
+            .group_by(Course.degree_id, Enrollment.sem)
+        ).all()
+    }
+
+    stored = {name: value for name, value in session.exec(select(StatCounter.name, StatCounter.value)).all()}
+    stored_backlogs = {(d, s): n for d, s, n in session.exec(select(BacklogCount.degree_id, BacklogCount.sem, BacklogCount.count)).all()}
+
+    drift = []
+    for name in sorted(set(actual) | set(stored)):
+        if actual.get(name, 0) != stored.get(name, 0):
+            drift.append((name, stored.get(name, 0), actual.get(name, 0)))
+    for key in sorted(set(actual_backlogs) | set(stored_backlogs)):
+        if actual_backlogs.get(key, 0) != stored_backlogs.get(key, 0):
+            drift.append((f"backlog:{key[0]}:{key[1]}", stored_backlogs.get(key, 0), actual_backlogs.get(key, 0)))
+
+    if fix:
+        now = utcnow()
+        session.exec(delete(StatCounter))
+        session.exec(delete(BacklogCount))
+        session.add_all([StatCounter(name=name, value=value, updated_at=now) for name, value in actual.items()])
+        session.add_all([BacklogCount(degree_id=d, sem=s, count=n) for (d, s), n in actual_backlogs.items()])
+    return drift
@@ -0,0 +1,122 @@
+from fastapi import HTTPException
+from sqlalchemy import literal, null, tuple_, union_all
+from sqlmodel import Session, select, func
+from models.schema import User, Enrollment, FacultyCourse, SectionTimetable
+
+# Weekly timetable as bitmasks.
+#
+# Each section (course, faculty) meets in a set of (day, period) slots stored as
+# one integer, bit day * PERIODS_PER_DAY + period. A student's committed week is
+# the OR of their enrolled sections' masks, so checking a whole selection is one
+# AND per course against a running OR. Sections without a timetable row have an
+# empty mask and never clash.
+#
+# The enrollment check and the enrollable listing both read the masks in queries
+# they already make; enroll_selection joins them onto its allocation and
+# duplicate-check lookups, so checking a selection adds no statement.
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+PERIODS_PER_DAY = 8
+
+def slot_bit(day: int, period: int) -> int:
+    if not (0 <= day < len(DAYS) and 0 <= period < PERIODS_PER_DAY):
+        raise HTTPException(status_code=400, detail=f"Slot out of range: day {day}, period {period}")
+    return 1 << (day * PERIODS_PER_DAY + period)
+
+def mask_from_slots(slots: list) -> int:
+    mask = 0
+    for slot in slots:
+        try:
+            mask |= slot_bit(int(slot["day"]), int(slot["period"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Each slot needs an integer day and period")
+    return mask
+
+def slots_from_mask(mask: int) -> list:
+    return [
+        {"day": bit // PERIODS_PER_DAY, "period": bit % PERIODS_PER_DAY}
+        for bit in range(len(DAYS) * PERIODS_PER_DAY) if mask >> bit & 1
+    ]
+
+def section_slots(course_id_column, faculty_id_column):
+    """Outer-join condition from a (course, faculty) pair onto its SectionTimetable row."""
+    return (SectionTimetable.course_id == course_id_column) & (SectionTimetable.faculty_id == faculty_id_column)
+
+def section_mask():
+    """The joined section's mask; 0 when it has no timetable row."""
+    return func.coalesce(SectionTimetable.slots, 0)
+
+def _committed(student_id: str, *columns):
+    """The student's enrolled sections as (course_id, *columns, mask, True)."""
+    return (
+        select(Enrollment.course_id, *columns, section_mask(), literal(True))
+        .outerjoin(SectionTimetable, section_slots(Enrollment.course_id, Enrollment.faculty_id))
+        .where(Enrollment.student_id == student_id, Enrollment.status == "enrolled")
+    )
+
+def find_clashes(committed: dict, selected: dict) -> list:
+    """[(course_id, clashing course_id)] for each selected course that overlaps a
+    committed one or one selected before it. Both arguments map course_id -> mask."""
+    week = 0
+    for mask in committed.values():
+        week |= mask
+    taken = dict(committed)
+    clashes = []
+    for course_id, mask in selected.items():
+        if mask & week:
+            clashes.append((course_id, next(c for c, m in taken.items() if m & mask)))
+        taken[course_id] = mask
+        week |= mask
+    return clashes
+
+def selection_clashes(session: Session, student_id: str, pairs: dict) -> list:
+    """Clashes for a selection {course_id: faculty_id}, against itself and the student's enrolled sections."""
+    if not pairs:
+        return []
+    selected = (
+        select(SectionTimetable.course_id, SectionTimetable.slots, literal(False))
+        .where(tuple_(SectionTimetable.course_id, SectionTimetable.faculty_id).in_(list(pairs.items())))
+    )
+    committed, chosen = {}, {}
+    for course_id, mask, is_committed in session.execute(union_all(_committed(student_id), selected)).all():
+        if not is_committed:
+            chosen[course_id] = mask
+        elif course_id not in pairs:
+            committed[course_id] = mask
+    return find_clashes(committed, {c_id: chosen.get(c_id, 0) for c_id in pairs})
+
+def check_selection(committed: dict, selected: dict):
+    """Raise 409 on any clash. Masks come from the caller's own queries (see enroll_selection)."""
+    clashes = find_clashes(committed, selected)
+    if clashes:
+        raise HTTPException(status_code=409, detail=f"Timetable clash: {', '.join(f'{a} with {b}' for a, b in clashes)}")
+
+def candidate_sections(session: Session, student_id: str, course_ids: list) -> tuple:
+    """Sections of the candidate courses and the student's committed week, in one query.
+
+    Returns ({course_id: [(faculty_id, name, mask)]}, committed week mask).
+    """
+    candidates = (
+        select(FacultyCourse.course_id, User.id, User.name, section_mask(), literal(False))
+        .join(User, User.id == FacultyCourse.faculty_id)
+        .outerjoin(SectionTimetable, section_slots(FacultyCourse.course_id, FacultyCourse.faculty_id))
+        .where(FacultyCourse.course_id.in_(course_ids))
+    )
+    sections, week = {}, 0
+    for course_id, fac_id, fac_name, mask, is_committed in session.execute(
+        union_all(candidates, _committed(student_id, null(), null()))
+    ).all():
+        if is_committed:
+            week |= mask
+        else:
+            sections.setdefault(course_id, []).append((fac_id, fac_name, mask))
+    return sections, week
+
+def set_section_slots(session: Session, course_id: str, faculty_id: str, slots: list) -> SectionTimetable:
+    """Replace a section's weekly slots. The caller commits."""
+    if not session.get(FacultyCourse, (faculty_id, course_id)):
+        raise HTTPException(status_code=404, detail="Faculty is not allocated to this course")
+    row = session.get(SectionTimetable, (course_id, faculty_id)) or SectionTimetable(course_id=course_id, faculty_id=faculty_id)
+    row.slots = mask_from_slots(slots)
+    session.add(row)
+    return row
@@ -0,0 +1,307 @@
+import os
+import threading
+from bisect import bisect_left
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlmodel import Session, select
+from models.schema import User, Course, Enrollment, CourseSeatCount, WaitlistEntry, WaitlistVersion
+from core.timetable import selection_clashes
+
+# Per-course waitlists with automatic promotion.
+#
+# A request for a full course queues the student in WaitlistEntry. Entries are
+# served in (priority, id) order: under WAITLIST_POLICY=fifo every priority is
+# 0, under "priority" final-year students go first and, within a year, students
+# retaking a course they have a backlog in. Whenever a seat is released (a drop,
+# or an admin raising max_enroll) promote() moves the head of the queue into
+# Enrollment in the caller's transaction; finding the head is one index seek on
+# ix_waitlist_order.
+#
+# Positions are answered from an in-process order-statistic index per course
+# (one Fenwick tree per priority class), so a lookup is O(log n) however long
+# the queue is. Each index remembers the WaitlistVersion it reflects; writes in
+# this process patch it in place after commit, and a write from anywhere else
+# shows up as a version mismatch and the index is rebuilt on next use.
+
+WAITLIST_POLICY = os.getenv("WAITLIST_POLICY", "fifo")
+if WAITLIST_POLICY not in ("fifo", "priority"):
+    raise RuntimeError(f"Unknown WAITLIST_POLICY {WAITLIST_POLICY!r}; expected 'fifo' or 'priority'")
+
+_BUMP = (
+    "INSERT INTO waitlistversion (course_id, version) VALUES ({course}, 1) "
+    "ON CONFLICT(course_id) DO UPDATE SET version = version + 1;"
+)
+
+WAITLIST_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS waitlist_insert AFTER INSERT ON waitlistentry
+    BEGIN {_BUMP.format(course="NEW.course_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS waitlist_delete AFTER DELETE ON waitlistentry
+    BEGIN {_BUMP.format(course="OLD.course_id")} END
+    """,
+]
+
+def install_waitlist_triggers(conn):
+    for ddl in WAITLIST_TRIGGERS:
+        conn.execute(text(ddl))
+
+def priority_for(year, retake: bool) -> int:
+    if WAITLIST_POLICY == "fifo":
+        return 0
+    year = min(max(int(year or 1), 1), 4)
+    return (4 - year) * 2 + (0 if retake else 1)
+
+# -- Order-statistic index --
+
+class _Fenwick:
+    """Prefix sums over a growable array, O(log n) per append/update/query."""
+
+    def __init__(self):
+        self.tree = [0]
+
+    @classmethod
+    def ones(cls, n: int) -> "_Fenwick":
+        """A tree over n ones, built in O(n): node i covers lowbit(i) values."""
+        fenwick = cls()
+        fenwick.tree = [0] + [i & -i for i in range(1, n + 1)]
+        return fenwick
+
+    def append(self, value: int):
+        i = len(self.tree)
+        # Node i covers (i - lowbit(i), i]; the part before i is already in the tree
+        self.tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def add(self, i: int, delta: int):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of the first i values."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+class _PriorityClass:
+    # Ids only ever grow, so the append-only ids list stays sorted
+    def __init__(self):
+        self.ids = []
+        self.live = bytearray()
+        self.alive = _Fenwick()
+        self.size = 0
+
+    def append(self, entry_id: int):
+        self.ids.append(entry_id)
+        self.live.append(1)
+        self.alive.append(1)
+        self.size += 1
+
+    def remove(self, entry_id: int) -> bool:
+        i = bisect_left(self.ids, entry_id)
+        if i == len(self.ids) or self.ids[i] != entry_id or not self.live[i]:
+            return False
+        self.live[i] = 0
+        self.alive.add(i, -1)
+        self.size -= 1
+        if len(self.ids) > 64 and self.size * 2 < len(self.ids):
+            self._compact()
+        return True
+
+    def _compact(self):
+        """Drop tombstones so the arrays stay proportional to the queue."""
+        self.ids = [e for e, flag in zip(self.ids, self.live) if flag]
+        self.live = bytearray(b"\x01" * len(self.ids))
+        self.alive = _Fenwick.ones(len(self.ids))
+
+    def rank(self, entry_id: int) -> int:
+        """Live entries ahead of entry_id in this class."""
+        return self.alive.prefix(bisect_left(self.ids, entry_id))
+
+class CourseQueue:
+    def __init__(self, version: int, entries):
+        self.version = version
+        self.classes = {}
+        for priority, entry_id in entries:
+            self.add(priority, entry_id)
+
+    def add(self, priority: int, entry_id: int):
+        self.classes.setdefault(priority, _PriorityClass()).append(entry_id)
+
+    def remove(self, priority: int, entry_id: int) -> bool:
+        cls = self.classes.get(priority)
+        return bool(cls and cls.remove(entry_id))
+
+    def position(self, priority: int, entry_id: int) -> int:
+        """1-based place in the queue."""
+        ahead = sum(cls.size for p, cls in self.classes.items() if p < priority)
+        cls = self.classes.get(priority)
+        return ahead + (cls.rank(entry_id) if cls else 0) + 1
+
+    def __len__(self):
+        return sum(cls.size for cls in self.classes.values())
+
+_queues = {}  # course_id -> CourseQueue
+_queues_lock = threading.Lock()
+
+def _version(session: Session, course_id: str) -> int:
+    return session.exec(select(WaitlistVersion.version).where(WaitlistVersion.course_id == course_id)).first() or 0
+
+def _queue(session: Session, course_id: str) -> CourseQueue:
+    """The course's index, rebuilt from the table if another writer has moved it on.
+
+    Queries run outside _queues_lock: under DB_MODE=async each one may yield to
+    the event loop, and a lock held across that would block the loop thread.
+    Read the returned queue under the lock, since apply() patches it in place.
+    """
+    version = _version(session, course_id)
+    with _queues_lock:
+        queue = _queues.get(course_id)
+        if queue is not None and queue.version == version:
+            return queue
+    entries = session.exec(
+        select(WaitlistEntry.priority, WaitlistEntry.id)
+        .where(WaitlistEntry.course_id == course_id)
+        .order_by(WaitlistEntry.priority, WaitlistEntry.id)
+    ).all()
+    fresh = CourseQueue(version, entries)
+    with _queues_lock:
+        queue = _queues.get(course_id)
+        # Keep an index another request has already moved past this version
+        if queue is not None and queue.version > version:
+            return queue
+        _queues[course_id] = fresh
+    return fresh
+
+class WaitlistChanges:
+    """Index updates made by a write transaction, applied once it commits."""
+
+    def __init__(self):
+        self.ops = {}  # course_id -> [(op, priority, entry_id)]
+
+    def added(self, entry: WaitlistEntry):
+        self.ops.setdefault(entry.course_id, []).append(("add", entry.priority, entry.id))
+
+    def removed(self, entry: WaitlistEntry):
+        self.ops.setdefault(entry.course_id, []).append(("remove", entry.priority, entry.id))
+
+    def versions(self, session: Session) -> dict:
+        # Read inside the transaction, after the triggers have run
+        session.flush()
+        return {course_id: _version(session, course_id) for course_id in self.ops}
+
+    def apply(self, versions: dict):
+        with _queues_lock:
+            for course_id, ops in self.ops.items():
+                queue = _queues.get(course_id)
+                if queue is None:
+                    continue
+                if queue.version + len(ops) != versions[course_id]:
+                    # Someone else wrote in between; rebuild lazily
+                    del _queues[course_id]
+                    continue
+                for op, priority, entry_id in ops:
+                    if op == "add":
+                        queue.add(priority, entry_id)
+                    else:
+                        queue.remove(priority, entry_id)
+                queue.version = versions[course_id]
+
+# -- Queue operations (all run inside a write_session) --
+
+def join_waitlist(session: Session, student: User, course: Course, faculty_id: str, sem: int, changes: WaitlistChanges) -> WaitlistEntry:
+    if session.exec(select(WaitlistEntry.id).where(
+        WaitlistEntry.course_id == course.id, WaitlistEntry.student_id == student.id
+    )).first():
+        raise HTTPException(status_code=409, detail=f"Already on the waitlist for {course.id}")
+    retake = session.exec(select(Enrollment.id).where(
+        Enrollment.student_id == student.id, Enrollment.course_id == course.id, Enrollment.status == "backlog"
+    )).first() is not None
+    entry = WaitlistEntry(
+        course_id=course.id, student_id=student.id, faculty_id=faculty_id, sem=sem,
+        priority=priority_for(student.year, retake)
+    )
+    session.add(entry)
+    session.flush()
+    changes.added(entry)
+    return entry
+
+def leave_waitlist(session: Session, student_id: str, course_id: str, changes: WaitlistChanges):
+    entry = session.exec(select(WaitlistEntry).where(
+        WaitlistEntry.course_id == course_id, WaitlistEntry.student_id == student_id
+    )).first()
+    if not entry:
+        raise HTTPException(status_code=404, detail="Not on the waitlist")
+    changes.removed(entry)
+    session.delete(entry)
+
+def promote(session: Session, course_id: str, changes: WaitlistChanges) -> list:
+    """Fill every free seat of the course from the head of its waitlist. Returns promoted student ids.
+
+    Heads that no longer fit (already enrolled, or clashing with the student's
+    timetable) leave the queue without taking the seat.
+    """
+    course = session.get(Course, course_id)
+    if not course:
+        return []
+    promoted = []
+    while True:
+        session.flush()
+        taken = session.exec(select(CourseSeatCount.count).where(
+            CourseSeatCount.course_id == course_id, CourseSeatCount.status == "enrolled"
+        )).first() or 0
+        if taken >= course.max_enroll:
+            break
+        head = session.exec(
+            select(WaitlistEntry).where(WaitlistEntry.course_id == course_id)
+            .order_by(WaitlistEntry.priority, WaitlistEntry.id).limit(1)
+        ).first()
+        if not head:
+            break
+        changes.removed(head)
+        session.delete(head)
+        already = session.exec(select(Enrollment.id).where(
+            Enrollment.student_id == head.student_id, Enrollment.course_id == course_id,
+            Enrollment.status.in_(["enrolled", "completed"])
+        )).first()
+        if already or selection_clashes(session, head.student_id, {course_id: head.faculty_id}):
+            # Enrolled some other way, or has since taken a section at the same time
+            continue
+        session.add(Enrollment(
+            student_id=head.student_id, course_id=course_id, faculty_id=head.faculty_id,
+            sem=head.sem, status="enrolled"
+        ))
+        promoted.append(head.student_id)
+    return promoted
+
+def commit_with_waitlist(session: Session, changes: WaitlistChanges):
+    versions = changes.versions(session)
+    session.commit()
+    changes.apply(versions)
+
+# -- Reads --
+
+def student_waitlist(session: Session, student_id: str) -> list:
+    entries = session.exec(
+        select(WaitlistEntry.course_id, WaitlistEntry.id, WaitlistEntry.priority, WaitlistEntry.created_at, Course.name)
+        .join(Course, Course.id == WaitlistEntry.course_id)
+        .where(WaitlistEntry.student_id == student_id)
+        .order_by(WaitlistEntry.created_at)
+    ).all()
+    result = []
+    for course_id, entry_id, priority, created_at, name in entries:
+        queue = _queue(session, course_id)
+        with _queues_lock:
+            position, length = queue.position(priority, entry_id), len(queue)
+        result.append({
+            "course_id": course_id,
+            "course_name": name,
+            "position": position,
+            "length": length,
+            "joined_at": created_at,
+        })
+    return result
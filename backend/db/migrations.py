@@ -0,0 +1,112 @@
+import logging
+from sqlalchemy import text
+from sqlmodel import Session, select
+from core.seats import install_seat_triggers, reconcile_seat_counts
+from core.stats import install_stats_triggers, recompute_stats
+from core.analytics import install_history_triggers, ENROLLMENT_HISTORY_TRIGGERS
+from core.waitlist import install_waitlist_triggers
+from models.schema import Enrollment, CourseSeatCount
+
+# Versioned, in-place upgrades for existing database.db files.
+#
+# create_all only creates missing tables, so anything added to an existing table
+# (columns, indexes, triggers) goes here. The applied version is kept in SQLite's
+# PRAGMA user_version. Every step must be idempotent: on a fresh database
+# create_all has already built the latest schema and each step is a no-op.
+
+log = logging.getLogger("app.migrations")
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+def m001_enrollment_updated_at(conn):
+    if "updated_at" not in _columns(conn, "enrollment"):
+        conn.execute(text("ALTER TABLE enrollment ADD COLUMN updated_at DATETIME"))
+        conn.execute(text("UPDATE enrollment SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL"))
+
+def m002_seat_counters(conn):
+    install_seat_triggers(conn)
+    with Session(bind=conn) as session:
+        if not session.exec(select(CourseSeatCount)).first() and session.exec(select(Enrollment)).first():
+            reconcile_seat_counts(session)
+            session.flush()
+
+def m003_indexes(conn):
+    # The old enroll endpoint never rejected duplicates; keep the earliest active seat
+    dropped = conn.execute(text("""
+        DELETE FROM enrollment
+        WHERE status = 'enrolled' AND id NOT IN (
+            SELECT MIN(id) FROM enrollment WHERE status = 'enrolled' GROUP BY student_id, course_id
+        )
+    """)).rowcount
+    if dropped:
+        log.warning("m003: removed %d duplicate active enrollment(s)", dropped)
+    for ddl in [
+        "CREATE INDEX IF NOT EXISTS ix_user_email ON user (email)",
+        "CREATE INDEX IF NOT EXISTS ix_course_degree_sem ON course (degree_id, sem)",
+        "CREATE INDEX IF NOT EXISTS ix_facultycourse_course ON facultycourse (course_id)",
+        "CREATE INDEX IF NOT EXISTS ix_enrollment_student_status ON enrollment (student_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_enrollment_course_status ON enrollment (course_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_enrollment_faculty_status ON enrollment (faculty_id, status)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_enrollment_active ON enrollment (student_id, course_id) WHERE status = 'enrolled'",
+    ]:
+        conn.execute(text(ddl))
+    conn.execute(text("ANALYZE"))
+
+def m004_admin_stats(conn):
+    install_stats_triggers(conn)
+    with Session(bind=conn) as session:
+        recompute_stats(session)
+        session.flush()
+
+def m005_history_versions(conn):
+    install_history_triggers(conn)
+
+def m006_user_role_index(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_user_role_id ON user (role, id)"))
+    conn.execute(text("ANALYZE user"))
+
+def m007_waitlists(conn):
+    install_waitlist_triggers(conn)
+
+def m008_history_finished_only(conn):
+    # Recreate the enrollment history triggers with their WHEN clauses; seat reservations no longer bump versions
+    for name in ENROLLMENT_HISTORY_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    install_history_triggers(conn)
+
+MIGRATIONS = [
+    m001_enrollment_updated_at,
+    m002_seat_counters,
+    m003_indexes,
+    m004_admin_stats,
+    m005_history_versions,
+    m006_user_role_index,
+    m007_waitlists,
+    m008_history_finished_only,
+]
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+def run_migrations(engine) -> list:
+    """Apply pending migrations, each in its own transaction. Returns the names applied."""
+    applied = []
+    with engine.connect() as conn:
+        version = current_version(conn)
+    for number, migration in enumerate(MIGRATIONS, start=1):
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            migration(conn)
+            conn.execute(text(f"PRAGMA user_version = {number}"))
+        applied.append(migration.__name__)
+    return applied
+
+if __name__ == "__main__":
+    from sqlmodel import SQLModel
+    from db.database import engine
+    SQLModel.metadata.create_all(engine)
+    applied = run_migrations(engine)
+    with engine.connect() as conn:
+        print(f"Schema version {current_version(conn)}; applied: {', '.join(applied) or 'nothing'}")
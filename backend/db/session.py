@@ -0,0 +1,54 @@
+import os
+from sqlalchemy import event
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from db.database import read_engine, sqlite_url, in_memory, READ_POOL_SIZE, _apply_pragmas
+
+# Read sessions for request handlers, provided through Depends(get_session).
+#
+#   DB_MODE=sync   (default) a sync Session on read_engine; queries run on
+#                  Starlette's thread pool, one thread per in-flight query.
+#   DB_MODE=async  an AsyncSession on aiosqlite; queries run on the event loop,
+#                  so in-flight requests don't hold threads at all.
+#
+# Handlers write their queries once as plain functions of a sync Session and
+# call them through run_query; AsyncSession.run_sync executes the same function
+# against the async engine. Writes stay on the single serialized writer
+# (write_session) in both modes.
+
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+async_read_engine = None
+if DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    if in_memory:
+        raise RuntimeError("DB_MODE=async needs a file database; in-memory SQLite can't be shared across engines")
+    async_read_engine = create_async_engine(
+        sqlite_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=READ_POOL_SIZE,
+        max_overflow=READ_POOL_SIZE,
+    )
+
+    @event.listens_for(async_read_engine.sync_engine, "connect")
+    def _configure_async_reader(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, extra=[("query_only", "ON")])
+elif DB_MODE != "sync":
+    raise RuntimeError(f"Unknown DB_MODE {DB_MODE!r}; expected 'sync' or 'async'")
+
+async def get_session():
+    if async_read_engine is not None:
+        async with AsyncSession(async_read_engine) as session:
+            yield session
+    else:
+        with Session(read_engine) as session:
+            yield session
+
+async def run_query(session, fn, *args):
+    """Run fn(sync_session, *args) without blocking the event loop."""
+    if isinstance(session, Session):
+        return await run_in_threadpool(fn, session, *args)
+    return await session.run_sync(fn, *args)
@@ -0,0 +1,110 @@
+import math
+import random
+from sqlalchemy import text
+from sqlmodel import Session
+from core.seats import install_seat_triggers, reconcile_seat_counts
+from core.stats import install_stats_triggers, recompute_stats
+from core.analytics import install_history_triggers
+from core.waitlist import install_waitlist_triggers
+from db.database import (
+    engine, pwd_context, DEPT_PREFIXES, DEGREES, CURRICULUM, catalog_rows, history_rows, bulk_insert
+)
+from models.schema import User, Degree, Course, FacultyCourse, Enrollment
+
+# Deterministic institution generator for load tests and benchmarks.
+#
+# Uses the real catalog from CURRICULUM for all 8 degrees, then scales students
+# and faculty. The same seed always produces the same database.
+
+DESIGNATIONS = ["Professor", "Associate Professor", "Assistant Professor"]
+
+def seed_synthetic(students: int = 50_000, faculty: int = 2_000, seed: int = 42) -> dict:
+    """Bulk-load a synthetic institution into an empty database. Returns row counts."""
+    rng = random.Random(seed)
+    prefixes = list(DEPT_PREFIXES.values())
+    prefix_to_deg = {v: k for k, v in DEPT_PREFIXES.items()}
+
+    # Distinct passwords are hashed once; every account of a role shares the hash
+    admin_hash = pwd_context.hash("admin123")
+    fac_hash = pwd_context.hash("fac123")
+    stud_hash = pwd_context.hash("stud123")
+
+    users = [dict(id="admin_01", role="admin", name="Admin User", email="admin@college.edu",
+                  password_hash=admin_hash, photo_url=None, dept="Administration", year=None, designation=None)]
+
+    # Faculty are spread evenly over the departments
+    faculty_by_prefix = {p: [] for p in prefixes}
+    for n in range(faculty):
+        prefix = prefixes[n % len(prefixes)]
+        fac_id = f"fac_{n + 1:05d}"
+        faculty_by_prefix[prefix].append(fac_id)
+        users.append(dict(id=fac_id, role="faculty", name=f"Dr. Faculty {n + 1}", email=f"{fac_id}@college.edu",
+                          password_hash=fac_hash, photo_url=None, dept=prefix, year=None,
+                          designation=rng.choice(DESIGNATIONS)))
+
+    # Students: round-robin over departments and years
+    student_rows = []
+    cohort = {}
+    for n in range(students):
+        prefix = prefixes[n % len(prefixes)]
+        year = (n // len(prefixes)) % 4 + 1
+        roll_no = f"{prefix}{n + 1:06d}"
+        cohort[(prefix, year)] = cohort.get((prefix, year), 0) + 1
+        student_rows.append(dict(id=roll_no, role="student", name=f"Student {roll_no}", email=f"{roll_no.lower()}@college.edu",
+                                 password_hash=stud_hash, photo_url=None, dept=prefix, year=str(year), designation=None))
+
+    # Courses sized for their cohort; sections of 60 each get a faculty from the department
+    courses = catalog_rows()
+    allocations = []
+    faculty_for = {}
+    cursor = {p: 0 for p in prefixes}
+    for c in courses:
+        prefix = DEPT_PREFIXES[c["degree_id"]]
+        size = cohort.get((prefix, c["year"]), 0)
+        c["max_enroll"] = max(30, math.ceil(size * 1.1))
+        pool = faculty_by_prefix[prefix] or [u["id"] for u in users[1:]] or ["admin_01"]
+        sections = min(len(pool), max(1, math.ceil(size / 60)))
+        assigned = [pool[(cursor[prefix] + k) % len(pool)] for k in range(sections)]
+        cursor[prefix] += sections
+        faculty_for[c["id"]] = assigned
+        allocations += [dict(faculty_id=f_id, course_id=c["id"]) for f_id in assigned]
+
+    courses_by_degree_sem = {}
+    for c in courses:
+        courses_by_degree_sem.setdefault((c["degree_id"], c["sem"]), []).append(c["id"])
+    enrollments = []
+    for s in student_rows:
+        enrollments += history_rows(
+            rng, s["id"], prefix_to_deg[s["dept"]], int(s["year"]),
+            courses_by_degree_sem, lambda course_id: rng.choice(faculty_for[course_id])
+        )
+
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM user LIMIT 1")).first():
+            raise RuntimeError("Database already has users; reset it before generating synthetic data")
+        # Per-row counter triggers are the slowest part of a bulk load; rebuild counters once instead
+        triggers = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+        for name in triggers:
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        bulk_insert(conn, User, users + student_rows)
+        bulk_insert(conn, Degree, DEGREES)
+        bulk_insert(conn, Course, courses)
+        bulk_insert(conn, FacultyCourse, allocations)
+        bulk_insert(conn, Enrollment, enrollments)
+        with Session(bind=conn) as session:
+            reconcile_seat_counts(session)
+            recompute_stats(session)
+            session.flush()
+        install_seat_triggers(conn)
+        install_stats_triggers(conn)
+        install_history_triggers(conn)
+        install_waitlist_triggers(conn)
+
+    return {
+        "students": len(student_rows),
+        "faculty": len(users) - 1,
+        "degrees": len(CURRICULUM),
+        "courses": len(courses),
+        "allocations": len(allocations),
+        "enrollments": len(enrollments),
+    }
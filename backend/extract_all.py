@@ -1,32 +1,24 @@
-import pypdf
+import argparse
+import glob
 import os
+from concurrent.futures import ProcessPoolExecutor
+from core.curriculum import extract_texts
 
-pdfs = [
-    "AIDS_Curriculum.pdf",
-    "AIML_Curriculum.pdf",
-    "CSBS_Curriculum.pdf",
-    "CSE_curriculum.pdf",
-    "CYS_Curriculum.pdf",
-    "ECE_Curriculum.pdf",
-    "IT_Curriculum.pdf",
-    "MECH_Curriculum.pdf"
-]
+# Usage: python extract_all.py <pdf_dir> [out_dir] [--workers N]
+# Writes <prefix>_text.txt for every curriculum PDF, extracting page ranges in parallel.
 
-base_dir = r"d:\course"
-output_dir = r"d:\course\course-registeration\backend"
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract curriculum PDFs to *_text.txt")
+    parser.add_argument("pdf_dir")
+    parser.add_argument("out_dir", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
 
-for pdf in pdfs:
-    pdf_path = os.path.join(base_dir, pdf)
-    output_path = os.path.join(output_dir, pdf.replace("_Curriculum.pdf", "_text.txt").replace("_curriculum.pdf", "_text.txt").lower())
-    
-    print(f"Extracting {pdf} to {output_path}...")
-    try:
-        reader = pypdf.PdfReader(pdf_path)
+    pdfs = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        texts = extract_texts(pdfs, pool)
+    for pdf in pdfs:
+        output_path = os.path.join(args.out_dir, os.path.basename(pdf).split("_")[0].lower() + "_text.txt")
         with open(output_path, "w", encoding="utf-8") as f:
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    f.write(text + "\n")
-        print(f"Successfully extracted {pdf}")
-    except Exception as e:
-        print(f"Error extracting {pdf}: {e}")
+            f.write(texts[pdf])
+        print(f"Extracted {os.path.basename(pdf)} to {output_path}")
@@ -0,0 +1,29 @@
+import argparse
+import glob
+import os
+import time
+from db.database import create_db_and_tables, DEPT_PREFIXES
+from core.curriculum import ingest
+
+# Usage: python ingest_curriculum.py [files...] [--workers N] [--force] [--dry-run]
+# Files are curriculum PDFs or extracted *_text.txt; defaults to the *_text.txt
+# fixtures next to this script. Loads into the database at DATABASE_URL.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load curriculum PDFs/text into Course and Degree")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="re-ingest files whose hash has not changed")
+    parser.add_argument("--dry-run", action="store_true", help="parse and validate without committing")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*_text.txt")))
+    create_db_and_tables()
+    start = time.perf_counter()
+    reports = ingest(files, {v: k for k, v in DEPT_PREFIXES.items()}, workers=args.workers, force=args.force, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    for r in reports:
+        detail = r.get("error") or (f"{r['courses']} courses over {r['semesters']} semesters" if "courses" in r else "")
+        print(f"  {os.path.basename(r['path'])} -> {r['degree_id']}: {r['status']} {detail}")
+    print(f"Ingested {len(files)} file(s) in {elapsed:.2f}s")
@@ -1,12 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from api import auth
 from sqlmodel import Session, select, func
-from db.database import engine, create_db_and_tables, seed_data
-from models.schema import User, Course, Enrollment, FacultyCourse, Degree
+from db.database import engine, read_engine, write_session, create_db_and_tables, seed_data, DEPT_PREFIXES
+from db.session import get_session, run_query, async_read_engine
+from core.enrollment import enroll_selection, drop_course, set_capacity
+from core.waitlist import WaitlistChanges, leave_waitlist, student_waitlist, commit_with_waitlist
+from core.security import shutdown_password_pool, require, check_owner
+from core.metrics import MetricsMiddleware, instrument_engine, registry
+from core.seats import enrolled_seats, seat_join_condition
+from core.stats import stats_snapshot, recompute_stats
+from core.analytics import degree_history
+from core.allocation import apply_allocations, auto_assign
+from core.registrar import EXPORT_FORMATS, export_stream, import_stream
+from core.timetable import candidate_sections, set_section_slots, slots_from_mask
+from core.prerequisites import candidate_filter, cohort_eligibility, set_prerequisites, prerequisites_of
+from core.rounds import create_round, submit_preferences, student_preferences, round_summary, close_round
+from core.seatfeed import seat_stream
+from core.pagination import PageParams, project, keyset_page, set_page_headers, page_headers
+from core.cache import catalog_cache
+from core.serialization import FastJSONResponse
+from models.schema import (
+    User, Course, Enrollment, FacultyCourse, Degree, CourseSeatCount, SectionTimetable,
+    UserPublic, CoursePublic, DegreePublic, Message, HealthStatus, EnrolledCourse, EnrollableCourse, EnrollResult,
+    DropResult, CapacityResult, WaitlistPosition, RoundPreferences, RoundPublic, RoundSummary, SatisfactionReport,
+    FacultyCourseLoad, BacklogStudent, DegreeHistory, Prerequisites, EligibilityReport, AdminStats, StatsRecompute,
+    ImportResult, SectionSlots, AllocationBatchResult, AutoAssignResult
+)
 from typing import List
 
-app = FastAPI(title="Course Registration System")
+# Every route declares a response_model; bodies are rendered by orjson when it's installed
+app = FastAPI(title="Course Registration System", default_response_class=FastJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -15,235 +40,430 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
+# Per-route latency and SQL metrics, served at /metrics
+app.add_middleware(MetricsMiddleware)
+for _engine in {engine, read_engine}:
+    instrument_engine(_engine)
+if async_read_engine is not None:
+    instrument_engine(async_read_engine.sync_engine)
+
 # Initialize DB
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
     seed_data()
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    shutdown_password_pool()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
 # Include Routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 
 # Basic Student Info
-@app.get("/api/student/profile/{student_id}")
-def get_student_profile(student_id: str):
-    with Session(engine) as session:
-        user = session.get(User, student_id)
-        if not user or user.role != "student":
-            raise HTTPException(status_code=404, detail="Student not found")
-        return user
-
-@app.get("/api/student/enrolled/{student_id}")
-def get_enrolled_courses(student_id: str):
-    with Session(engine) as session:
-        statement = select(Enrollment).where(Enrollment.student_id == student_id)
-        enrollments = session.exec(statement).all()
-        
-        result = []
-        for e in enrollments:
-            course = session.get(Course, e.course_id)
-            faculty = session.get(User, e.faculty_id)
-            result.append({
-                "enrollment_id": e.id,
-                "course_name": course.name if course else "Unknown",
-                "course_id": e.course_id,
-                "credits": course.credits if course else 0,
-                "faculty_name": faculty.name if faculty else "Unknown",
-                "status": e.status,
-                "grade": e.grade,
-                "sem": e.sem
-            })
-        return result
-
-@app.get("/api/student/enrollable/{student_id}")
-def get_enrollable_courses(student_id: str):
-    with Session(engine) as session:
-        student = session.get(User, student_id)
-        if not student: return []
-        
-        # Determine Degree ID (mapping back from prefix)
-        dept_prefixes = {
-            "deg_ug_csbs": "CSBS", "deg_ug_aids": "AIDS", "deg_ug_aiml": "AIML",
-            "deg_ug_cse": "CSE", "deg_ug_it": "IT", "deg_ug_cys": "CYS",
-            "deg_ug_ece": "ECE", "deg_ug_mech": "MECH"
-        }
-        prefix_to_deg = {v: k for k, v in dept_prefixes.items()}
-        degree_id = prefix_to_deg.get(student.dept)
-        
-        # Current Semester is Even (Year * 2)
-        current_event_sem = int(student.year) * 2
-        
-        # Get courses for this degree and semester
-        statement = select(Course).where(Course.degree_id == degree_id, Course.sem == current_event_sem)
-        courses = session.exec(statement).all()
-        
-        # Get IDs of courses already enrolled/completed
-        handled_stmt = select(Enrollment.course_id).where(
-            Enrollment.student_id == student_id,
-            Enrollment.status.in_(["enrolled", "completed"])
+def student_profile(session: Session, student_id: str):
+    user = session.get(User, student_id)
+    if not user or user.role != "student":
+        raise HTTPException(status_code=404, detail="Student not found")
+    return user
+
+@app.get("/api/student/profile/{student_id}", response_model=UserPublic, dependencies=[Depends(require("student", owner="student_id"))])
+async def get_student_profile(student_id: str, session=Depends(get_session)):
+    return await run_query(session, student_profile, student_id)
+
+def enrollment_fingerprint(session: Session, student_id: str):
+    # Cheap fingerprint of the student's rows; count catches deletes, updated_at catches edits
+    count, last_id, last_change = session.exec(
+        select(func.count(Enrollment.id), func.max(Enrollment.id), func.max(Enrollment.updated_at))
+        .where(Enrollment.student_id == student_id)
+    ).one()
+    return f'W/"{count}-{last_id or 0}-{last_change or 0}"'
+
+def enrolled_courses(session: Session, student_id: str):
+    statement = (
+        select(
+            Enrollment.id, Enrollment.course_id, Enrollment.status, Enrollment.grade, Enrollment.sem,
+            Course.name, Course.credits, User.name
         )
-        handled_ids = session.exec(handled_stmt).all()
-        
-        result = []
-        for c in courses:
-            if c.id in handled_ids:
+        .outerjoin(Course, Course.id == Enrollment.course_id)
+        .outerjoin(User, User.id == Enrollment.faculty_id)
+        .where(Enrollment.student_id == student_id)
+    )
+    return [
+        {
+            "enrollment_id": e_id,
+            "course_name": course_name or "Unknown",
+            "course_id": course_id,
+            "credits": credits or 0,
+            "faculty_name": faculty_name or "Unknown",
+            "status": status,
+            "grade": grade,
+            "sem": sem
+        }
+        for e_id, course_id, status, grade, sem, course_name, credits, faculty_name in session.exec(statement).all()
+    ]
+
+@app.get("/api/student/enrolled/{student_id}", response_model=List[EnrolledCourse], dependencies=[Depends(require("student", owner="student_id"))])
+async def get_enrolled_courses(student_id: str, request: Request, response: Response, session=Depends(get_session)):
+    etag = await run_query(session, enrollment_fingerprint, student_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return await run_query(session, enrolled_courses, student_id)
+
+# Degree of a student's department prefix (User.dept), from the catalog's one map
+DEGREE_OF_PREFIX = {prefix: degree_id for degree_id, prefix in DEPT_PREFIXES.items()}
+
+def enrollable_courses(session: Session, student_id: str, hide_clashes: bool = False):
+    student = session.get(User, student_id)
+    if not student: return []
+    
+    degree_id = DEGREE_OF_PREFIX.get(student.dept)
+    
+    # Current Semester is Even (Year * 2)
+    current_event_sem = int(student.year) * 2
+    
+    # This semester's courses plus backlog retakes, minus courses already enrolled/completed
+    # and courses with an uncompleted prerequisite, all in SQL
+    statement = (
+        select(Course, enrolled_seats())
+        .outerjoin(CourseSeatCount, seat_join_condition(Course.id))
+        .where(candidate_filter(student_id, degree_id, current_event_sem))
+        .order_by(Course.sem.desc(), Course.id)
+    )
+    rows = session.exec(statement).all()
+    course_ids = [c.id for c, _ in rows]
+
+    # Faculties for all candidate courses, with the student's enrolled timetable, in one query
+    sections, week = candidate_sections(session, student_id, course_ids)
+    faculties = {
+        course_id: [
+            {"id": fac_id, "name": fac_name, "slots": slots_from_mask(mask), "clash": bool(mask & week)}
+            for fac_id, fac_name, mask in entries
+        ]
+        for course_id, entries in sections.items()
+    }
+
+    result = []
+    for c, enrolled_count in rows:
+        options = faculties.get(c.id, [])
+        # A course clashes when every section it offers does
+        clash = bool(options) and all(f["clash"] for f in options)
+        if hide_clashes:
+            if clash:
                 continue
-                
-            # Get faculties for this course
-            fac_stmt = select(User).join(FacultyCourse).where(FacultyCourse.course_id == c.id)
-            faculties = session.exec(fac_stmt).all()
-            
-            result.append({
-                "id": c.id,
-                "name": c.name,
-                "credits": c.credits,
-                "max_enroll": c.max_enroll,
-                "enrolled_count": session.exec(select(func.count(Enrollment.id)).where(Enrollment.course_id == c.id, Enrollment.status == 'enrolled')).one(),
-                "faculties": [{"id": f.id, "name": f.name} for f in faculties]
-            })
-        return result
-
-@app.post("/api/student/enroll")
-def enroll_student(data: dict):
+            options = [f for f in options if not f["clash"]]
+        result.append({
+            "id": c.id,
+            "name": c.name,
+            "credits": c.credits,
+            "max_enroll": c.max_enroll,
+            "enrolled_count": enrolled_count,
+            "degree_id": c.degree_id,
+            "sem": c.sem,
+            "retake": c.sem != current_event_sem,
+            "clash": clash,
+            "faculties": options
+        })
+    return result
+
+@app.get("/api/student/enrollable/{student_id}", response_model=List[EnrollableCourse], dependencies=[Depends(require("student", owner="student_id"))])
+async def get_enrollable_courses(student_id: str, hide_clashes: bool = False, session=Depends(get_session)):
+    # hide_clashes drops sections that overlap the student's enrolled timetable
+    return await run_query(session, enrollable_courses, student_id, hide_clashes)
+
+@app.get("/api/seats/stream", response_class=StreamingResponse)
+async def stream_seats(request: Request, degree_id: str, sem: List[int] = Query(...)):
+    # Server-Sent Events: a snapshot of the degree's courses in these semesters, then live seat counts.
+    # Seat counts are public and EventSource can't send an Authorization header, so no token is required.
+    return StreamingResponse(
+        seat_stream(request, degree_id, sorted(set(sem))),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/student/enroll", response_model=EnrollResult, response_model_exclude_unset=True)
+def enroll_student(data: dict, claims: dict = Depends(require("student"))):
     student_id = data.get("student_id")
+    check_owner(claims, student_id)
     selected = data.get("selected_courses", [])
+    return enroll_selection(student_id, selected, waitlist=data.get("waitlist", False))
+
+@app.post("/api/student/drop", response_model=DropResult)
+def drop_student_course(data: dict, claims: dict = Depends(require("student"))):
+    # data: { student_id, course_id }; the freed seat is offered to the waitlist in the same transaction
+    check_owner(claims, data.get("student_id"))
+    return drop_course(data.get("student_id"), data.get("course_id"))
+
+@app.put("/api/student/rounds/{round_id}/preferences", response_model=RoundPreferences)
+def put_round_preferences(round_id: int, data: dict, claims: dict = Depends(require("student"))):
+    # data: { student_id, choices: [{course_id, faculty_id}] } best first; replaces earlier choices
+    check_owner(claims, data.get("student_id"))
+    choices = data.get("choices")
+    if not isinstance(choices, list) or not all(isinstance(c, dict) for c in choices):
+        raise HTTPException(status_code=400, detail="choices must be a list of {course_id, faculty_id}")
+    with write_session() as session:
+        saved = submit_preferences(session, round_id, data.get("student_id"), choices)
+        session.commit()
+        return {"round_id": round_id, "status": "open", "choices": saved}
+
+@app.get("/api/student/rounds/{round_id}/preferences/{student_id}", response_model=RoundPreferences, dependencies=[Depends(require("student", owner="student_id"))])
+async def get_round_preferences(round_id: int, student_id: str, session=Depends(get_session)):
+    return await run_query(session, student_preferences, round_id, student_id)
+
+@app.get("/api/student/waitlist/{student_id}", response_model=List[WaitlistPosition], dependencies=[Depends(require("student", owner="student_id"))])
+async def get_student_waitlist(student_id: str, session=Depends(get_session)):
+    return await run_query(session, student_waitlist, student_id)
+
+@app.delete("/api/student/waitlist/{student_id}/{course_id}", response_model=Message, dependencies=[Depends(require("student", owner="student_id"))])
+def leave_student_waitlist(student_id: str, course_id: str):
+    with write_session() as session:
+        changes = WaitlistChanges()
+        leave_waitlist(session, student_id, course_id, changes)
+        commit_with_waitlist(session, changes)
+        return {"message": "Removed from waitlist"}
+
+def faculty_courses(session: Session, faculty_id: str):
+    statement = (
+        select(Course, enrolled_seats())
+        .join(FacultyCourse)
+        .outerjoin(CourseSeatCount, seat_join_condition(Course.id))
+        .where(FacultyCourse.faculty_id == faculty_id)
+    )
+    return [
+        {
+            "id": c.id,
+            "name": c.name,
+            "sem": c.sem,
+            "enrolled_count": enrolled_count,
+            "max_enroll": c.max_enroll
+        }
+        for c, enrolled_count in session.exec(statement).all()
+    ]
+
+@app.get("/api/faculty/courses/{faculty_id}", response_model=List[FacultyCourseLoad], dependencies=[Depends(require("faculty", owner="faculty_id"))])
+async def get_faculty_courses(faculty_id: str, session=Depends(get_session)):
+    return await run_query(session, faculty_courses, faculty_id)
+
+# Columns the list endpoints may project with fields=
+USER_FIELDS = ["name", "email", "role", "dept", "year", "designation", "photo_url"]
+COURSE_FIELDS = ["name", "degree_id", "credits", "sem", "year", "max_enroll"]
+
+def course_students(session: Session, course_id: str, page: PageParams, claims: dict):
+    # Faculty see only the rosters of courses they teach; one primary-key lookup
+    if claims["role"] != "admin" and not session.get(FacultyCourse, (claims["sub"], course_id)):
+        raise HTTPException(status_code=403, detail="Not allowed for this course")
+    statement = (
+        select(*project(page.fields, User, USER_FIELDS))
+        .join(Enrollment, User.id == Enrollment.student_id)
+        .where(Enrollment.course_id == course_id, Enrollment.status == 'enrolled')
+    )
+    return keyset_page(session, statement, [User.id], page)
+
+@app.get("/api/course/{course_id}/students", response_model=List[UserPublic], response_model_exclude_unset=True)
+async def get_course_students(
+    course_id: str, request: Request, response: Response, page: PageParams = Depends(),
+    claims: dict = Depends(require("faculty")), session=Depends(get_session)
+):
+    rows, next_cursor = await run_query(session, course_students, course_id, page, claims)
+    set_page_headers(response, next_cursor, request.url)
+    return [dict(row._mapping) for row in rows]
+
+def faculty_backlogs(session: Session, faculty_id: str):
+    # Get courses handled by faculty
+    # Join User(Student) with Enrollment on course_id where grade == 0 (F)
+    statement = select(User, Course).join(Enrollment, User.id == Enrollment.student_id).join(Course, Enrollment.course_id == Course.id).where(Enrollment.faculty_id == faculty_id, Enrollment.status == 'backlog')
+    results = session.exec(statement).all()
     
-    with Session(engine) as session:
-        student = session.get(User, student_id)
-        if not student:
-            raise HTTPException(status_code=404, detail="Student not found")
-            
-        current_sem = int(student.year) * 2
-        
-        # Credit check
-        total_credits = 0
-        for item in selected:
-            course = session.get(Course, item['course_id'])
-            if course: total_credits += course.credits
-        
-        if total_credits < 20:
-             raise HTTPException(status_code=400, detail=f"Minimum 20 credits required. Current: {total_credits}")
-        
-        # Capacity check & enrollment
-        for item in selected:
-             new_enroll = Enrollment(
-                 student_id=student_id,
-                 course_id=item['course_id'],
-                 faculty_id=item['faculty_id'],
-                 sem=current_sem,
-                 status="enrolled"
-             )
-             session.add(new_enroll)
-        
+    # results is a list of tuples (User, Course)
+    return [{"student_name": r[0].name, "student_id": r[0].id, "course_name": r[1].name, "grade": "F"} for r in results]
+
+@app.get("/api/faculty/backlogs/{faculty_id}", response_model=List[BacklogStudent], dependencies=[Depends(require("faculty", owner="faculty_id"))])
+async def get_faculty_backlogs(faculty_id: str, session=Depends(get_session)):
+    return await run_query(session, faculty_backlogs, faculty_id)
+
+def admin_degrees(session: Session, type: str = None):
+    statement = select(Degree.id, Degree.type, Degree.name)
+    if type:
+        statement = statement.where(Degree.type == type)
+    return [dict(row._mapping) for row in session.exec(statement).all()]
+
+@app.get("/api/admin/degrees", response_model=List[DegreePublic], dependencies=[Depends(require("admin"))])
+async def get_admin_degrees(request: Request, type: str = None, session=Depends(get_session)):
+    async def load():
+        return await run_query(session, admin_degrees, type), {}
+    return await catalog_cache.respond(request, load, lambda degrees: ["degrees"])
+
+def degree_courses(session: Session, degree_id: str, page: PageParams):
+    # Ordered by semester, the way the catalog is read; (degree_id, sem) is indexed
+    statement = select(*project(page.fields, Course, COURSE_FIELDS, always=("id", "sem"))).where(Course.degree_id == degree_id)
+    return keyset_page(session, statement, [Course.sem, Course.id], page)
+
+@app.get("/api/admin/degree/{degree_id}/courses", response_model=List[CoursePublic], response_model_exclude_unset=True, dependencies=[Depends(require("admin"))])
+async def get_degree_courses(degree_id: str, request: Request, page: PageParams = Depends(), session=Depends(get_session)):
+    async def load():
+        rows, next_cursor = await run_query(session, degree_courses, degree_id, page)
+        return [dict(row._mapping) for row in rows], page_headers(next_cursor, request.url)
+    return await catalog_cache.respond(
+        request, load, lambda rows: [f"degree-courses:{degree_id}"] + [f"course:{r['id']}" for r in rows]
+    )
+
+@app.get("/api/admin/degree/{degree_id}/history", response_model=DegreeHistory, dependencies=[Depends(require("admin"))])
+async def get_degree_history(degree_id: str, session=Depends(get_session)):
+    return await run_query(session, degree_history, degree_id)
+
+def admin_faculty(session: Session, page: PageParams):
+    # ix_user_role_id turns each page into an index seek past the cursor
+    statement = select(*project(page.fields, User, USER_FIELDS)).where(User.role == 'faculty')
+    return keyset_page(session, statement, [User.id], page)
+
+@app.get("/api/admin/faculty", response_model=List[UserPublic], response_model_exclude_unset=True, dependencies=[Depends(require("admin"))])
+async def get_admin_faculty(request: Request, page: PageParams = Depends(), session=Depends(get_session)):
+    async def load():
+        rows, next_cursor = await run_query(session, admin_faculty, page)
+        return [dict(row._mapping) for row in rows], page_headers(next_cursor, request.url)
+    return await catalog_cache.respond(request, load, lambda rows: ["faculty-list"] + [f"user:{r['id']}" for r in rows])
+
+def admin_courses(session: Session, page: PageParams):
+    statement = select(*project(page.fields, Course, COURSE_FIELDS))
+    return keyset_page(session, statement, [Course.id], page)
+
+@app.get("/api/admin/courses", response_model=List[CoursePublic], response_model_exclude_unset=True, dependencies=[Depends(require("admin"))])
+async def get_admin_courses(request: Request, page: PageParams = Depends(), session=Depends(get_session)):
+    async def load():
+        rows, next_cursor = await run_query(session, admin_courses, page)
+        return [dict(row._mapping) for row in rows], page_headers(next_cursor, request.url)
+    return await catalog_cache.respond(request, load, lambda rows: ["course-list"] + [f"course:{r['id']}" for r in rows])
+
+@app.get("/api/course/{course_id}/prerequisites", response_model=Prerequisites, dependencies=[Depends(require("student", "faculty"))])
+async def get_course_prerequisites(course_id: str, session=Depends(get_session)):
+    return await run_query(session, prerequisites_of, course_id)
+
+@app.put("/api/admin/course/{course_id}/prerequisites", response_model=Prerequisites, dependencies=[Depends(require("admin"))])
+def update_course_prerequisites(course_id: str, data: dict):
+    # data: { requires: [course_id] } replaces the direct prerequisites
+    requires = data.get("requires")
+    if not isinstance(requires, list) or not all(isinstance(r, str) for r in requires):
+        raise HTTPException(status_code=400, detail="requires must be a list of course ids")
+    with write_session() as session:
+        result = set_prerequisites(session, course_id, requires)
         session.commit()
-        return {"message": "Enrolled successfully", "total_credits": total_credits}
-
-@app.get("/api/faculty/courses/{faculty_id}")
-def get_faculty_courses(faculty_id: str):
-    with Session(engine) as session:
-        statement = select(Course).join(FacultyCourse).where(FacultyCourse.faculty_id == faculty_id)
-        courses = session.exec(statement).all()
-        
-        result = []
-        for c in courses:
-            enrolled_count = session.exec(select(func.count(Enrollment.id)).where(Enrollment.course_id == c.id)).one()
-            result.append({
-                "id": c.id,
-                "name": c.name,
-                "sem": c.sem,
-                "enrolled_count": enrolled_count,
-                "max_enroll": c.max_enroll
-            })
         return result
 
-@app.get("/api/course/{course_id}/students")
-def get_course_students(course_id: str):
-    with Session(engine) as session:
-        statement = select(User).join(Enrollment, User.id == Enrollment.student_id).where(Enrollment.course_id == course_id, Enrollment.status == 'enrolled')
-        students = session.exec(statement).all()
-        return students
-
-@app.get("/api/faculty/backlogs/{faculty_id}")
-def get_faculty_backlogs(faculty_id: str):
-    with Session(engine) as session:
-        # Get courses handled by faculty
-        # Join User(Student) with Enrollment on course_id where grade == 0 (F)
-        statement = select(User, Course).join(Enrollment, User.id == Enrollment.student_id).join(Course, Enrollment.course_id == Course.id).where(Enrollment.faculty_id == faculty_id, Enrollment.status == 'backlog')
-        results = session.exec(statement).all()
-        
-        # results is a list of tuples (User, Course)
-        return [{"student_name": r[0].name, "student_id": r[0].id, "course_name": r[1].name, "grade": "F"} for r in results]
-
-@app.get("/api/admin/degrees")
-def get_admin_degrees(type: str = None):
-    with Session(engine) as session:
-        statement = select(Degree)
-        if type:
-            statement = statement.where(Degree.type == type)
-        return session.exec(statement).all()
-
-@app.get("/api/admin/degree/{degree_id}/courses")
-def get_degree_courses(degree_id: str):
-    with Session(engine) as session:
-        statement = select(Course).where(Course.degree_id == degree_id)
-        return session.exec(statement).all()
-
-@app.get("/api/admin/degree/{degree_id}/history")
-def get_degree_history(degree_id: str):
-    with Session(engine) as session:
-        # Get all courses for this degree
-        courses = session.exec(select(Course).where(Course.degree_id == degree_id)).all()
-        course_ids = [c.id for c in courses]
-        
-        # Get all enrollments for these courses
-        completions = session.exec(select(Enrollment).where(Enrollment.course_id.in_(course_ids), Enrollment.status == 'completed')).all()
-        
-        avg_gpa = sum([e.grade for e in completions]) / len(completions) if completions else 0
-        
+def eligibility_report(session: Session, degree_id: str, year: int):
+    if degree_id not in DEPT_PREFIXES:
+        raise HTTPException(status_code=404, detail="Degree not found")
+    students = cohort_eligibility(session, degree_id, DEPT_PREFIXES[degree_id], year)
+    blocked_by_course = {}
+    for s in students:
+        for course_id in s["blocked"]:
+            blocked_by_course[course_id] = blocked_by_course.get(course_id, 0) + 1
+    return {
+        "degree_id": degree_id,
+        "year": year,
+        "students": len(students),
+        "blocked_students": sum(1 for s in students if s["blocked"]),
+        "blocked_by_course": blocked_by_course,
+        "cohort": students,
+    }
+
+@app.get("/api/admin/eligibility", response_model=EligibilityReport, dependencies=[Depends(require("admin"))])
+async def get_cohort_eligibility(degree_id: str, year: int, session=Depends(get_session)):
+    # Whole-cohort eligibility, e.g. to review who is blocked before registration opens
+    return await run_query(session, eligibility_report, degree_id, year)
+
+def admin_stats(session: Session):
+    # Materialized by triggers on every write, so this is a handful of row reads
+    return stats_snapshot(session)
+
+@app.get("/api/admin/stats", response_model=AdminStats, dependencies=[Depends(require("admin"))])
+async def get_admin_stats(session=Depends(get_session)):
+    return await run_query(session, admin_stats)
+
+@app.post("/api/admin/stats/recompute", response_model=StatsRecompute, dependencies=[Depends(require("admin"))])
+def recompute_admin_stats(fix: bool = True):
+    # Full recount from the base tables; reports (and optionally repairs) any drift
+    with write_session() as session:
+        drift = recompute_stats(session, fix=fix)
+        if fix:
+            session.commit()
         return {
-            "total_completions": len(completions),
-            "avg_gpa": round(avg_gpa, 2),
-            "course_breakdown": [{"id": c.id, "name": c.name} for c in courses]
+            "drift": [{"name": name, "stored": stored, "actual": actual} for name, stored, actual in drift],
+            "stats": stats_snapshot(session)
         }
 
-@app.get("/api/admin/faculty")
-def get_admin_faculty():
-    with Session(engine) as session:
-        statement = select(User).where(User.role == 'faculty')
-        return session.exec(statement).all()
-
-@app.get("/api/admin/courses")
-def get_admin_courses():
-    with Session(engine) as session:
-        return session.exec(select(Course)).all()
-
-@app.get("/api/admin/stats")
-def get_admin_stats():
-    with Session(engine) as session:
-        total_students = session.exec(select(func.count(User.id)).where(User.role == 'student')).one()
-        total_faculty = session.exec(select(func.count(User.id)).where(User.role == 'faculty')).one()
-        total_courses = session.exec(select(func.count(Course.id))).one()
-        
-        # Calculate some capacity metric (mock/real)
-        total_capacity = total_courses * 30
-        total_enrolled = session.exec(select(func.count(Enrollment.id)).where(Enrollment.status == 'enrolled')).one()
-        capacity_perc = (total_enrolled / total_capacity * 100) if total_capacity > 0 else 0
-        
-        return {
-            "total_students": total_students,
-            "total_faculty": total_faculty,
-            "total_courses": total_courses,
-            "capacity_percentage": round(capacity_perc, 1)
-        }
+@app.get("/api/admin/enrollments/export", response_class=StreamingResponse, dependencies=[Depends(require("admin"))])
+def export_enrollments(format: str = "csv", sem: int = None, status: str = None):
+    # Streamed page by page; memory stays flat however many rows there are
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format {format!r}; expected csv or ndjson")
+    return StreamingResponse(
+        export_stream(format, sem, status),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="enrollments.{format}"'}
+    )
+
+@app.post("/api/admin/enrollments/import", response_model=ImportResult, dependencies=[Depends(require("admin"))])
+async def import_enrollments(request: Request, format: str = None, dry_run: bool = False):
+    # Body is CSV with a header row or NDJSON; format defaults from Content-Type
+    if format is None:
+        format = "ndjson" if "json" in request.headers.get("content-type", "") else "csv"
+    return await import_stream(request.stream(), format, dry_run)
+
+@app.post("/api/admin/rounds", response_model=RoundPublic, dependencies=[Depends(require("admin"))])
+def open_registration_round(data: dict):
+    # data: { degree_id?, max_courses? }; students then submit preferences until the round is closed
+    with write_session() as session:
+        round_ = create_round(session, data.get("degree_id"), data.get("max_courses"))
+        session.commit()
+        return {"id": round_.id, "degree_id": round_.degree_id, "max_courses": round_.max_courses, "status": round_.status}
+
+@app.get("/api/admin/rounds/{round_id}", response_model=RoundSummary, dependencies=[Depends(require("admin"))])
+async def get_registration_round(round_id: int, session=Depends(get_session)):
+    return await run_query(session, round_summary, round_id)
+
+@app.post("/api/admin/rounds/{round_id}/close", response_model=SatisfactionReport, dependencies=[Depends(require("admin"))])
+def close_registration_round(round_id: int, dry_run: bool = False):
+    # Allocates every submitted preference at once and writes the enrollments; returns the satisfaction report
+    with write_session() as session:
+        report = close_round(session, round_id, dry_run)
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+        return report
+
+@app.put("/api/admin/course/{course_id}/capacity", response_model=CapacityResult, dependencies=[Depends(require("admin"))])
+def update_course_capacity(course_id: str, data: dict):
+    # data: { max_enroll }; raising it promotes waitlisted students straight away
+    max_enroll = data.get("max_enroll")
+    if not isinstance(max_enroll, int):
+        raise HTTPException(status_code=400, detail="max_enroll must be an integer")
+    return set_capacity(course_id, max_enroll)
+
+@app.put("/api/admin/timetable/{course_id}/{faculty_id}", response_model=SectionSlots, dependencies=[Depends(require("admin"))])
+def update_section_timetable(course_id: str, faculty_id: str, data: dict):
+    # data: { slots: [{day, period}] }; day 0-5 is Mon-Sat, period 0-7
+    slots = data.get("slots")
+    if not isinstance(slots, list):
+        raise HTTPException(status_code=400, detail="slots must be a list")
+    with write_session() as session:
+        row = set_section_slots(session, course_id, faculty_id, slots)
+        session.commit()
+        return {"course_id": course_id, "faculty_id": faculty_id, "slots": slots_from_mask(row.slots)}
 
-@app.post("/api/admin/allocate")
+@app.post("/api/admin/allocate", response_model=Message, dependencies=[Depends(require("admin"))])
 def allocate_faculty(data: dict):
     # data: { faculty_id, course_id }
     f_id = data.get("faculty_id")
     c_id = data.get("course_id")
-    with Session(engine) as session:
+    with write_session() as session:
         # Check if already exists
         exists = session.exec(select(FacultyCourse).where(FacultyCourse.faculty_id == f_id, FacultyCourse.course_id == c_id)).first()
         if not exists:
@@ -252,22 +472,59 @@ def allocate_faculty(data: dict):
             session.commit()
         return {"message": "Allocation successful"}
 
-@app.delete("/api/admin/allocate/{faculty_id}/{course_id}")
+@app.post("/api/admin/allocate/batch", response_model=AllocationBatchResult, dependencies=[Depends(require("admin"))])
+def allocate_batch(data: dict):
+    # data: { add: [{faculty_id, course_id}], remove: [{faculty_id, course_id}] }, applied in one transaction
+    def pairs(key):
+        items = data.get(key) or []
+        if not all(isinstance(i, dict) and i.get("faculty_id") and i.get("course_id") for i in items):
+            raise HTTPException(status_code=400, detail=f"Every '{key}' entry needs faculty_id and course_id")
+        return [(i["faculty_id"], i["course_id"]) for i in items]
+
+    add, remove = pairs("add"), pairs("remove")
+    with write_session() as session:
+        result = apply_allocations(session, add, remove)
+        session.commit()
+        return result
+
+@app.post("/api/admin/allocate/auto", response_model=AutoAssignResult, response_model_exclude_unset=True, dependencies=[Depends(require("admin"))])
+def allocate_auto(degree_id: str = None, dry_run: bool = False):
+    # Load-balanced assignment of every course without faculty
+    with write_session() as session:
+        assigned, load = auto_assign(session, DEPT_PREFIXES, degree_id)
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+        return {
+            "assigned": [{"course_id": c_id, "faculty_id": f_id} for c_id, f_id in assigned],
+            "load": load,
+            "dry_run": dry_run
+        }
+
+@app.delete("/api/admin/allocate/{faculty_id}/{course_id}", response_model=Message, dependencies=[Depends(require("admin"))])
 def remove_allocation(faculty_id: str, course_id: str):
-    with Session(engine) as session:
+    with write_session() as session:
         statement = select(FacultyCourse).where(FacultyCourse.faculty_id == faculty_id, FacultyCourse.course_id == course_id)
         alloc = session.exec(statement).first()
         if alloc:
             session.delete(alloc)
+            timetable = session.get(SectionTimetable, (course_id, faculty_id))
+            if timetable:
+                session.delete(timetable)
             session.commit()
             return {"message": "Allocation removed"}
         raise HTTPException(status_code=404, detail="Allocation not found")
 
 # Simple Health Check
-@app.get("/health")
+@app.get("/health", response_model=HealthStatus)
 def health():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(registry.render() + catalog_cache.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
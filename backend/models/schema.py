@@ -1,7 +1,17 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
+from datetime import datetime, timezone
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel, Relationship
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class User(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_user_email", "email"),  # login
+        Index("ix_user_role_id", "role", "id"),  # keyset pages of one role
+    )
+
     id: str = Field(primary_key=True)
     role: str # student, faculty, admin
     name: str
@@ -25,6 +35,10 @@ class Degree(SQLModel, table=True):
     name: str # B.Tech CSE, M.Tech AI
 
 class Course(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_course_degree_sem", "degree_id", "sem"),
+    )
+
     id: str = Field(primary_key=True)
     degree_id: str = Field(foreign_key="degree.id")
     name: str
@@ -38,6 +52,11 @@ class Course(SQLModel, table=True):
     faculties: List["FacultyCourse"] = Relationship(back_populates="course")
 
 class FacultyCourse(SQLModel, table=True):
+    # The primary key already covers lookups by faculty_id
+    __table_args__ = (
+        Index("ix_facultycourse_course", "course_id"),
+    )
+
     faculty_id: str = Field(foreign_key="user.id", primary_key=True)
     course_id: str = Field(foreign_key="course.id", primary_key=True)
     
@@ -45,6 +64,14 @@ class FacultyCourse(SQLModel, table=True):
     course: Course = Relationship(back_populates="faculties")
 
 class Enrollment(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_enrollment_student_status", "student_id", "status"),
+        Index("ix_enrollment_course_status", "course_id", "status"),
+        Index("ix_enrollment_faculty_status", "faculty_id", "status"),
+        # A student can hold at most one active seat per course
+        Index("uq_enrollment_active", "student_id", "course_id", unique=True, sqlite_where=text("status = 'enrolled'")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     student_id: str = Field(foreign_key="user.id")
     course_id: str = Field(foreign_key="course.id")
@@ -52,6 +79,7 @@ class Enrollment(SQLModel, table=True):
     sem: int
     status: str # enrolled, backlog, completed
     grade: Optional[float] = None # 4.0(A) - 0.0(F)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
 
     student: User = Relationship(
         back_populates="enrollments",
@@ -62,6 +90,338 @@ class Enrollment(SQLModel, table=True):
         sa_relationship_kwargs={"foreign_keys": "[Enrollment.faculty_id]"}
     )
 
+class CoursePrerequisite(SQLModel, table=True):
+    # Direct prerequisite edges: course_id requires requires_id to be completed first
+    course_id: str = Field(foreign_key="course.id", primary_key=True)
+    requires_id: str = Field(foreign_key="course.id", primary_key=True)
+
+class PrerequisiteClosure(SQLModel, table=True):
+    # Transitive closure of CoursePrerequisite, rebuilt whenever an edge changes (see core/prerequisites)
+    course_id: str = Field(foreign_key="course.id", primary_key=True)
+    requires_id: str = Field(foreign_key="course.id", primary_key=True)
+
+class RegistrationRound(SQLModel, table=True):
+    # A preference window; closing it runs the batch allocator (see core/rounds)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    degree_id: Optional[str] = Field(default=None, foreign_key="degree.id")
+    max_courses: Optional[int] = None # per student; None means every course they list
+    status: str = "open" # open, allocated
+    created_at: datetime = Field(default_factory=utcnow)
+    closed_at: Optional[datetime] = None
+    report: Optional[str] = None # JSON satisfaction report, set on close
+
+class RoundPreference(SQLModel, table=True):
+    # A student's ranked sections for a round; rank 1 is the first choice
+    round_id: int = Field(foreign_key="registrationround.id", primary_key=True)
+    student_id: str = Field(foreign_key="user.id", primary_key=True)
+    rank: int = Field(primary_key=True)
+    course_id: str = Field(foreign_key="course.id")
+    faculty_id: str = Field(foreign_key="user.id")
+
+class SectionTimetable(SQLModel, table=True):
+    # Weekly slots of a (course, faculty) section as a bitmask, bit day * 8 + period (see core/timetable)
+    course_id: str = Field(foreign_key="course.id", primary_key=True)
+    faculty_id: str = Field(foreign_key="user.id", primary_key=True)
+    slots: int = 0
+
+class CourseSeatCount(SQLModel, table=True):
+    # Denormalized COUNT(*) of Enrollment per (course, status), kept in step by triggers
+    course_id: str = Field(foreign_key="course.id", primary_key=True)
+    status: str = Field(primary_key=True)
+    count: int = 0
+
+class StatCounter(SQLModel, table=True):
+    # Materialized admin statistics (role:<role>, courses, capacity, enrolled, allocations)
+    name: str = Field(primary_key=True)
+    value: int = 0
+    updated_at: Optional[datetime] = None
+
+class BacklogCount(SQLModel, table=True):
+    degree_id: str = Field(foreign_key="degree.id", primary_key=True)
+    sem: int = Field(primary_key=True)
+    count: int = 0
+
+class DegreeVersion(SQLModel, table=True):
+    # Bumped by triggers on any enrollment/course change of the degree; keys the history cache
+    degree_id: str = Field(primary_key=True)
+    version: int = 0
+
+class WaitlistEntry(SQLModel, table=True):
+    # Served in (priority, id) order; AUTOINCREMENT keeps ids monotonic so FIFO order is stable
+    __table_args__ = (
+        Index("ix_waitlist_order", "course_id", "priority", "id"),
+        Index("uq_waitlist_student", "course_id", "student_id", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    course_id: str = Field(foreign_key="course.id")
+    student_id: str = Field(foreign_key="user.id")
+    faculty_id: str = Field(foreign_key="user.id")
+    sem: int
+    priority: int = 0 # lower is served first; always 0 under the fifo policy
+    created_at: datetime = Field(default_factory=utcnow)
+
+class WaitlistVersion(SQLModel, table=True):
+    # Bumped by triggers on every waitlist insert/delete of the course
+    course_id: str = Field(primary_key=True)
+    version: int = 0
+
+class CurriculumSource(SQLModel, table=True):
+    # Last ingested content hash per curriculum file, so unchanged files are skipped
+    path: str = Field(primary_key=True)
+    sha256: str
+    degree_id: str
+    courses: int = 0
+    ingested_at: datetime = Field(default_factory=utcnow)
+
+# Slim response models for list endpoints. Every field but id is optional so a
+# fields= projection can leave columns out; password_hash is never exposed.
+
+class UserPublic(SQLModel):
+    id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    dept: Optional[str] = None
+    year: Optional[str] = None
+    designation: Optional[str] = None
+    photo_url: Optional[str] = None
+
+class CoursePublic(SQLModel):
+    id: str
+    name: Optional[str] = None
+    degree_id: Optional[str] = None
+    credits: Optional[int] = None
+    sem: Optional[int] = None
+    year: Optional[int] = None
+    max_enroll: Optional[int] = None
+
+class DegreePublic(SQLModel):
+    id: str
+    type: str
+    name: str
+
+# Response models for the remaining routes. They mirror what the handlers
+# already return, so FastAPI validates and serializes each body in pydantic-core
+# instead of walking it with jsonable_encoder.
+
+class Message(SQLModel):
+    message: str
+
+class HealthStatus(SQLModel):
+    status: str
+
+class TimetableSlot(SQLModel):
+    day: int
+    period: int
+
+class SectionOption(SQLModel):
+    id: str
+    name: Optional[str] = None
+    slots: List[TimetableSlot]
+    clash: bool
+
+class EnrollableCourse(SQLModel):
+    id: str
+    name: str
+    credits: int
+    max_enroll: int
+    enrolled_count: int
+    degree_id: str
+    sem: int
+    retake: bool
+    clash: bool
+    faculties: List[SectionOption]
+
+class EnrolledCourse(SQLModel):
+    enrollment_id: int
+    course_name: str
+    course_id: str
+    credits: int
+    faculty_name: str
+    status: str
+    grade: Optional[float] = None
+    sem: int
+
+class WaitlistedSeat(SQLModel):
+    course_id: str
+    entry_id: int
+
+class EnrollResult(SQLModel):
+    message: str
+    total_credits: int
+    waitlisted: List[WaitlistedSeat] = []
+
+class DropResult(SQLModel):
+    message: str
+    promoted: List[str]
+
+class CapacityResult(SQLModel):
+    course_id: str
+    max_enroll: int
+    promoted: List[str]
+
+class WaitlistPosition(SQLModel):
+    course_id: str
+    course_name: str
+    position: int
+    length: int
+    joined_at: datetime
+
+class RankedChoice(SQLModel):
+    rank: int
+    course_id: str
+    faculty_id: str
+
+class RoundPreferences(SQLModel):
+    round_id: int
+    status: str
+    choices: List[RankedChoice]
+
+class RoundPublic(SQLModel):
+    id: int
+    degree_id: Optional[str] = None
+    max_courses: Optional[int] = None
+    status: str
+
+class SatisfactionReport(SQLModel):
+    students: int
+    seats_requested: int
+    seats_assigned: int
+    fill_rate: Optional[float] = None
+    students_fully_served: int
+    students_with_nothing: int
+    students_with_first_choice: int
+    assigned_by_rank: Dict[str, int]
+
+class RoundSummary(RoundPublic):
+    created_at: datetime
+    closed_at: Optional[datetime] = None
+    students: int
+    report: Optional[SatisfactionReport] = None
+
+class FacultyCourseLoad(SQLModel):
+    id: str
+    name: str
+    sem: int
+    enrolled_count: int
+    max_enroll: int
+
+class BacklogStudent(SQLModel):
+    student_name: str
+    student_id: str
+    course_name: str
+    grade: str
+
+class GradeSummary(SQLModel):
+    completions: int
+    backlogs: int
+    backlog_rate: float
+    avg_gpa: float
+    min_gpa: Optional[float] = None
+    max_gpa: Optional[float] = None
+    grade_distribution: Dict[str, int]
+
+class CourseGrades(GradeSummary):
+    id: str
+    name: str
+    sem: int
+
+class SemesterGrades(GradeSummary):
+    sem: int
+
+class DegreeHistory(SQLModel):
+    total_completions: int
+    avg_gpa: float
+    summary: GradeSummary
+    course_breakdown: List[CourseGrades]
+    semester_breakdown: List[SemesterGrades]
+
+class Prerequisites(SQLModel):
+    course_id: str
+    direct: List[str]
+    all: List[str]
+
+class StudentEligibility(SQLModel):
+    student_id: str
+    eligible: List[str]
+    blocked: Dict[str, List[str]]
+
+class EligibilityReport(SQLModel):
+    degree_id: str
+    year: int
+    students: int
+    blocked_students: int
+    blocked_by_course: Dict[str, int]
+    cohort: List[StudentEligibility]
+
+class BacklogTally(SQLModel):
+    degree_id: str
+    sem: int
+    count: int
+
+class AdminStats(SQLModel):
+    total_students: int
+    total_faculty: int
+    total_courses: int
+    total_capacity: int
+    total_enrolled: int
+    total_allocations: int
+    capacity_percentage: float
+    backlogs: List[BacklogTally]
+    as_of: Optional[datetime] = None
+
+class StatDrift(SQLModel):
+    name: str
+    stored: int
+    actual: int
+
+class StatsRecompute(SQLModel):
+    drift: List[StatDrift]
+    stats: AdminStats
+
+class ImportRowError(SQLModel):
+    line: int
+    error: str
+
+class ImportResult(SQLModel):
+    processed: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+
+class SectionSlots(SQLModel):
+    course_id: str
+    faculty_id: str
+    slots: List[TimetableSlot]
+
+class AllocationBatchResult(SQLModel):
+    added: int
+    removed: int
+    unchanged: int
+
+class Allocation(SQLModel):
+    course_id: str
+    faculty_id: str
+
+class Spread(SQLModel):
+    min: float
+    max: float
+    mean: float
+
+class LoadSummary(SQLModel):
+    faculty: int
+    credits: Optional[Spread] = None
+    students: Optional[Spread] = None
+
+class AutoAssignResult(SQLModel):
+    assigned: List[Allocation]
+    load: LoadSummary
+    dry_run: bool
+
 # User: id, name, email, hashed_password, role
 
 # Course: id, name, credits, sem, max_enroll, degree_id
@@ -0,0 +1,26 @@
+import sys
+from sqlmodel import Session
+from db.database import engine, create_db_and_tables
+from core.seats import reconcile_seat_counts
+
+# Usage: python reconcile_seats.py [--check]
+#   --check  report drift without rewriting the counters (exit code 1 on drift)
+
+def reconcile(fix: bool):
+    create_db_and_tables()
+    with Session(engine) as session:
+        drift = reconcile_seat_counts(session, fix=fix)
+        if fix:
+            session.commit()
+
+    if not drift:
+        print("Seat counters match Enrollment.")
+        return 0
+    print(f"{len(drift)} counter(s) drifted:")
+    for course_id, status, stored, actual in drift:
+        print(f"  - {course_id} [{status}]: stored {stored}, actual {actual}")
+    print("Counters rebuilt from Enrollment." if fix else "Run without --check to rebuild.")
+    return 0 if fix else 1
+
+if __name__ == "__main__":
+    sys.exit(reconcile(fix="--check" not in sys.argv))
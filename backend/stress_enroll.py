@@ -0,0 +1,108 @@
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Point the app at a throwaway database before db.database builds its engine
+db_file = os.path.join(tempfile.mkdtemp(), "stress.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+
+from fastapi import HTTPException
+from sqlmodel import Session, select, func
+from db.database import engine, create_db_and_tables, seed_data, pwd_context
+from core.enrollment import enroll_selection
+from core.seats import reconcile_seat_counts
+from models.schema import User, Course, Enrollment, FacultyCourse
+
+EXTRA_STUDENTS = int(os.getenv("STRESS_STUDENTS", "2000"))
+SEATS = int(os.getenv("STRESS_SEATS", "25"))
+WORKERS = int(os.getenv("STRESS_WORKERS", "64"))
+DEGREE_PREFIX = "CSE"
+DEGREE_ID = "deg_ug_cse"
+YEAR = 2
+
+def setup():
+    create_db_and_tables()
+    seed_data()
+    with Session(engine) as session:
+        password_hash = pwd_context.hash("stud123")
+        for i in range(EXTRA_STUDENTS):
+            roll_no = f"{DEGREE_PREFIX}S{i:05d}"
+            session.add(User(
+                id=roll_no,
+                role="student",
+                name=f"Stress {roll_no}",
+                email=f"{roll_no.lower()}@college.edu",
+                password_hash=password_hash,
+                dept=DEGREE_PREFIX,
+                year=str(YEAR)
+            ))
+        courses = session.exec(select(Course).where(Course.degree_id == DEGREE_ID, Course.sem == YEAR * 2)).all()
+        for c in courses:
+            c.max_enroll = SEATS
+            session.add(c)
+        session.commit()
+
+        selection = []
+        for c in courses:
+            alloc = session.exec(select(FacultyCourse).where(FacultyCourse.course_id == c.id)).first()
+            selection.append({"course_id": c.id, "faculty_id": alloc.faculty_id})
+        return selection
+
+def submit(student_id, selection):
+    try:
+        enroll_selection(student_id, selection, waitlist=False)
+        return "ok"
+    except HTTPException as e:
+        return e.status_code
+
+def main():
+    selection = setup()
+    student_ids = [f"{DEGREE_PREFIX}S{i:05d}" for i in range(EXTRA_STUDENTS)]
+    # Every student submits twice so duplicate rejection is exercised as well
+    jobs = student_ids + student_ids
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        outcomes = Counter(pool.map(lambda s: submit(s, selection), jobs))
+    elapsed = time.perf_counter() - start
+
+    failed = False
+    with Session(engine) as session:
+        for item in selection:
+            course = session.get(Course, item["course_id"])
+            enrolled = session.exec(select(func.count(Enrollment.id)).where(
+                Enrollment.course_id == course.id, Enrollment.status == "enrolled"
+            )).one()
+            print(f"  {course.id}: {enrolled}/{course.max_enroll}")
+            if enrolled > course.max_enroll:
+                print(f"  OVER CAPACITY: {course.id}")
+                failed = True
+
+        duplicates = session.exec(
+            select(Enrollment.student_id, Enrollment.course_id)
+            .where(Enrollment.status == "enrolled")
+            .group_by(Enrollment.student_id, Enrollment.course_id)
+            .having(func.count(Enrollment.id) > 1)
+        ).all()
+        if duplicates:
+            print(f"  DUPLICATE ENROLLMENTS: {len(duplicates)}")
+            failed = True
+
+        drift = reconcile_seat_counts(session, fix=False)
+        if drift:
+            print(f"  SEAT COUNTER DRIFT: {drift}")
+            failed = True
+
+        committed = session.exec(select(func.count(Enrollment.id)).where(Enrollment.status == "enrolled")).one()
+
+    print(f"Submissions: {len(jobs)} in {elapsed:.2f}s ({len(jobs) / elapsed:.0f} req/s)")
+    print(f"Outcomes: {dict(outcomes)}")
+    print(f"Enrollment rows committed: {committed} ({committed / elapsed:.0f} enrollments/s)")
+    print("FAIL" if failed else "PASS: no course over capacity, no duplicate enrollments")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
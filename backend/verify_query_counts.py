@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Point the app at a throwaway database before db.database builds its engine
+db_file = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+from sqlmodel import Session, select
+from db.database import engine, read_engine, create_db_and_tables, seed_data
+from models.schema import User
+import main
+
+statements = []
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    if not statement.lstrip().upper().startswith("BEGIN"):
+        statements.append(statement)
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine, "before_cursor_execute", _record)
+
+def capture_statements(fn, *args):
+    statements.clear()
+    fn(*args)
+    return list(statements)
+
+def bare_request(headers=None):
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+def call_handler(handler, *args):
+    with Session(read_engine) as session:
+        return asyncio.run(handler(*args, session=session))
+
+def enrollable(student_id):
+    return call_handler(main.get_enrollable_courses, student_id)
+
+def enrolled(student_id):
+    return call_handler(main.get_enrolled_courses, student_id, bare_request(), Response())
+
+def enrolled_revalidated(student_id):
+    first = Response()
+    call_handler(main.get_enrolled_courses, student_id, bare_request(), first)
+    etag = first.headers["etag"]
+    statements.clear()
+    result = call_handler(main.get_enrolled_courses, student_id, bare_request({"If-None-Match": etag}), Response())
+    assert result.status_code == 304, f"expected 304 for {student_id}, got {result.status_code}"
+
+# Upper bound on SQL statements per call, independent of how many rows come back
+BUDGETS = {
+    "enrollable": (3, enrollable),
+    "enrolled": (2, enrolled),
+    "enrolled (If-None-Match)": (1, enrolled_revalidated),
+}
+
+def main_check():
+    create_db_and_tables()
+    seed_data()
+    with Session(engine) as session:
+        students = session.exec(select(User.id).where(User.role == "student")).all()
+
+    failed = False
+    for name, (budget, handler) in BUDGETS.items():
+        worst = max((capture_statements(handler, s) for s in students), key=len)
+        status = "ok" if len(worst) <= budget else "REGRESSION"
+        print(f"{name}: {len(worst)} statements (budget {budget}) {status}")
+        if len(worst) > budget:
+            failed = True
+            for stmt in worst:
+                print(f"    {stmt}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main_check()
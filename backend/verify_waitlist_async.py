@@ -0,0 +1,70 @@
+import asyncio
+import faulthandler
+import os
+import tempfile
+
+# Concurrent waitlist reads under DB_MODE=async must not deadlock the event loop.
+# Every request runs student_waitlist through AsyncSession.run_sync on the loop
+# thread, so a lock held across one of its queries would block the loop for good.
+# A watchdog dumps the stacks and exits non-zero if the reads don't finish.
+#
+# Run from backend/: python verify_waitlist_async.py
+
+db_file = os.path.join(tempfile.mkdtemp(), "waitlist_async.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+os.environ["DB_MODE"] = "async"
+
+from sqlmodel import select
+from db.database import write_session, create_db_and_tables, seed_data
+from sqlmodel.ext.asyncio.session import AsyncSession
+from db.session import async_read_engine, run_query
+from models.schema import User, FacultyCourse, WaitlistEntry
+from core.waitlist import student_waitlist
+
+CONCURRENCY = int(os.getenv("VERIFY_CONCURRENCY", "16"))
+COURSES = 4
+TIMEOUT = 30
+
+def populate() -> list:
+    create_db_and_tables()
+    seed_data()
+    with write_session() as session:
+        students = session.exec(select(User.id).where(User.role == "student").order_by(User.id).limit(CONCURRENCY)).all()
+        sections = session.exec(select(FacultyCourse.course_id, FacultyCourse.faculty_id).order_by(FacultyCourse.course_id).limit(COURSES)).all()
+        session.add_all([
+            WaitlistEntry(course_id=c_id, student_id=s_id, faculty_id=f_id, sem=2)
+            for c_id, f_id in sections for s_id in students
+        ])
+        session.commit()
+    return students
+
+async def read(student_id: str) -> list:
+    async with AsyncSession(async_read_engine) as session:
+        return await run_query(session, student_waitlist, student_id)
+
+async def check(students: list):
+    try:
+        await _check(students)
+    finally:
+        # Close pooled connections on this loop; left to interpreter shutdown they log CancelledError
+        await async_read_engine.dispose()
+
+async def _check(students: list):
+    # Twice: the first round rebuilds every course index, the second reuses them
+    for _ in range(2):
+        results = await asyncio.gather(*(read(s) for s in students))
+        for student_id, entries in zip(students, results):
+            assert len(entries) == COURSES, f"{student_id}: {len(entries)} waitlist entries, expected {COURSES}"
+            for entry in entries:
+                assert entry["length"] == len(students), entry
+                assert entry["position"] == students.index(student_id) + 1, entry
+
+def main():
+    students = populate()
+    faulthandler.dump_traceback_later(TIMEOUT, exit=True)
+    asyncio.run(check(students))
+    faulthandler.cancel_dump_traceback_later()
+    print(f"{len(students)} concurrent waitlist reads over {COURSES} courses: ok")
+
+if __name__ == "__main__":
+    main()
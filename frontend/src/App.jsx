@@ -1,5 +1,6 @@
 import { Routes, Route, Navigate } from 'react-router-dom';
 import { useState, useEffect } from 'react';
+import axios from 'axios';
 import Login from './pages/Login';
 import StudentDashboard from './pages/student/StudentDashboard';
 import FacultyDashboard from './pages/faculty/FacultyDashboard';
@@ -25,6 +26,7 @@ function App() {
     };
 
     const logout = () => {
+        axios.post('/api/auth/logout').catch(() => {});
         setUser(null);
         localStorage.removeItem('user');
         localStorage.removeItem('token');
@@ -0,0 +1,20 @@
+import axios from 'axios';
+
+// Every API call carries the token from the last login
+axios.interceptors.request.use((config) => {
+    const token = localStorage.getItem('token');
+    if (token) config.headers.Authorization = `Bearer ${token}`;
+    return config;
+});
+
+// Collects every page of a keyset-paginated list endpoint by following X-Next-Cursor.
+export const fetchAllPages = async (url, params = {}) => {
+    const rows = [];
+    let cursor;
+    do {
+        const res = await axios.get(url, { params: { ...params, limit: 1000, cursor } });
+        rows.push(...res.data);
+        cursor = res.headers['x-next-cursor'];
+    } while (cursor);
+    return rows;
+};
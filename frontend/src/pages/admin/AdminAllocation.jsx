@@ -1,6 +1,7 @@
 import { useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import axios from 'axios';
+import { fetchAllPages } from '../../api';
 import { motion } from 'framer-motion';
 
 import { Settings, Users, BookOpen, Check, AlertCircle } from 'lucide-react';
@@ -13,12 +14,12 @@ const AdminAllocation = () => {
 
     const { data: faculty = [] } = useQuery({
         queryKey: ['admin-faculty'],
-        queryFn: () => axios.get('/api/admin/faculty').then(res => res.data)
+        queryFn: () => fetchAllPages('/api/admin/faculty', { fields: 'name,dept' })
     });
 
     const { data: courses = [] } = useQuery({
         queryKey: ['admin-courses'],
-        queryFn: () => axios.get('/api/admin/courses').then(res => res.data)
+        queryFn: () => fetchAllPages('/api/admin/courses', { fields: 'name' })
     });
 
     const allocateMutation = useMutation({
@@ -2,6 +2,7 @@ import { useState } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
 import { useQuery } from '@tanstack/react-query';
 import axios from 'axios';
+import { fetchAllPages } from '../../api';
 import { motion, AnimatePresence } from 'framer-motion';
 import { GraduationCap, ArrowLeft, Plus, X, BookOpen } from 'lucide-react';
 
@@ -20,7 +21,7 @@ const AdminDegrees = () => {
 
     const { data: degreeCourses = [], isLoading: loadingCourses } = useQuery({
         queryKey: ['admin-degree-courses', selectedDegree?.id],
-        queryFn: () => axios.get(`/api/admin/degree/${selectedDegree.id}/courses`).then(res => res.data),
+        queryFn: () => fetchAllPages(`/api/admin/degree/${selectedDegree.id}/courses`, { fields: 'name,credits' }),
         enabled: !!selectedDegree
     });
 
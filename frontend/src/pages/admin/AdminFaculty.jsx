@@ -1,6 +1,7 @@
 import { useState } from 'react';
 import { useQuery } from '@tanstack/react-query';
 import axios from 'axios';
+import { fetchAllPages } from '../../api';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Users, Mail, Book, X, Settings } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
@@ -9,8 +10,8 @@ const AdminFaculty = () => {
     const navigate = useNavigate();
     const [selectedFaculty, setSelectedFaculty] = useState(null);
     const { data: faculty = [], isLoading } = useQuery({
-        queryKey: ['admin-faculty'],
-        queryFn: () => axios.get('/api/admin/faculty').then(res => res.data)
+        queryKey: ['admin-faculty-cards'],
+        queryFn: () => fetchAllPages('/api/admin/faculty')
     });
 
     const { data: facultyCourses = [], isLoading: loadingCourses } = useQuery({
@@ -1,6 +1,7 @@
 import { useState } from 'react';
 import { useQuery } from '@tanstack/react-query';
 import axios from 'axios';
+import { fetchAllPages } from '../../api';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Users, Info, ChevronRight, X } from 'lucide-react';
 
@@ -14,7 +15,7 @@ const FacultyCourses = ({ user }) => {
 
     const { data: students = [], isLoading: loadingStudents } = useQuery({
         queryKey: ['course-students', selectedCourse?.id],
-        queryFn: () => axios.get(`/api/course/${selectedCourse.id}/students`).then(res => res.data),
+        queryFn: () => fetchAllPages(`/api/course/${selectedCourse.id}/students`, { fields: 'name,dept,year,photo_url' }),
         enabled: !!selectedCourse
     });
 
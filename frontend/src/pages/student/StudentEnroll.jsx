@@ -1,4 +1,4 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import axios from 'axios';
 import { motion } from 'framer-motion';
@@ -13,9 +13,39 @@ const StudentEnroll = ({ user }) => {
 
     const { data: courses = [], isLoading } = useQuery({
         queryKey: ['enrollable', user.user_id],
-        queryFn: () => axios.get(`/api/student/enrollable/${user.user_id}`).then(res => res.data)
+        queryFn: () => axios.get(`/api/student/enrollable/${user.user_id}`).then(res => res.data),
+        // Seat counts arrive over the stream below, so there's nothing to refetch for
+        refetchOnWindowFocus: false
     });
 
+    // One seat stream per degree, covering every semester on offer (retakes included)
+    const streamScopes = useMemo(() => {
+        const scopes = {};
+        courses.forEach(c => { (scopes[c.degree_id] ||= new Set()).add(c.sem); });
+        return Object.entries(scopes).map(([degreeId, sems]) => {
+            const params = new URLSearchParams({ degree_id: degreeId });
+            [...sems].sort().forEach(sem => params.append('sem', sem));
+            return params.toString();
+        }).sort().join('|');
+    }, [courses]);
+
+    useEffect(() => {
+        if (!streamScopes) return;
+        const applySeats = (event) => {
+            const seats = Object.fromEntries(JSON.parse(event.data).map(s => [s.course_id, s]));
+            queryClient.setQueryData(['enrollable', user.user_id], (prev = []) => prev.map(c =>
+                seats[c.id] ? { ...c, enrolled_count: seats[c.id].enrolled_count, max_enroll: seats[c.id].max_enroll } : c
+            ));
+        };
+        const sources = streamScopes.split('|').map(query => {
+            const source = new EventSource(`/api/seats/stream?${query}`);
+            source.addEventListener('snapshot', applySeats);
+            source.addEventListener('seats', applySeats);
+            return source;
+        });
+        return () => sources.forEach(source => source.close());
+    }, [streamScopes, user.user_id, queryClient]);
+
     const totalCredits = useMemo(() => {
         return Object.keys(selected).reduce((acc, courseId) => {
             const course = courses.find(c => c.id === courseId);
@@ -26,7 +56,8 @@ const StudentEnroll = ({ user }) => {
     const enrollMutation = useMutation({
         mutationFn: (payload) => axios.post('/api/student/enroll', payload),
         onSuccess: (res) => {
-            setSuccess('Enrollment successful!');
+            // A waitlisted course has no seat yet; say so rather than reporting plain success
+            setSuccess(res.data.waitlisted ? res.data.message : 'Enrollment successful!');
             setSelected({});
             queryClient.invalidateQueries(['enrolled', user.user_id]);
         },
@@ -160,13 +191,14 @@ const StudentEnroll = ({ user }) => {
                                             {course.faculties.map(fac => (
                                                 <button
                                                     key={fac.id}
-                                                    disabled={course.enrolled_count >= course.max_enroll}
+                                                    disabled={course.enrolled_count >= course.max_enroll || fac.clash}
+                                                    title={fac.clash ? 'Clashes with your timetable' : undefined}
                                                     onClick={(e) => { e.stopPropagation(); toggleCourse(course.id, fac.id); }}
                                                     className={`px-3 py-2 rounded-lg text-xs font-medium border transition-all
                                                         ${selected[course.id] === fac.id
                                                             ? 'bg-primary-600 text-white border-primary-600 shadow-md shadow-primary-500/20'
                                                             : 'bg-gray-50 text-gray-600 border-gray-100 hover:bg-gray-100'}
-                                                        ${course.enrolled_count >= course.max_enroll ? 'opacity-50 cursor-not-allowed' : ''}
+                                                        ${course.enrolled_count >= course.max_enroll || fac.clash ? 'opacity-50 cursor-not-allowed' : ''}
                                                     `}
                                                 >
                                                     {fac.name}